@@ -0,0 +1,32 @@
+"""
+Create the registered MongoDB indexes and optionally verify query plans.
+
+Usage:
+    python -m app.Scripts.create_indexes [--verify]
+"""
+import argparse
+import sys
+
+from app.db.indexes import ensure_indexes_sync, find_collscans
+from app.db.sync_mongo import db_sync
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create MongoDB indexes from app/db/indexes.py")
+    parser.add_argument("--verify", action="store_true", help="explain every registered query shape and fail on COLLSCAN")
+    args = parser.parse_args()
+
+    for collection, names in ensure_indexes_sync(db_sync).items():
+        print(f"✅ {collection}: {', '.join(names)}")
+
+    if args.verify:
+        offenders = find_collscans(db_sync)
+        for shape in offenders:
+            print(f"❌ COLLSCAN on {shape['collection']} for {shape['source']}: {shape['filter']}")
+        if offenders:
+            sys.exit(1)
+        print("✅ Every registered query shape uses an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,12 @@
 # Job CRUD routes
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from app.api.v1.users import get_current_user
 from app.dependencies.roles import require_admin, require_candidate
 from app.schemas.job import JobCreate, JobOut, JobApplication, JobUpdate, PublicJobOut
-from app.services.job_service import JobService
-import os
-import json
+from app.services.job_service import JobService, with_search_fields
+from app.services.job_catalog import get_job_catalog
+from app.services.resume_store import get_resume_store
+from app.utils.pagination import MAX_PAGE_SIZE
 
 
 router = APIRouter()
@@ -38,7 +39,8 @@ async def seed_jobs(user=Depends(require_admin)):
         }
     ]
 
-    await db.jobs.insert_many(jobs)
+    await db.jobs.insert_many([with_search_fields(job) for job in jobs])
+    await get_job_catalog().reload(force=True)
     return {"detail": f"{len(jobs)} jobs seeded successfully"}
 
 
@@ -51,36 +53,96 @@ async def post_job(job: JobCreate, user=Depends(require_admin)):
 
 @router.get("/", response_model=list[PublicJobOut])
 async def list_jobs(
-    keyword: str = Query(None, description="Search by job title or description"),
-    location: str = Query(None, description="Filter by job location"),
-    limit: int = Query(10, ge=1),
-    skip: int = Query(0, ge=0)
+    response: Response,
+    keyword: str = Query(None, description="Search by job title, skills, tags or description"),
+    location: str = Query(None, description="Filter by job location (exact, case-insensitive)"),
+    sort: str = Query(None, description="relevance (default with keyword), newest (default) or oldest"),
+    company: str = Query(None, description="Filter by company (exact)"),
+    tag: str = Query(None, description="Filter by tag"),
+    skill: str = Query(None, description="Filter by skill (aliases such as 'k8s' are normalized)"),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str = Query(None, description="X-Next-Cursor header from the previous page")
 ):
-    jobs = await JobService.list_jobs(keyword, location, skip, limit)
+    jobs, next_cursor, total, exact = await JobService.list_jobs(keyword, location, limit, sort, cursor, company, tag, skill)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["X-Total-Count"] = str(total)
+    response.headers["X-Total-Count-Exact"] = "true" if exact else "false"
     return jobs
 
 
+@router.get("/search")
+async def search_jobs(
+    keyword: str = Query(None, description="Search by job title, skills, tags or description"),
+    location: str = Query(None, description="Filter by job location (exact, case-insensitive)"),
+    company: str = Query(None, description="Filter by company (exact)"),
+    tag: str = Query(None, description="Filter by tag"),
+    skill: str = Query(None, description="Filter by skill (aliases such as 'k8s' are normalized)"),
+    sort: str = Query(None, description="relevance (default with keyword), newest (default) or oldest"),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+    facet_size: int = Query(10, ge=1, le=50, description="Values returned per facet")
+):
+    """Job search results with location, company, tag and skill facet counts for the whole result set"""
+    return await JobService.search_jobs(keyword, location, limit, sort, cursor, company, tag, skill, facet_size)
+
+
+@router.get("/suggest")
+async def suggest_jobs(
+    q: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(8, ge=1, le=20),
+    kind: str = Query(None, description="Only suggest titles, companies or skills", pattern="^(title|company|skill)$")
+):
+    """Type-ahead completions for the job search box, most popular first"""
+    catalog = get_job_catalog()
+    await catalog.reload()
+    return catalog.suggest(q, limit, kind)
+
+
+@router.get("/recommended")
+async def recommended_jobs(limit: int = Query(10, ge=1, le=50), user=Depends(require_candidate)):
+    """Jobs matching the skills of the candidate's latest resume, best first"""
+    return await JobService.recommend_jobs(user, limit)
+
+
 @router.post("/apply")
 async def apply_job(app: JobApplication, user=Depends(require_candidate)):
-    # Step 1: Locate resume JSON
-    resume_path = f"app/uploads/json/{app.resume_id}.json"
-    
-    if not os.path.exists(resume_path):
+    # Step 1: Locate resume (deduplicated uploads share the original's text)
+    from app.db.mongo import db
+    resume_meta = await db.resumes.find_one({"resume_id": app.resume_id}, {"duplicate_of": 1, "parse_phase": 1, "skills": 1})
+    text_id = (resume_meta or {}).get("duplicate_of") or app.resume_id
+
+    # Step 2: Read resume text (served from the in-process cache when hot)
+    resume_text = await get_resume_store().get_text_async(text_id)
+    if resume_text is None:
         raise HTTPException(status_code=404, detail="Resume not found")
 
-    # Step 2: Read resume text
-    with open(resume_path, "r") as f:
-        resume_data = json.load(f)
-
-    resume_text = resume_data.get("text", "")
-
-    # Step 3: Apply with resume text
-    return await JobService.apply_to_job(app.job_id, user["username"], resume_text)
+    # Step 3: Apply with resume text (skills extracted at parse time are reused)
+    skills = resume_meta.get("skills") if resume_meta and resume_meta.get("parse_phase") == "full" else None
+    return await JobService.apply_to_job(app.job_id, user["username"], resume_text, app.resume_id, skills)
 
 @router.get("/{job_id}/applications")
 async def get_applicants(job_id: str, user=Depends(require_admin)):
     return await JobService.get_applications_by_job(job_id)
 
+@router.get("/{job_id}/ranked-applicants")
+async def get_ranked_applicants(
+    job_id: str,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    user=Depends(require_admin)
+):
+    """Applicants ranked by skill and keyword fit, without LLM calls"""
+    return await JobService.get_ranked_applicants(job_id, limit)
+
+@router.get("/{job_id}/best-resumes")
+async def get_best_resumes(
+    job_id: str,
+    k: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    user=Depends(require_admin)
+):
+    """Parsed resumes semantically closest to the posting, whether or not they applied"""
+    return await JobService.get_best_resumes(job_id, k)
+
 @router.put("/{job_id}", response_model=JobOut)
 async def update_job(job_id: str, job: JobUpdate, user=Depends(require_admin)):
     return await JobService.update_job(job_id, job, user["username"])
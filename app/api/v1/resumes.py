@@ -1,29 +1,81 @@
 # app/api/v1/resumes.py
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, status
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, status
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import os
 import uuid
+import hashlib
+import zipfile
 import magic
+import time
+from bson import ObjectId
 from datetime import datetime
+from starlette.concurrency import run_in_threadpool
 
+from app.core.config import settings
 from app.db.mongo import db
 from app.dependencies.roles import require_admin
-from app.services.resume_service import parse_resume_task
-from app.services.llm_service import get_resume_analysis, trigger_resume_analysis
+from app.services.resume_service import parse_resume_task, dispatch_resume_batch
+from app.services.skill_taxonomy import normalize_skill
+from app.services.resume_search import describe_hits, get_resume_search
+from app.services.vector_index import get_resume_vectors
+from app.services.embeddings import EMBEDDING_VERSION, from_binary, job_text
+from app.services.near_duplicates import band_keys, candidate_pipeline, rank_candidates
+from app.services.upload_service import (
+    stream_upload_to_disk,
+    claim_content_hash,
+    claim_content_hashes,
+    extract_zip_resumes,
+    remove_file_quietly
+)
+from app.services.llm_service import (
+    analysis_cache_key_for,
+    dispatch_analysis_batch,
+    get_resume_analysis_async,
+    notify_analysis_task,
+    resolve_provider,
+    trigger_resume_analysis
+)
+from app.services.analysis_cache import get_analysis_cache
+from app.services.resume_store import get_resume_store
 from app.dependencies.auth import get_current_user
+from app.utils.pagination import MAX_PAGE_SIZE, encode_cursor, with_keyset
 
 router = APIRouter()
 
 UPLOAD_DIR = "app/uploads/resumes"
 
 
+# Parse progress copied onto uploads deduplicated onto an existing resume
+PARSE_STATE_PROJECTION = {"filename": 1, "parse_phase": 1, "preview_text": 1, "page_count": 1, "pdf_metadata": 1, "parsed_at": 1}
+
+
+def _parse_state_of(original: dict) -> dict:
+    return {
+        key: original[key]
+        for key in ("parse_phase", "preview_text", "page_count", "pdf_metadata", "parsed_at")
+        if key in original
+    }
+
+
 class AnalysisRequest(BaseModel):
     job_description: Optional[str] = ""
     provider: Optional[str] = "gemini"
 
 
+class BatchAnalysisRequest(BaseModel):
+    resume_ids: List[str]
+    job_id: Optional[str] = None
+    job_description: Optional[str] = ""
+    provider: Optional[str] = "gemini"
+
+
+class RequeueRequest(BaseModel):
+    resume_ids: Optional[List[str]] = None
+    batch_id: Optional[str] = None
+
+
 @router.post("/upload")
 async def upload_resume(
     file: UploadFile = File(...),
@@ -43,26 +95,330 @@ async def upload_resume(
     filename = f"{resume_id}.pdf"
     file_path = os.path.join(UPLOAD_DIR, filename)
 
-    # Save file to disk
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    # Stream file to disk in chunks (size limit enforced while copying)
+    hasher = hashlib.sha256()
+    upload_stats = await stream_upload_to_disk(file, file_path, hasher=hasher)
+    content_hash = hasher.hexdigest()
 
-    # Save metadata to MongoDB
-    await db.resumes.insert_one({
+    resume_doc = {
         "resume_id": resume_id,
         "user_id": current_user_data["id"],
         "filename": filename,
+        "content_hash": content_hash,
         "status": "uploaded",
+        "parse_phase": "pending",
         "created_at": datetime.utcnow()
-    })
+    }
+
+    # Same bytes uploaded before: link to the original instead of parsing again
+    canonical = await claim_content_hash(content_hash, resume_id)
+    if canonical:
+        await run_in_threadpool(remove_file_quietly, file_path)
+        original = await db.resumes.find_one(
+            {"resume_id": canonical["resume_id"]}, PARSE_STATE_PROJECTION
+        ) or {}
+        resume_doc.update(_parse_state_of(original))
+        resume_doc["duplicate_of"] = canonical["resume_id"]
+        resume_doc["filename"] = original.get("filename", f"{canonical['resume_id']}.pdf")
+
+    # Save metadata to MongoDB
+    await db.resumes.insert_one(resume_doc)
 
-    # Trigger async parsing task
-    parse_resume_task.delay(file_path)
+    # Trigger async parsing task (duplicates reuse the original's extracted text)
+    if not canonical:
+        parse_resume_task.delay(file_path, current_user_data["id"])
 
     return {
         "message": "File uploaded successfully",
-        "file_name": filename,
-        "resume_id": resume_id
+        "file_name": resume_doc["filename"],
+        "resume_id": resume_id,
+        "duplicate_of": resume_doc.get("duplicate_of"),
+        "upload_stats": upload_stats
+    }
+
+
+@router.post("/bulk-upload", status_code=status.HTTP_202_ACCEPTED)
+async def bulk_upload_resumes(
+    files: List[UploadFile] = File(..., description="PDF resumes and/or zip archives of PDFs"),
+    current_admin_user_data: dict = Depends(require_admin)
+):
+    batch_id = f"batch_{uuid.uuid4()}"
+    mime = magic.Magic(mime=True)
+    accepted, rejected = [], []
+
+    # Stream every PDF (or every PDF inside a zip) to disk, hashing as we go
+    for index, upload in enumerate(files):
+        file_type = mime.from_buffer(await upload.read(1024))
+        await upload.seek(0)
+
+        if file_type == "application/pdf":
+            resume_id = f"resume_{uuid.uuid4()}"
+            filename = f"{resume_id}.pdf"
+            file_path = os.path.join(UPLOAD_DIR, filename)
+            hasher = hashlib.sha256()
+            try:
+                await stream_upload_to_disk(upload, file_path, hasher=hasher)
+            except HTTPException as e:
+                rejected.append({"filename": upload.filename, "reason": e.detail})
+                continue
+            accepted.append({
+                "resume_id": resume_id,
+                "filename": filename,
+                "original_filename": upload.filename,
+                "content_hash": hasher.hexdigest(),
+                "file_path": file_path
+            })
+
+        elif file_type == "application/zip":
+            zip_path = os.path.join(UPLOAD_DIR, f"{batch_id}_{index}.zip")
+            try:
+                await stream_upload_to_disk(upload, zip_path, max_bytes=settings.MAX_BULK_UPLOAD_MB * 1024 * 1024)
+                members, skipped = await run_in_threadpool(extract_zip_resumes, zip_path, UPLOAD_DIR)
+                accepted.extend(members)
+                rejected.extend(skipped)
+            except HTTPException as e:
+                rejected.append({"filename": upload.filename, "reason": e.detail})
+            except zipfile.BadZipFile:
+                rejected.append({"filename": upload.filename, "reason": "Corrupt zip archive."})
+            finally:
+                await run_in_threadpool(remove_file_quietly, zip_path)
+
+        else:
+            rejected.append({"filename": upload.filename, "reason": "Only PDF or ZIP files are allowed."})
+
+    if not accepted:
+        raise HTTPException(status_code=400, detail={"message": "No valid PDF resumes in upload.", "rejected": rejected})
+
+    # One round-trip to resolve duplicates against the hash index (and within the batch)
+    claims = {}
+    for item in accepted:
+        claims.setdefault(item["content_hash"], item["resume_id"])
+    owners = await claim_content_hashes(claims)
+
+    # Parse state of pre-existing originals, so linked copies show their progress
+    existing_owner_ids = {owners[item["content_hash"]] for item in accepted} - {item["resume_id"] for item in accepted}
+    originals = {}
+    if existing_owner_ids:
+        async for original in db.resumes.find({"resume_id": {"$in": list(existing_owner_ids)}}, {**PARSE_STATE_PROJECTION, "resume_id": 1}):
+            originals[original["resume_id"]] = original
+
+    now = datetime.utcnow()
+    resume_docs, to_parse = [], []
+    for item in accepted:
+        owner = owners[item["content_hash"]]
+        resume_doc = {
+            "resume_id": item["resume_id"],
+            "user_id": current_admin_user_data["id"],
+            "filename": item["filename"],
+            "original_filename": item["original_filename"],
+            "content_hash": item["content_hash"],
+            "batch_id": batch_id,
+            "status": "uploaded",
+            "parse_phase": "pending",
+            "created_at": now
+        }
+        if owner != item["resume_id"]:
+            await run_in_threadpool(remove_file_quietly, item["file_path"])
+            resume_doc.update(_parse_state_of(originals.get(owner, {})))
+            resume_doc["duplicate_of"] = owner
+            resume_doc["filename"] = f"{owner}.pdf"
+        else:
+            to_parse.append(item["file_path"])
+        resume_docs.append(resume_doc)
+
+    await db.resumes.insert_many(resume_docs)
+    await db.resume_batches.insert_one({
+        "_id": batch_id,
+        "created_by": current_admin_user_data["id"],
+        "total": len(resume_docs),
+        "duplicates": len(resume_docs) - len(to_parse),
+        "queued": len(to_parse),
+        "parsed": 0,
+        "failed": 0,
+        "rejected": rejected,
+        "status": "processing" if to_parse else "completed",
+        "created_at": now,
+        "completed_at": None if to_parse else now
+    })
+
+    if to_parse:
+        dispatch_resume_batch(batch_id, to_parse)
+
+    return {
+        "message": "Batch accepted for parsing",
+        "batch_id": batch_id,
+        "accepted": len(resume_docs),
+        "duplicates": len(resume_docs) - len(to_parse),
+        "queued": len(to_parse),
+        "rejected": rejected,
+        "resume_ids": [doc["resume_id"] for doc in resume_docs]
+    }
+
+
+@router.get("/batch/{batch_id}")
+async def get_batch_progress(batch_id: str, current_admin_user_data: dict = Depends(require_admin)):
+    batch = await db.resume_batches.find_one({"_id": batch_id}, {"rejected": 0})
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found.")
+
+    done = batch["parsed"] + batch["failed"]
+    return {
+        "batch_id": batch_id,
+        "status": batch["status"],
+        "total": batch["total"],
+        "duplicates": batch["duplicates"],
+        "queued": batch["queued"],
+        "parsed": batch["parsed"],
+        "failed": batch["failed"],
+        "progress": round(done / batch["queued"] * 100, 1) if batch["queued"] else 100.0,
+        "created_at": batch["created_at"],
+        "completed_at": batch.get("completed_at")
+    }
+
+
+@router.get("/dead-letters")
+async def list_dead_letters(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    current_admin_user_data: dict = Depends(require_admin)
+):
+    """Resumes whose parsing failed permanently, newest first"""
+    cursor = db.resume_dead_letters.find({"status": "dead"}).sort("failed_at", -1).limit(limit)
+    dead_letters = []
+    async for doc in cursor:
+        doc["resume_id"] = doc.pop("_id")
+        dead_letters.append(doc)
+    return {"dead_letters": dead_letters, "count": len(dead_letters)}
+
+
+@router.post("/dead-letters/requeue", status_code=status.HTTP_202_ACCEPTED)
+async def requeue_dead_letters(
+    request: RequeueRequest,
+    current_admin_user_data: dict = Depends(require_admin)
+):
+    """
+    Send dead-lettered resumes back through parsing, selected by id and/or batch.
+    Parsing is idempotent, so requeueing a resume twice is harmless.
+    """
+    if not request.resume_ids and not request.batch_id:
+        raise HTTPException(status_code=400, detail="Provide resume_ids or batch_id.")
+
+    query = {"status": "dead"}
+    if request.resume_ids:
+        query["_id"] = {"$in": request.resume_ids}
+    if request.batch_id:
+        query["batch_id"] = request.batch_id
+
+    requeued = []
+    async for doc in db.resume_dead_letters.find(query, {"file_path": 1, "user_id": 1}):
+        if not await run_in_threadpool(os.path.exists, doc["file_path"]):
+            continue
+        await db.resume_dead_letters.update_one(
+            {"_id": doc["_id"]},
+            {"$set": {"status": "requeued", "requeued_at": datetime.utcnow()}}
+        )
+        await db.resumes.update_many(
+            {"$or": [{"resume_id": doc["_id"]}, {"duplicate_of": doc["_id"]}]},
+            {"$set": {"parse_phase": "pending"}, "$unset": {"parse_error": ""}}
+        )
+        parse_resume_task.delay(doc["file_path"], doc.get("user_id"))
+        requeued.append(doc["_id"])
+
+    return {"message": f"Requeued {len(requeued)} resume(s) for parsing", "resume_ids": requeued}
+
+
+@router.post("/analyze/batch", status_code=status.HTTP_202_ACCEPTED)
+async def analyze_resume_batch(
+    request: BatchAnalysisRequest,
+    current_admin_user_data: dict = Depends(require_admin)
+):
+    """
+    Analyze many resumes against one job description (or a job's posting) in the background.
+    Workers keep ANALYSIS_BATCH_CONCURRENCY provider calls in flight per task.
+    """
+    resume_ids = list(dict.fromkeys(request.resume_ids))
+    if not resume_ids:
+        raise HTTPException(status_code=400, detail="Provide at least one resume id.")
+    if len(resume_ids) > settings.ANALYSIS_BATCH_MAX_RESUMES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.ANALYSIS_BATCH_MAX_RESUMES} resumes per batch.")
+    if request.job_id and request.job_description:
+        raise HTTPException(status_code=400, detail="Provide job_id or job_description, not both.")
+    if resolve_provider(request.provider) not in ("gemini", "openai", "mock"):
+        raise HTTPException(status_code=400, detail=f"Unsupported LLM provider: {request.provider}")
+
+    job_description = request.job_description or ""
+    if request.job_id:
+        try:
+            job = await db.jobs.find_one({"_id": ObjectId(request.job_id)})
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid job id")
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        job_description = job_text(job)
+
+    found = set(await db.resumes.distinct("resume_id", {"resume_id": {"$in": resume_ids}}))
+    not_found = [resume_id for resume_id in resume_ids if resume_id not in found]
+    resume_ids = [resume_id for resume_id in resume_ids if resume_id in found]
+    if not resume_ids:
+        raise HTTPException(status_code=404, detail="None of the resumes were found.")
+
+    admin_user_id = current_admin_user_data["id"]
+    batch_id = f"analysis_{uuid.uuid4()}"
+    now = datetime.utcnow()
+    await db.analysis_batches.insert_one({
+        "_id": batch_id,
+        "created_by": admin_user_id,
+        "job_id": request.job_id,
+        "provider": request.provider,
+        "total": len(resume_ids),
+        "analyzed": 0,
+        "cached": 0,
+        "failed": 0,
+        "failed_resume_ids": [],
+        "status": "processing",
+        "created_at": now,
+        "completed_at": None
+    })
+    await db.resumes.update_many(
+        {"resume_id": {"$in": resume_ids}},
+        {"$set": {
+            "status": "analysis_started",
+            "job_description": job_description,
+            "provider": request.provider,
+            "analysis_requested_by": admin_user_id,
+            "analysis_requested_at": now,
+            "analysis_batch_id": batch_id
+        }}
+    )
+    dispatch_analysis_batch(batch_id, resume_ids, job_description, request.provider)
+
+    return {
+        "message": "Batch accepted for analysis",
+        "batch_id": batch_id,
+        "queued": len(resume_ids),
+        "not_found": not_found,
+        "provider": request.provider
+    }
+
+
+@router.get("/analyze/batch/{batch_id}")
+async def get_analysis_batch_progress(batch_id: str, current_admin_user_data: dict = Depends(require_admin)):
+    batch = await db.analysis_batches.find_one({"_id": batch_id})
+    if not batch:
+        raise HTTPException(status_code=404, detail="Analysis batch not found")
+    done = batch["analyzed"] + batch["failed"]
+    return {
+        "batch_id": batch_id,
+        "status": batch["status"],
+        "job_id": batch.get("job_id"),
+        "provider": batch["provider"],
+        "total": batch["total"],
+        "analyzed": batch["analyzed"],
+        "cached": batch["cached"],
+        "failed": batch["failed"],
+        "failed_resume_ids": batch.get("failed_resume_ids", []),
+        "progress": round(done / batch["total"] * 100, 1) if batch["total"] else 100.0,
+        "created_at": batch["created_at"],
+        "completed_at": batch.get("completed_at")
     }
 
 
@@ -76,7 +432,7 @@ async def analyze_resume(
         admin_user_id = current_admin_user_data["id"]
 
         # Update resume status in DB
-        await db.resumes.update_one(
+        resume_meta = await db.resumes.find_one_and_update(
             {"resume_id": resume_id},
             {"$set": {
                 "status": "analysis_started",
@@ -84,9 +440,30 @@ async def analyze_resume(
                 "provider": request.provider,
                 "analysis_requested_by": admin_user_id,
                 "analysis_requested_at": datetime.utcnow()
-            }}
+            }},
+            projection={"duplicate_of": 1, "features": 1}
         )
 
+        # Identical request analyzed before: answer from the cache without a task or provider call
+        text_id = (resume_meta or {}).get("duplicate_of") or resume_id
+        resume_text = await get_resume_store().get_text_async(text_id)
+        if resume_text is not None:
+            cache_key = analysis_cache_key_for(resume_text, request.job_description, request.provider, (resume_meta or {}).get("features"))
+            analysis = await get_analysis_cache().get_async(cache_key)
+            if analysis:
+                await run_in_threadpool(get_resume_store().put_analysis, resume_id, analysis)
+                # The candidate is notified just as if the worker had run the analysis
+                notify_analysis_task.delay(resume_id, analysis)
+                return {
+                    "message": "Analysis served from cache.",
+                    "task_id": None,
+                    "resume_id": resume_id,
+                    "provider": request.provider,
+                    "cache": "hit",
+                    "analysis": analysis,
+                    "email_sent": True
+                }
+
         # Trigger background task
         task_id = trigger_resume_analysis(
             resume_id=resume_id,
@@ -100,6 +477,7 @@ async def analyze_resume(
             "task_id": task_id,
             "resume_id": resume_id,
             "provider": request.provider,
+            "cache": "miss",
             "email_sent": True
         }
     except Exception as e:
@@ -109,7 +487,7 @@ async def analyze_resume(
 @router.get("/analysis/{resume_id}")
 async def get_analysis(resume_id: str, current_admin_user_data: dict = Depends(require_admin)):
     try:
-        analysis = get_resume_analysis(resume_id)
+        analysis = await get_resume_analysis_async(resume_id)
 
         if not analysis:
             # Check DB if metadata exists
@@ -127,26 +505,163 @@ async def get_analysis(resume_id: str, current_admin_user_data: dict = Depends(r
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Only the fields list_resumes returns; the headline is cut server-side
+RESUME_LIST_PROJECTION = {
+    "resume_id": 1,
+    "filename": 1,
+    "status": 1,
+    "parse_phase": 1,
+    "page_count": 1,
+    "headline": {"$substrCP": ["$preview_text", 0, 200]},
+    "skills": 1,
+    "years_experience": 1,
+    "provider": 1,
+    "job_description": 1,
+    "duplicate_of": 1,
+    "near_duplicate_of": 1,
+    "created_at": 1
+}
+
+
 @router.get("/list")
-async def list_resumes(current_user_data: dict = Depends(get_current_user)):
+async def list_resumes(
+    skill: Optional[str] = Query(None, description="Only resumes listing this skill (aliases such as 'k8s' are normalized)"),
+    min_years: Optional[float] = Query(None, ge=0, description="Minimum years of experience"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by resume status"),
+    provider: Optional[str] = Query(None, description="Filter by analysis provider"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user_data: dict = Depends(get_current_user)
+):
+    query = {}
+    if current_user_data.get("role") != "admin":
+        query["user_id"] = current_user_data["id"]
+    if skill:
+        query["skills"] = normalize_skill(skill)
+    if min_years is not None:
+        query["years_experience"] = {"$gte": min_years}
+    if status_filter:
+        query["status"] = status_filter
+    if provider:
+        query["provider"] = provider
+    query = with_keyset(query, cursor, "created_at")
+
     try:
-        query = {}
-        if current_user_data.get("role") != "admin":
-            query["user_id"] = current_user_data["id"]
+        # Newest first; fetch one extra document to know whether another page exists
+        resumes_cursor = (
+            db.resumes.find(query, RESUME_LIST_PROJECTION)
+            .sort([("created_at", -1), ("_id", -1)])
+            .limit(limit + 1)
+        )
+        docs = await resumes_cursor.to_list(length=limit + 1)
+        has_more = len(docs) > limit
+        docs = docs[:limit]
 
-        resumes_cursor = db.resumes.find(query)
         resumes = []
-        async for r in resumes_cursor:
+        for r in docs:
             resumes.append({
                 "resume_id": r.get("resume_id") or str(r.get("_id")),
                 "filename": r.get("filename", ""),
                 "status": r.get("status", "unknown"),
+                "parse_phase": r.get("parse_phase", "unknown"),
+                "page_count": r.get("page_count"),
+                "headline": (r.get("headline") or "").strip(),
+                "skills": r.get("skills", []),
+                "years_experience": r.get("years_experience"),
                 "provider": r.get("provider", None),
                 "job_description": r.get("job_description", None),
+                "duplicate_of": r.get("duplicate_of"),
+                "near_duplicate_of": r.get("near_duplicate_of"),
                 "created_at": r.get("created_at")
             })
 
-        return {"resumes": resumes}
+        next_cursor = encode_cursor(docs[-1].get("created_at"), docs[-1]["_id"]) if has_more else None
+        return {"resumes": resumes, "next_cursor": next_cursor, "limit": limit}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search")
+async def search_resumes(
+    q: str = Query(..., min_length=1, max_length=500, description="Free-text query, e.g. 'python kubernetes fintech'"),
+    k: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    current_admin_user_data: dict = Depends(require_admin)
+):
+    """Rank fully parsed resumes against a free-text query with BM25"""
+    started = time.perf_counter()
+    hits = await get_resume_search().search(q, k)
+    results = await describe_hits(hits)
+
+    return {
+        "query": q,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+@router.get("/{resume_id}/duplicates")
+async def get_resume_duplicates(resume_id: str, current_admin_user_data: dict = Depends(require_admin)):
+    """
+    Exact duplicates (same file content) and near-duplicates (MinHash/LSH) of a resume,
+    in both directions: earlier originals and later copies.
+    """
+    resume = await db.resumes.find_one({"resume_id": resume_id}, {"resume_id": 1, "duplicate_of": 1, "near_duplicate_of": 1})
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found.")
+
+    # Exact duplicates share the canonical copy's text and signature
+    canonical_id = resume.get("duplicate_of") or resume_id
+    exact = []
+    async for doc in db.resumes.find({"$or": [{"resume_id": canonical_id}, {"duplicate_of": canonical_id}]}, {"resume_id": 1}):
+        if doc["resume_id"] != resume_id:
+            exact.append(doc["resume_id"])
+
+    canonical = await db.resumes.find_one({"resume_id": canonical_id}, {"minhash": 1}) or {}
+    near = []
+    if canonical.get("minhash"):
+        pipeline = candidate_pipeline(band_keys(canonical["minhash"]), canonical_id)
+        candidates = await db.resumes.aggregate(pipeline).to_list(length=None)
+        near = rank_candidates(canonical["minhash"], candidates, settings.NEAR_DUPLICATE_THRESHOLD)
+
+    return {
+        "resume_id": resume_id,
+        "duplicate_of": resume.get("duplicate_of"),
+        "near_duplicate_of": resume.get("near_duplicate_of"),
+        "exact_duplicates": exact,
+        "near_duplicates": near,
+        "signature_ready": bool(canonical.get("minhash"))
+    }
+
+
+@router.get("/{resume_id}/similar")
+async def get_similar_resumes(
+    resume_id: str,
+    k: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    current_admin_user_data: dict = Depends(require_admin)
+):
+    """Candidates whose resumes are semantically closest to this one (local embeddings, approximate search)"""
+    started = time.perf_counter()
+    resume = await db.resumes.find_one({"resume_id": resume_id}, {"duplicate_of": 1, "embedding": 1, "embedding_version": 1, "parse_phase": 1})
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found.")
+
+    # Exact duplicates share the canonical copy's text and embedding
+    canonical_id = resume.get("duplicate_of") or resume_id
+    vectors = get_resume_vectors()
+    vector = vectors.index.vector(canonical_id)
+    if vector is None and resume.get("embedding_version") == EMBEDDING_VERSION:
+        vector = from_binary(resume.get("embedding"))
+    if vector is None:
+        if resume.get("parse_phase") != "full":
+            raise HTTPException(status_code=409, detail="Resume has not been fully parsed yet.")
+        if resume.get("embedding_version") != EMBEDDING_VERSION:
+            raise HTTPException(status_code=409, detail="Resume embedding is outdated and is being recomputed; try again shortly.")
+        raise HTTPException(status_code=409, detail="Resume has no text to compare.")
+
+    hits = await vectors.similar(vector, k, exclude=[canonical_id, resume_id])
+    return {
+        "resume_id": resume_id,
+        "results": await describe_hits(hits, "similarity"),
+        "took_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
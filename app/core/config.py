@@ -23,6 +23,39 @@ class Settings(BaseSettings):
     ZOOM_CLIENT_ID: Optional[str] = None
     ZOOM_CLIENT_SECRET: Optional[str] = None
     GOOGLE_CALENDAR_ID: Optional[str] = None
+    MAX_RESUME_UPLOAD_MB: int = 10
+    MAX_BULK_UPLOAD_MB: int = 500
+    RESUME_PARSE_CHUNK_SIZE: int = 25
+    RESUME_PREVIEW_PAGES: int = 2
+    RESUME_PREVIEW_CHARS: int = 2000
+    RESUME_FULL_PARSE_PRIORITY: int = 9  # Redis broker: 0 is highest, 9 lowest
+    RESUME_PARSE_MAX_RETRIES: int = 5
+    RESUME_PARSE_RETRY_BACKOFF: int = 2  # seconds, doubled on each retry
+    RESUME_PARSE_RETRY_BACKOFF_MAX: int = 300
+    RESUME_STORE_BACKEND: str = "filesystem"  # or "mongo"
+    RESUME_STORE_PATH: str = "app/uploads/json"
+    RESUME_TEXT_CACHE_SIZE: int = 512
+    RESUME_SEARCH_INDEX_PATH: str = "app/uploads/search/bm25.pkl"
+    RESUME_SEARCH_REFRESH_SECONDS: float = 5.0
+    RESUME_INDEX_LAG_SECONDS: float = 60.0  # resume indexes re-scan this far behind their watermark
+    JOB_CATALOG_REFRESH_SECONDS: float = 60.0
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8  # estimated Jaccard similarity of word 3-shingles
+    GEMINI_MODEL: str = "gemini-1.5-flash-latest"
+    OPENAI_MODEL: str = "gpt-3.5-turbo"
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_RETRIES: int = 2  # OpenAI SDK retries (with backoff) on connection errors, 429 and 5xx; the SDK default
+    # Shared provider rate limits (0 = unlimited); set them to your account's quota
+    GEMINI_REQUESTS_PER_MINUTE: int = 0
+    GEMINI_TOKENS_PER_MINUTE: int = 0
+    OPENAI_REQUESTS_PER_MINUTE: int = 0
+    OPENAI_TOKENS_PER_MINUTE: int = 0
+    LLM_EXPECTED_OUTPUT_TOKENS: int = 1000  # answer size assumed when reserving tokens before a call
+    LLM_RATE_LIMIT_MAX_WAIT_SECONDS: float = 300.0
+    ANALYSIS_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    ANALYSIS_BATCH_MAX_RESUMES: int = 1000
+    ANALYSIS_BATCH_CHUNK_SIZE: int = 100  # resumes per worker task
+    ANALYSIS_BATCH_CONCURRENCY: int = 16  # provider calls in flight per task
+    ANALYSIS_BATCH_WRITE_SIZE: int = 25  # results written to the store per bulk write
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,178 @@
+# app/db/indexes.py
+"""
+Declarative index registry for every collection the services query.
+
+`INDEXES` is applied idempotently at API startup (ensure_indexes) and by
+`python -m app.Scripts.create_indexes`. `QUERY_SHAPES` lists the filter/sort
+shapes the services issue; find_collscans() explains each of them and
+reports any that would scan a whole collection. When you add a query, add
+its shape here and, if needed, the index that serves it.
+
+Dashboard aggregations that $group over an entire collection and
+count_documents({}) are deliberately not listed: they read everything by
+design.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+NEWEST_FIRST = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("role", ASCENDING)], name="role"),
+    ],
+    "resumes": [
+        # Legacy documents written by the old parse task have no resume_id
+        IndexModel([("resume_id", ASCENDING)], name="resume_id_unique", unique=True, sparse=True),
+        IndexModel(NEWEST_FIRST, name="created_at_id"),
+        IndexModel([("user_id", ASCENDING)] + NEWEST_FIRST, name="user_created_at_id"),
+        IndexModel([("status", ASCENDING)] + NEWEST_FIRST, name="status_created_at_id"),
+        IndexModel([("provider", ASCENDING)] + NEWEST_FIRST, name="provider_created_at_id"),
+        IndexModel([("skills", ASCENDING)], name="skills"),
+        IndexModel([("duplicate_of", ASCENDING)], name="duplicate_of", sparse=True),
+        IndexModel([("batch_id", ASCENDING)], name="batch_id", sparse=True),
+        IndexModel([("parsed_at", ASCENDING)], name="parsed_at", sparse=True),
+        IndexModel([("lsh_bands", ASCENDING)], name="lsh_bands", sparse=True),
+        IndexModel([("embedding_version", ASCENDING)], name="embedding_version"),
+    ],
+    "resume_dead_letters": [
+        IndexModel([("status", ASCENDING), ("failed_at", DESCENDING)], name="status_failed_at"),
+        IndexModel([("batch_id", ASCENDING)], name="batch_id", sparse=True),
+    ],
+    "applications": [
+        IndexModel([("job_id", ASCENDING)], name="job_id"),
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+    "jobs": [
+        IndexModel(NEWEST_FIRST, name="created_at_id"),
+        IndexModel([("posted_by", ASCENDING)], name="posted_by"),
+        IndexModel([("location_normalized", ASCENDING)] + NEWEST_FIRST, name="location_created_at_id"),
+        IndexModel([("company", ASCENDING)] + NEWEST_FIRST, name="company_created_at_id"),
+        IndexModel([("tags_normalized", ASCENDING)] + NEWEST_FIRST, name="tags_created_at_id"),
+        IndexModel([("skills_normalized", ASCENDING)] + NEWEST_FIRST, name="skills_created_at_id"),
+        IndexModel([("embedding_version", ASCENDING)], name="embedding_version"),
+        IndexModel(
+            [("title", TEXT), ("skills", TEXT), ("tags", TEXT), ("description", TEXT)],
+            name="job_text",
+            weights={"title": 10, "skills": 5, "tags": 5, "description": 1}
+        ),
+    ],
+}
+
+_SAMPLE_ID = ObjectId("000000000000000000000000")
+_SAMPLE_TIME = datetime(2024, 1, 1)
+
+# (collection, filter, sort, where the query comes from)
+QUERY_SHAPES: List[Dict[str, Any]] = [
+    {"collection": "users", "filter": {"username": "u"}, "source": "AuthService / get_current_user"},
+    {"collection": "users", "filter": {"role": "candidate"}, "source": "DashboardService.get_overview"},
+    {"collection": "resumes", "filter": {"resume_id": "r"}, "source": "resume routes / analyze_resume_task"},
+    {"collection": "resumes", "filter": {"resume_id": {"$in": ["r1", "r2"]}}, "source": "bulk_upload_resumes / analyze_resume_batch"},
+    {"collection": "resumes", "filter": {"duplicate_of": "r"}, "source": "resume_service._record_parse_phase"},
+    {"collection": "resumes", "filter": {}, "sort": NEWEST_FIRST, "source": "list_resumes (admin)"},
+    {"collection": "resumes", "filter": {"user_id": "u"}, "sort": NEWEST_FIRST, "source": "list_resumes (candidate)"},
+    {"collection": "resumes", "filter": {"status": "uploaded"}, "sort": NEWEST_FIRST, "source": "list_resumes?status="},
+    {"collection": "resumes", "filter": {"provider": "mock"}, "sort": NEWEST_FIRST, "source": "list_resumes?provider="},
+    {"collection": "resumes", "filter": {"skills": "python"}, "sort": NEWEST_FIRST, "source": "list_resumes?skill="},
+    {"collection": "resumes", "filter": {"parse_phase": "full", "duplicate_of": {"$exists": False}, "parsed_at": {"$gte": _SAMPLE_TIME}}, "sort": [("parsed_at", ASCENDING)], "source": "ResumeSearchService.refresh"},
+    {"collection": "resumes", "filter": {"parse_phase": "full", "duplicate_of": {"$exists": False}, "embedding_version": 1, "parsed_at": {"$gte": _SAMPLE_TIME}}, "sort": [("parsed_at", ASCENDING)], "source": "ResumeVectorService.refresh"},
+    {"collection": "resumes", "filter": {"lsh_bands": {"$in": ["00:a", "01:b"]}, "resume_id": {"$ne": "r"}, "duplicate_of": {"$exists": False}}, "source": "near_duplicates.candidate_pipeline ($match stage)"},
+    {"collection": "resume_hashes", "filter": {"_id": {"$in": ["h1", "h2"]}}, "source": "claim_content_hashes"},
+    {"collection": "resume_batches", "filter": {"_id": "b"}, "source": "get_batch_progress"},
+    {"collection": "analysis_batches", "filter": {"_id": "b"}, "source": "get_analysis_batch_progress / analyze_resume_batch_task"},
+    {"collection": "resume_dead_letters", "filter": {"status": "dead"}, "sort": [("failed_at", DESCENDING)], "source": "list_dead_letters"},
+    {"collection": "resume_dead_letters", "filter": {"batch_id": "b", "status": "dead"}, "source": "requeue_dead_letters"},
+    {"collection": "applications", "filter": {"job_id": "j"}, "source": "JobService.get_applications_by_job"},
+    {"collection": "applications", "filter": {"user_id": "u"}, "source": "JobService.recommend_jobs"},
+    {"collection": "resumes", "filter": {"user_id": "u", "parse_phase": "full"}, "sort": NEWEST_FIRST, "source": "JobService.recommend_jobs"},
+    {"collection": "jobs", "filter": {"_id": {"$in": [_SAMPLE_ID]}}, "source": "JobService.recommend_jobs"},
+    {"collection": "applications", "filter": {"created_at": {"$gte": _SAMPLE_TIME}}, "source": "DashboardService.get_daily_applications"},
+    {"collection": "applications", "filter": {}, "sort": [("created_at", DESCENDING)], "source": "DashboardService.get_recent_activity"},
+    {"collection": "jobs", "filter": {}, "sort": [("created_at", DESCENDING)], "source": "DashboardService.get_recent_activity"},
+    {"collection": "jobs", "filter": {}, "sort": [("created_at", ASCENDING), ("_id", ASCENDING)], "source": "JobService.list_jobs?sort=oldest"},
+    {"collection": "jobs", "filter": {"$or": [{"created_at": {"$lt": _SAMPLE_TIME}}, {"created_at": _SAMPLE_TIME, "_id": {"$lt": _SAMPLE_ID}}]}, "sort": NEWEST_FIRST, "source": "JobService.list_jobs?cursor="},
+    {"collection": "jobs", "filter": {"$text": {"$search": "python"}}, "sort": [("score", {"$meta": "textScore"}), ("created_at", DESCENDING)], "source": "JobService.list_jobs?keyword="},
+    {"collection": "jobs", "filter": {"location_normalized": "remote"}, "sort": [("created_at", DESCENDING), ("_id", DESCENDING)], "source": "JobService.list_jobs?location="},
+    {"collection": "jobs", "filter": {"company": "TechCorp"}, "sort": NEWEST_FIRST, "source": "JobService.list_jobs?company="},
+    {"collection": "jobs", "filter": {"tags_normalized": "python"}, "sort": NEWEST_FIRST, "source": "JobService.list_jobs?tag="},
+    {"collection": "jobs", "filter": {"skills_normalized": "python"}, "sort": NEWEST_FIRST, "source": "JobService.list_jobs?skill="},
+    {"collection": "jobs", "filter": {"$text": {"$search": "python"}}, "source": "JobService.search_jobs (facet ids)"},
+    {"collection": "jobs", "filter": {"$or": [
+        {"created_at": {"$exists": False}},
+        {"location_normalized": {"$exists": False}},
+        {"tags_normalized": {"$exists": False}},
+        {"skills_normalized": {"$exists": False}},
+        {"embedding_version": {"$ne": 1}},
+    ]}, "source": "JobService.backfill_search_fields"},
+    {"collection": "migrations", "filter": {"_id": "applicant_vectors"}, "source": "JobService.backfill_applicant_vectors"},
+    {"collection": "resumes", "filter": {"parse_phase": "full", "duplicate_of": {"$exists": False}, "embedding_version": {"$ne": 1}}, "source": "backfill_resume_embeddings"},
+    {"collection": "migrations", "filter": {"_id": "resume_embeddings_v1"}, "source": "backfill_resume_embeddings"},
+    {"collection": "jobs", "filter": {"_id": _SAMPLE_ID}, "source": "JobService.get_best_resumes"},
+    {"collection": "jobs", "filter": {"_id": _SAMPLE_ID, "posted_by": "admin"}, "source": "JobService.update_job / delete_job"},
+]
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create every registered index on a Motor database. Safe to run repeatedly.
+
+    Returns:
+        collection -> names of the indexes in the registry
+    """
+    created = {}
+    for collection, models in INDEXES.items():
+        try:
+            created[collection] = await db[collection].create_indexes(models)
+        except OperationFailure as e:
+            print(f"⚠️ Could not create indexes on {collection}: {e}")
+    return created
+
+
+def ensure_indexes_sync(db) -> Dict[str, List[str]]:
+    """PyMongo counterpart of ensure_indexes, for scripts and tests"""
+    created = {}
+    for collection, models in INDEXES.items():
+        try:
+            created[collection] = db[collection].create_indexes(models)
+        except OperationFailure as e:
+            print(f"⚠️ Could not create indexes on {collection}: {e}")
+    return created
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """Every stage name in an explain plan tree (classic or SBE layout)"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+def find_collscans(db) -> List[Dict[str, Any]]:
+    """
+    Explain every registered query shape on a PyMongo database.
+
+    Returns:
+        The shapes whose winning plan contains a COLLSCAN
+    """
+    offenders = []
+    for shape in QUERY_SHAPES:
+        cursor = db[shape["collection"]].find(shape["filter"])
+        if shape.get("sort"):
+            cursor = cursor.sort(shape["sort"])
+        winning_plan = cursor.explain()["queryPlanner"]["winningPlan"]
+        if "COLLSCAN" in _plan_stages(winning_plan):
+            offenders.append(shape)
+    return offenders
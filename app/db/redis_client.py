@@ -0,0 +1,9 @@
+# app/db/redis_client.py
+# Redis clients for application data (caches, rate limits); Celery keeps its own connections.
+# Connections are opened lazily, on the first command.
+import redis
+import redis.asyncio as redis_async
+from app.core.config import settings
+
+redis_sync = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+redis_aio = redis_async.Redis.from_url(settings.REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from app.Scripts.create_admin import create_initial_admin
 from app.api.v1.users import router as users_router
@@ -10,6 +11,12 @@ from app.api.v1 import applications
 from fastapi.openapi.utils import get_openapi
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings  
+from app.db.mongo import db
+from app.db.indexes import ensure_indexes
+from app.services.resume_search import get_resume_search
+from app.services.vector_index import backfill_resume_embeddings, get_resume_vectors
+from app.services.job_service import JobService
+from app.services.job_catalog import get_job_catalog
 
 app = FastAPI()
 
@@ -19,6 +26,23 @@ async def startup_db_client():
         client = AsyncIOMotorClient(settings.MONGO_URI)
         await client.server_info()  # Ping the server
         print("✅ MongoDB connected")
+        await ensure_indexes(db)
+        print("✅ MongoDB indexes ensured")
+        backfilled = await JobService.backfill_search_fields()
+        if backfilled:
+            print(f"✅ Backfilled search fields on {backfilled} job(s)")
+        # Applications from before ranking: vectorized once, in the background
+        asyncio.create_task(JobService.backfill_applicant_vectors())
+        await get_job_catalog().reload(force=True)
+        print(f"✅ Job catalog loaded ({len(get_job_catalog())} jobs)")
+        search = get_resume_search()
+        print(f"✅ Resume search index loaded ({len(search.index)} resumes)")
+        # Catch up on resumes parsed while the API was down, without delaying startup
+        asyncio.create_task(search.refresh(force=True))
+        # The vector index is rebuilt from stored embeddings on every start
+        asyncio.create_task(get_resume_vectors().refresh(force=True))
+        # Resumes embedded by an older EMBEDDING_VERSION are re-embedded once, in the background
+        asyncio.create_task(backfill_resume_embeddings())
     except Exception as e:
         print("❌ MongoDB connection failed:", e)
 
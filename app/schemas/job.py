@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from datetime import datetime
 
 class JobCreate(BaseModel):
     title: str
@@ -24,6 +25,8 @@ class JobOut(JobCreate):
 class PublicJobOut(JobCreate):
     id: str = Field(..., alias="_id") 
     posted_by: str
+    created_at: Optional[datetime] = None
+    score: Optional[float] = None  # text search relevance
 
     class Config:
         allow_population_by_field_name = True
@@ -0,0 +1,137 @@
+# app/services/analysis_cache.py
+"""
+Content-addressed cache of LLM resume analyses in Redis.
+
+The key is a hash of everything that determines the model's answer: the
+resume text, the job description, the provider, the model, the version of
+the prompt template and the parser features included in the prompt. Any
+resume with the same text (a re-click on "analyze", a re-run batch, an
+identical file uploaded twice) reuses the stored analysis instead of
+calling the provider again. Changing the prompt template changes its
+version and therefore every key, so stale entries are never read; they
+expire after ANALYSIS_CACHE_TTL_SECONDS. Redis evicts entries early under
+memory pressure (maxmemory-policy volatile-lru in docker-compose).
+
+The cache is an optimization only: when Redis is unavailable every lookup
+is a miss and nothing is stored.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+KEY_PREFIX = "analysis:"
+
+
+def analysis_cache_key(
+    resume_text: str,
+    job_description: str,
+    provider: str,
+    model: str,
+    prompt_version: str,
+    features: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Redis key of the analysis of these inputs"""
+    digest = hashlib.sha256()
+    for part in (provider, model, prompt_version, job_description or "", resume_text or ""):
+        encoded = part.encode("utf-8")
+        # Length-prefixed so that ("ab", "c") and ("a", "bc") never collide
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    digest.update(json.dumps(features or {}, sort_keys=True, default=str).encode("utf-8"))
+    return f"{KEY_PREFIX}{provider}:{digest.hexdigest()}"
+
+
+def is_cacheable(analysis: Dict[str, Any]) -> bool:
+    """Failed calls and unparseable answers are retried next time rather than cached"""
+    return "error" not in analysis and "note" not in analysis
+
+
+class AnalysisCache:
+    """Get/put analyses by key on a sync or asyncio Redis client"""
+
+    def __init__(self, client=None, async_client=None, ttl_seconds: Optional[int] = None):
+        self._client = client
+        self._async_client = async_client
+        self.ttl_seconds = ttl_seconds or settings.ANALYSIS_CACHE_TTL_SECONDS
+
+    @property
+    def client(self):
+        if self._client is None:
+            from app.db.redis_client import redis_sync
+            self._client = redis_sync
+        return self._client
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            from app.db.redis_client import redis_aio
+            self._async_client = redis_aio
+        return self._async_client
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self.client.get(key)
+        except RedisError as e:
+            print(f"⚠️ Analysis cache unavailable: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self.async_client.get(key)
+        except RedisError as e:
+            print(f"⚠️ Analysis cache unavailable: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    def get_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Look up many keys in one round trip (MGET); misses are None"""
+        if not keys:
+            return []
+        try:
+            raws = self.client.mget(keys)
+        except RedisError as e:
+            print(f"⚠️ Analysis cache unavailable: {e}")
+            return [None] * len(keys)
+        return [json.loads(raw) if raw else None for raw in raws]
+
+    def put(self, key: str, analysis: Dict[str, Any]) -> bool:
+        """Store a successful analysis; returns whether it was stored"""
+        if not is_cacheable(analysis):
+            return False
+        try:
+            self.client.set(key, json.dumps(analysis, default=str), ex=self.ttl_seconds)
+        except RedisError as e:
+            print(f"⚠️ Analysis cache unavailable: {e}")
+            return False
+        return True
+
+    def put_many(self, analyses: Dict[str, Dict[str, Any]]) -> int:
+        """Store many analyses in one pipelined round trip; returns how many were stored"""
+        cacheable = {key: analysis for key, analysis in analyses.items() if is_cacheable(analysis)}
+        if not cacheable:
+            return 0
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, analysis in cacheable.items():
+                pipe.set(key, json.dumps(analysis, default=str), ex=self.ttl_seconds)
+            pipe.execute()
+        except RedisError as e:
+            print(f"⚠️ Analysis cache unavailable: {e}")
+            return 0
+        return len(cacheable)
+
+
+_cache: Optional[AnalysisCache] = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    global _cache
+    if _cache is None:
+        _cache = AnalysisCache()
+    return _cache
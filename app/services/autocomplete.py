@@ -0,0 +1,158 @@
+# app/services/autocomplete.py
+"""
+Sorted-prefix index for type-ahead suggestions.
+
+Every suggestion is stored under each of its word suffixes ("senior backend
+engineer", "backend engineer", "engineer"), so typing any word of a title
+finds it. Keys live in one sorted list, so two binary searches give the
+number of keys a prefix matches. A narrow range is scanned directly; a wide
+one (short prefixes such as "s") is answered instead by walking the entries
+heaviest first until enough of them match, which stops early precisely
+because matches are common. Results are cached per prefix until the index
+next changes.
+"""
+
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+Entry = Tuple[str, str]  # (kind, normalized text)
+
+_CACHE_SIZE = 2048
+# Above this many matching keys, walk entries by weight instead of scanning the range
+_RANGE_SCAN_LIMIT = 256
+_MAX_CHAR = "\U0010ffff"
+
+
+def normalize_text(value: str) -> str:
+    return " ".join(re.sub(r"[^\w\s+#.]", " ", value.lower()).split())
+
+
+class PrefixIndex:
+    """Weighted completions (kind, label) found by prefix of any word"""
+
+    def __init__(self):
+        self._keys: List[Tuple[str, Entry]] = []
+        self._weights: Dict[Entry, float] = {}
+        self._labels: Dict[Entry, Counter] = {}
+        self._cache: Dict[Tuple[str, int, Optional[str]], List[Dict[str, object]]] = {}
+        self._by_weight: Optional[List[Entry]] = None
+        self._sorted = True
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._weights)
+
+    @staticmethod
+    def _suffixes(normalized: str) -> List[str]:
+        words = normalized.split(" ")
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def _changed(self):
+        self._cache.clear()
+        self._by_weight = None
+
+    def _sort_keys(self):
+        # Additions are appended and sorted on the next read, so bulk loads sort once
+        if not self._sorted:
+            self._keys.sort()
+            self._sorted = True
+
+    def warm(self):
+        """Do the deferred sorting now rather than on the first lookup (after a bulk load)"""
+        with self._lock:
+            self._sort_keys()
+            if self._by_weight is None:
+                self._by_weight = sorted(self._weights, key=self._rank, reverse=True)
+
+    def add(self, kind: str, label: str, weight: float = 1.0):
+        normalized = normalize_text(label)
+        if not normalized:
+            return
+        entry = (kind, normalized)
+        with self._lock:
+            if entry not in self._weights:
+                self._weights[entry] = 0.0
+                self._labels[entry] = Counter()
+                self._keys.extend((key, entry) for key in self._suffixes(normalized))
+                self._sorted = False
+            self._weights[entry] += weight
+            self._labels[entry][label.strip()] += 1
+            self._changed()
+
+    def remove(self, kind: str, label: str, weight: float = 1.0):
+        normalized = normalize_text(label)
+        entry = (kind, normalized)
+        with self._lock:
+            if entry not in self._weights:
+                return
+            self._weights[entry] -= weight
+            labels = self._labels[entry]
+            labels[label.strip()] -= 1
+            if labels[label.strip()] <= 0:
+                del labels[label.strip()]
+            if self._weights[entry] <= 1e-9 or not labels:
+                del self._weights[entry]
+                del self._labels[entry]
+                self._sort_keys()
+                for key in self._suffixes(normalized):
+                    position = bisect_left(self._keys, (key, entry))
+                    if position < len(self._keys) and self._keys[position] == (key, entry):
+                        del self._keys[position]
+            self._changed()
+
+    def suggest(self, prefix: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict[str, object]]:
+        """
+        Top completions for a prefix, heaviest first.
+
+        Args:
+            prefix: What the user has typed so far
+            limit: Number of suggestions
+            kind: Only suggestions of this kind ("title", "company", "skill")
+
+        Returns:
+            [{text, kind, weight}]
+        """
+        normalized = normalize_text(prefix)
+        if not normalized:
+            return []
+        cache_key = (normalized, limit, kind)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            self._sort_keys()
+            start = bisect_left(self._keys, (normalized,))
+            end = bisect_left(self._keys, (normalized + _MAX_CHAR,), start)
+            if end - start <= _RANGE_SCAN_LIMIT:
+                matches = {entry for _, entry in self._keys[start:end] if kind is None or entry[0] == kind}
+                best = heapq.nlargest(limit, matches, key=self._rank)
+            else:
+                best = self._heaviest_matching(normalized, limit, kind)
+            results = [
+                {"text": self._labels[entry].most_common(1)[0][0], "kind": entry[0], "weight": self._weights[entry]}
+                for entry in best
+            ]
+            if len(self._cache) >= _CACHE_SIZE:
+                self._cache.clear()
+            self._cache[cache_key] = results
+            return results
+
+    def _rank(self, entry: Entry) -> Tuple[float, str]:
+        return self._weights[entry], entry[1]
+
+    def _heaviest_matching(self, normalized: str, limit: int, kind: Optional[str]) -> List[Entry]:
+        if self._by_weight is None:
+            self._by_weight = sorted(self._weights, key=self._rank, reverse=True)
+        needle = " " + normalized
+        best = []
+        for entry in self._by_weight:
+            if (kind is None or entry[0] == kind) and needle in " " + entry[1]:
+                best.append(entry)
+                if len(best) == limit:
+                    break
+        return best
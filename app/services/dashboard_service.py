@@ -76,7 +76,7 @@ class DashboardService:
 
     @staticmethod
     async def get_recent_activity():
-        latest_jobs = await db.jobs.find().sort("created_at", -1).limit(5).to_list(length=5)
+        latest_jobs = await db.jobs.find({}, {"embedding": 0}).sort("created_at", -1).limit(5).to_list(length=5)
         latest_apps = await db.applications.find().sort("created_at", -1).limit(5).to_list(length=5)
         return {
             "recent_jobs": latest_jobs,
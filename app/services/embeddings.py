@@ -0,0 +1,110 @@
+# app/services/embeddings.py
+"""
+Offline text embeddings: feature hashing plus a fixed sparse random projection.
+
+A text becomes a bag of features: its words and word pairs, plus one
+feature per canonical skill and per skill category the taxonomy finds in
+it. The skill and category features are what let "built REST services"
+and "FastAPI backend" land near each other: both mention a web framework.
+Each feature is hashed to a few signed dimensions of a small dense vector
+(a sparse Johnson-Lindenstrauss projection that needs no stored matrix),
+and the sum is L2-normalized, so a dot product is a cosine similarity.
+
+Everything is deterministic and CPU-only: the same text gives the same
+vector in every process, and nothing needs fitting or a network call.
+Vectors are stored as raw float32 bytes (1 KB each at 256 dimensions).
+"""
+
+import hashlib
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from bson.binary import Binary
+
+from app.services.resume_search import tokenize
+from app.services.skill_taxonomy import SKILL_CATEGORIES, TECHNICAL_MATCHER
+
+EMBEDDING_DIM = 256
+EMBEDDING_VERSION = 1  # bump whenever features or hashing change; stored vectors are then stale
+NONZEROS_PER_FEATURE = 4
+
+# Relative weight of each feature family
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.5
+SKILL_WEIGHT = 3.0
+CATEGORY_WEIGHT = 1.5
+
+
+@lru_cache(maxsize=200_000)
+def _feature_projection(feature: str) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    """The dimensions a feature is projected onto and the sign on each"""
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=2 * NONZEROS_PER_FEATURE).digest()
+    dims, signs = [], []
+    for i in range(NONZEROS_PER_FEATURE):
+        value = int.from_bytes(digest[2 * i:2 * i + 2], "little")
+        dims.append(value % EMBEDDING_DIM)
+        signs.append(1.0 if value & 0x8000 else -1.0)
+    return tuple(dims), tuple(signs)
+
+
+def text_features(text: str) -> Counter:
+    """Weighted features of a text: words, word pairs, canonical skills and skill categories"""
+    words = tokenize(text or "")
+    features: Counter = Counter()
+    for word, count in Counter(words).items():
+        features[f"w:{word}"] = WORD_WEIGHT * (1.0 + math.log(count))
+    for bigram, count in Counter(zip(words, words[1:])).items():
+        features[f"b:{bigram[0]} {bigram[1]}"] = BIGRAM_WEIGHT * (1.0 + math.log(count))
+    for skill in TECHNICAL_MATCHER.find(text or ""):
+        features[f"s:{skill}"] = SKILL_WEIGHT
+        category = SKILL_CATEGORIES.get(skill)
+        if category:
+            features[f"c:{category}"] += CATEGORY_WEIGHT
+    return features
+
+
+def embed_text(text: str) -> Optional[np.ndarray]:
+    """
+    Unit-length float32 embedding of a text.
+
+    Returns:
+        EMBEDDING_DIM float32 values, or None for text with no words
+    """
+    features = text_features(text)
+    if not features:
+        return None
+    dims, values = [], []
+    for feature, weight in features.items():
+        feature_dims, signs = _feature_projection(feature)
+        dims.extend(feature_dims)
+        values.extend(sign * weight for sign in signs)
+    vector = np.bincount(dims, weights=values, minlength=EMBEDDING_DIM)
+    norm = np.linalg.norm(vector)
+    if not norm:
+        return None
+    return (vector / norm).astype(np.float32)
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    """Title, skills, tags and description of a job as one text to embed"""
+    skills = ", ".join(job.get("skills") or [])
+    tags = ", ".join(job.get("tags") or [])
+    return f"{job.get('title') or ''}\n{skills}\n{tags}\n{job.get('description') or ''}"
+
+
+def to_binary(vector: Optional[np.ndarray]) -> Optional[Binary]:
+    return None if vector is None else Binary(vector.astype(np.float32).tobytes())
+
+
+def from_binary(value: Optional[bytes]) -> Optional[np.ndarray]:
+    if not value or len(value) != EMBEDDING_DIM * 4:
+        return None
+    return np.frombuffer(bytes(value), dtype=np.float32)
+
+
+def embedding_fields(text: str) -> Dict[str, Any]:
+    """Fields stored on a resume or job document"""
+    return {"embedding": to_binary(embed_text(text)), "embedding_version": EMBEDDING_VERSION}
@@ -0,0 +1,276 @@
+# app/services/job_catalog.py
+"""
+In-memory catalog of the facet fields of every job.
+
+Job search needs facet counts (location, company, tags, skills) next to its
+results. Instead of a $group per facet per request, each API process keeps
+the facet values of every job and, per facet value, the set of jobs that
+have it. Counting a facet for a filtered result set is then a handful of
+set intersections.
+
+The catalog also owns the autocomplete index for job titles, companies
+and skills, weighted by how many jobs use a term and how many applications
+those jobs received, and an inverted canonical skill -> jobs index (from
+skills and tags) used to recommend jobs to candidates.
+
+JobService updates the catalog on create/update/delete. Other API
+processes pick those changes up at the next scheduled reload, every
+JOB_CATALOG_REFRESH_SECONDS.
+"""
+
+import asyncio
+import heapq
+import math
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.autocomplete import PrefixIndex
+
+FACETS = ("location", "company", "tags", "skills")
+
+# A skill listed by the job counts fully; one only implied by a tag counts half
+REQUIRED_SKILL_WEIGHT = 1.0
+TAG_SKILL_WEIGHT = 0.5
+CATALOG_PROJECTION = {
+    "title": 1, "location": 1, "location_normalized": 1, "company": 1,
+    "tags": 1, "tags_normalized": 1, "skills": 1, "skills_normalized": 1,
+}
+
+
+def facet_values(job: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """
+    Facet -> {filter value: display label} for one job document.
+
+    Filter values are the normalized fields list_jobs filters on, so a
+    facet value can be sent straight back as a filter.
+    """
+    from app.services.job_service import derived_search_fields
+    derived = derived_search_fields(job)
+    values = {facet: {} for facet in FACETS}
+    if derived.get("location_normalized"):
+        values["location"][derived["location_normalized"]] = job["location"].strip()
+    if job.get("company"):
+        values["company"][job["company"]] = job["company"]
+    for raw in job.get("tags") or []:
+        # Same normalization as tags_normalized, walked per tag so blanks cannot shift labels
+        value = raw.strip().lower()
+        if value:
+            values["tags"].setdefault(value, raw.strip())
+    for value in derived.get("skills_normalized") or []:
+        values["skills"].setdefault(value, value)
+    return values
+
+
+def skill_weights(job: Dict[str, Any]) -> Dict[str, float]:
+    """Canonical skill -> weight of that skill for the job, from its skills and the tags that name a known skill"""
+    from app.services.skill_taxonomy import TECHNICAL_MATCHER, normalize_skill
+    weights = {}
+    for skill in job.get("skills") or []:
+        if skill.strip():
+            weights[normalize_skill(skill)] = REQUIRED_SKILL_WEIGHT
+    for tag in job.get("tags") or []:
+        skill = TECHNICAL_MATCHER.canonical(tag)
+        if skill:
+            weights.setdefault(skill, TAG_SKILL_WEIGHT)
+    return weights
+
+
+def suggestion_terms(job: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(kind, label) autocomplete entries contributed by one job"""
+    terms = []
+    if job.get("title"):
+        terms.append(("title", job["title"]))
+    if job.get("company"):
+        terms.append(("company", job["company"]))
+    for skill in dict.fromkeys(skill.strip() for skill in job.get("skills") or [] if skill.strip()):
+        terms.append(("skill", skill))
+    return terms
+
+
+class JobCatalog:
+    """Facet postings (facet -> value -> job ids), skill postings and autocomplete entries for every job"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[str, Set[str]]] = {facet: {} for facet in FACETS}
+        self._labels: Dict[str, Dict[str, Counter]] = {facet: {} for facet in FACETS}
+        self._skill_postings: Dict[str, Set[str]] = {}
+        self.suggestions = PrefixIndex()
+        self._lock = threading.RLock()
+        self._loaded_at = 0.0
+        self._reload_lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def upsert(self, job: Dict[str, Any], applications: Optional[int] = None):
+        """
+        Add a job document, replacing its previous facet values and suggestions.
+
+        Args:
+            job: Job document
+            applications: Application count, used as popularity; kept from the previous version if omitted
+        """
+        job_id = str(job["_id"])
+        values = facet_values(job)
+        terms = suggestion_terms(job)
+        skills = skill_weights(job)
+        with self._lock:
+            previous = self._jobs.get(job_id)
+            if applications is None:
+                applications = previous["applications"] if previous else 0
+            self.remove(job_id)
+            self._jobs[job_id] = {"facets": values, "skills": skills, "suggestions": terms, "applications": applications}
+            for skill in skills:
+                self._skill_postings.setdefault(skill, set()).add(job_id)
+            for facet, labels in values.items():
+                for value, label in labels.items():
+                    self._postings[facet].setdefault(value, set()).add(job_id)
+                    self._labels[facet].setdefault(value, Counter())[label] += 1
+            for kind, label in terms:
+                self.suggestions.add(kind, label, 1 + applications)
+
+    def remove(self, job_id: str):
+        with self._lock:
+            record = self._jobs.pop(str(job_id), None)
+            if record is None:
+                return
+            for skill in record["skills"]:
+                postings = self._skill_postings.get(skill)
+                if postings is not None:
+                    postings.discard(str(job_id))
+                    if not postings:
+                        del self._skill_postings[skill]
+            for kind, label in record["suggestions"]:
+                self.suggestions.remove(kind, label, 1 + record["applications"])
+            for facet, labels in record["facets"].items():
+                for value, label in labels.items():
+                    postings = self._postings[facet].get(value)
+                    if postings is not None:
+                        postings.discard(str(job_id))
+                        if not postings:
+                            del self._postings[facet][value]
+                    label_counts = self._labels[facet].get(value)
+                    if label_counts is not None:
+                        label_counts[label] -= 1
+                        if label_counts[label] <= 0:
+                            del label_counts[label]
+                        if not label_counts:
+                            del self._labels[facet][value]
+
+    def replace_all(self, jobs: Iterable[Dict[str, Any]], applications: Optional[Dict[str, int]] = None):
+        applications = applications or {}
+        fresh = JobCatalog()
+        for job in jobs:
+            fresh.upsert(job, applications.get(str(job["_id"]), 0))
+        fresh.suggestions.warm()
+        with self._lock:
+            self._jobs, self._postings, self._labels = fresh._jobs, fresh._postings, fresh._labels
+            self._skill_postings = fresh._skill_postings
+            self.suggestions = fresh.suggestions
+            self._loaded_at = time.monotonic()
+
+    def matching(self, filters: Dict[str, Optional[str]]) -> Optional[Set[str]]:
+        """Jobs having every given facet value, or None when no facet filter is set"""
+        with self._lock:
+            selected = None
+            for facet, value in filters.items():
+                if value is None:
+                    continue
+                postings = self._postings[facet].get(value, set())
+                selected = set(postings) if selected is None else selected & postings
+            return selected
+
+    def facet_counts(self, job_ids: Optional[Set[str]] = None, top: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Most common values of every facet among the given jobs (all jobs by default).
+
+        Returns:
+            facet -> [{value, label, count}], most frequent first
+        """
+        counts = {}
+        with self._lock:
+            for facet in FACETS:
+                if job_ids is None:
+                    sizes = ((value, len(postings)) for value, postings in self._postings[facet].items())
+                else:
+                    sizes = ((value, len(postings & job_ids)) for value, postings in self._postings[facet].items())
+                ranked = sorted(((value, size) for value, size in sizes if size), key=lambda item: (-item[1], item[0]))[:top]
+                counts[facet] = [
+                    {"value": value, "label": self._labels[facet][value].most_common(1)[0][0], "count": size}
+                    for value, size in ranked
+                ]
+        return counts
+
+    def recommend(self, skills: Iterable[str], limit: int = 10, exclude: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Jobs best covered by a candidate's skills, found through the skill postings only.
+
+        A job's score is the share of its (IDF-weighted) skills the candidate
+        has, 0-100, so rare skills count for more than ones every job asks for.
+
+        Args:
+            skills: Canonical skills of the candidate
+            limit: Number of jobs to return
+            exclude: Job ids to leave out (already applied to)
+
+        Returns:
+            [{job_id, score, matched_skills}], best first
+        """
+        excluded = set(exclude)
+        with self._lock:
+            total = len(self._jobs)
+            idf = {}
+
+            def weight(skill: str) -> float:
+                if skill not in idf:
+                    idf[skill] = math.log((total + 1) / (len(self._skill_postings.get(skill, ())) + 1)) + 1.0
+                return idf[skill]
+
+            matched: Dict[str, List[str]] = {}
+            for skill in dict.fromkeys(skills):
+                for job_id in self._skill_postings.get(skill, ()):
+                    if job_id not in excluded:
+                        matched.setdefault(job_id, []).append(skill)
+
+            scored = []
+            for job_id, job_skills in matched.items():
+                weights = self._jobs[job_id]["skills"]
+                covered = sum(weights[skill] * weight(skill) for skill in job_skills)
+                required = sum(value * weight(skill) for skill, value in weights.items())
+                scored.append((round(covered / required * 100, 2), len(job_skills), job_id, job_skills))
+
+        best = heapq.nlargest(limit, scored, key=lambda item: (item[0], item[1], item[2]))
+        return [{"job_id": job_id, "score": score, "matched_skills": job_skills} for score, _, job_id, job_skills in best]
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self._loaded_at >= settings.JOB_CATALOG_REFRESH_SECONDS
+
+    async def reload(self, force: bool = False):
+        """Rebuild from the jobs collection when the scheduled refresh is due"""
+        if not force and not self.is_stale():
+            return
+        from app.db.mongo import db
+        async with self._reload_lock:
+            if not force and not self.is_stale():
+                return
+            jobs = await db.jobs.find({}, CATALOG_PROJECTION).to_list(length=None)
+            # One $group per reload (not per request) for popularity
+            applications = {
+                row["_id"]: row["count"]
+                async for row in db.applications.aggregate([{"$group": {"_id": "$job_id", "count": {"$sum": 1}}}])
+            }
+            self.replace_all(jobs, applications)
+
+    def suggest(self, prefix: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.suggestions.suggest(prefix, limit, kind)
+
+
+_catalog = JobCatalog()
+
+
+def get_job_catalog() -> JobCatalog:
+    return _catalog
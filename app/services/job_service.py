@@ -2,56 +2,361 @@
 from fastapi import HTTPException
 from app.db.mongo import db
 from bson import ObjectId
+from pymongo import UpdateOne
 from datetime import datetime
+import re
+from starlette.concurrency import run_in_threadpool
 
 from app.schemas.job import JobOut
+from app.services.job_catalog import get_job_catalog
+from app.utils.pagination import decode_cursor, encode_cursor, with_keyset
+
+JOB_SORTS = ("relevance", "newest", "oldest")
+JOB_COUNT_CAP = 10000  # filtered counts stop here; pagers show "10000+"
+
+
+def normalize_location(location):
+    """Case-, punctuation- and whitespace-insensitive form of a location, used for exact filtering"""
+    if not location:
+        return None
+    return " ".join(re.sub(r"[^\w\s]", " ", location.lower()).split()) or None
+
+
+def derived_search_fields(job: dict) -> dict:
+    """Normalized copies of whichever of location, tags and skills the job (or update) sets"""
+    from app.services.skill_taxonomy import normalize_skill
+    fields = {}
+    if "location" in job:
+        fields["location_normalized"] = normalize_location(job.get("location"))
+    if "tags" in job:
+        fields["tags_normalized"] = [tag.strip().lower() for tag in job.get("tags") or [] if tag.strip()]
+    if "skills" in job:
+        fields["skills_normalized"] = [normalize_skill(skill) for skill in job.get("skills") or [] if skill.strip()]
+    return fields
+
+
+async def _store_applicant_vectors(applications: list) -> dict:
+    """
+    Compute term vectors for applications in one threadpool call and write them with one bulk_write.
+
+    Returns:
+        application _id -> vector fields
+    """
+    from app.services.ranking_service import applicant_vector
+    if not applications:
+        return {}
+    vectors = await run_in_threadpool(
+        lambda: {app["_id"]: applicant_vector(app.get("resume_text") or "") for app in applications}
+    )
+    await db.applications.bulk_write(
+        [UpdateOne({"_id": app_id}, {"$set": fields}) for app_id, fields in vectors.items()],
+        ordered=False
+    )
+    return vectors
+
+
+def with_search_fields(job: dict) -> dict:
+    """Add the derived fields job search filters and sorts on, and the job's embedding"""
+    from app.services.embeddings import embedding_fields, job_text
+    job.setdefault("created_at", datetime.utcnow())
+    job.update(derived_search_fields({key: job.get(key) for key in ("location", "tags", "skills")}))
+    job.update(embedding_fields(job_text(job)))
+    return job
+
+
+def _job_query(keyword=None, location=None, company=None, tag=None, skill=None) -> dict:
+    from app.services.skill_taxonomy import normalize_skill
+    query = {}
+    if keyword:
+        query["$text"] = {"$search": keyword}
+    if location:
+        query["location_normalized"] = normalize_location(location)
+    if company:
+        query["company"] = company
+    if tag:
+        query["tags_normalized"] = tag.strip().lower()
+    if skill:
+        query["skills_normalized"] = normalize_skill(skill)
+    return query
+
 
 class JobService:
     @staticmethod
     async def create_job(data, username):
-        job = data.dict()
+        job = with_search_fields(data.dict())
         job["posted_by"] = username
         result = await db.jobs.insert_one(job)
         job["_id"] = str(result.inserted_id)  # ✅ Use alias _id for Pydantic mapping
+        get_job_catalog().upsert(job)
         return JobOut(**job)
 
 
     @staticmethod
-    async def list_jobs(keyword=None, location=None, skip=0, limit=10):
+    async def list_jobs(keyword=None, location=None, limit=10, sort=None, cursor=None, company=None, tag=None, skill=None, with_total=True):
+        """
+        Search public job postings, one keyset page at a time.
+
+        Args:
+            keyword: Words matched against the jobs text index (title, skills, tags, description)
+            location: Exact location, compared after normalization
+            limit: Maximum number of results
+            sort: "relevance" (default when searching), "newest" (default otherwise) or "oldest"
+            cursor: next_cursor returned with the previous page
+            company, tag, skill: Exact facet filters (tag and skill are normalized)
+            with_total: Count the matching jobs; callers that count them another way skip the query
+
+        Returns:
+            (list of PublicJobOut, cursor of the next page or None, total, whether total is exact)
+        """
         from app.schemas.job import PublicJobOut
-        query = {}
-        if keyword:
-            query["$or"] = [
-                {"title": {"$regex": keyword, "$options": "i"}},
-                {"description": {"$regex": keyword, "$options": "i"}}
+        sort = sort or ("relevance" if keyword else "newest")
+        if sort not in JOB_SORTS:
+            raise HTTPException(400, detail=f"sort must be one of: {', '.join(JOB_SORTS)}")
+        if sort == "relevance" and not keyword:
+            raise HTTPException(400, detail="sort=relevance requires a keyword")
+        if cursor and decode_cursor(cursor)[2].get("o") != sort:
+            raise HTTPException(400, detail="Cursor belongs to a different sort order")
+
+        query = _job_query(keyword, location, company, tag, skill)
+
+        if sort == "relevance":
+            # textScore is only filterable after $addFields, so relevance pages run as a pipeline
+            pipeline = [
+                {"$match": query},
+                {"$addFields": {"score": {"$meta": "textScore"}}},
+                {"$match": with_keyset({}, cursor, "score")},
+                {"$sort": {"score": -1, "_id": -1}},
+                {"$limit": limit + 1}
             ]
-        if location:
-            query["location"] = {"$regex": location, "$options": "i"}
+            docs = await db.jobs.aggregate(pipeline).to_list(length=limit + 1)
+            sort_field = "score"
+        else:
+            descending = sort == "newest"
+            direction = -1 if descending else 1
+            jobs_cursor = (
+                db.jobs.find(with_keyset(query, cursor, "created_at", descending), {"score": {"$meta": "textScore"}} if keyword else None)
+                .sort([("created_at", direction), ("_id", direction)])
+                .limit(limit + 1)
+            )
+            docs = await jobs_cursor.to_list(length=limit + 1)
+            sort_field = "created_at"
+
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1].get(sort_field), docs[-1]["_id"], o=sort) if has_more else None
+
+        # Cheap totals for pagers: collection metadata when unfiltered, a capped count otherwise
+        if not with_total:
+            total, exact = None, False
+        elif query:
+            total = await db.jobs.count_documents(query, limit=JOB_COUNT_CAP)
+            exact = total < JOB_COUNT_CAP
+        else:
+            total = await db.jobs.estimated_document_count()
+            exact = False
 
-        jobs_cursor = db.jobs.find(query).skip(skip).limit(limit)
         jobs = []
-        async for job in jobs_cursor:
+        for job in docs:
             job["_id"] = str(job["_id"])  # ✅ Convert ObjectId to string
             jobs.append(PublicJobOut(**job))
-        return jobs
+        return jobs, next_cursor, total, exact
+
+    @staticmethod
+    async def search_jobs(keyword=None, location=None, limit=10, sort=None, cursor=None, company=None, tag=None, skill=None, facet_size=10):
+        """
+        One page of search results plus facet counts for the whole result set.
+
+        Facets come from the in-memory job catalog. Facet filters are
+        intersected there. With a keyword, the ids of every match are streamed
+        from the text index by an _id-only cursor, which replaces the count
+        query list_jobs would otherwise run, so the request makes no extra
+        round trip and the total is exact.
+
+        Returns:
+            Dictionary with jobs, facets, next_cursor, total and total_exact
+        """
+        jobs, next_cursor, total, exact = await JobService.list_jobs(
+            keyword, location, limit, sort, cursor, company, tag, skill, with_total=not keyword
+        )
+
+        catalog = get_job_catalog()
+        await catalog.reload()
+        from app.services.skill_taxonomy import normalize_skill
+        matching = catalog.matching({
+            "location": normalize_location(location) if location else None,
+            "company": company,
+            "tags": tag.strip().lower() if tag else None,
+            "skills": normalize_skill(skill) if skill else None,
+        })
+        if keyword:
+            # Batched cursor, so broad keywords are not bound by the 16 MB single-document limit of distinct
+            text_ids = set()
+            async for doc in db.jobs.find({"$text": {"$search": keyword}}, {"_id": 1}):
+                text_ids.add(str(doc["_id"]))
+            matching = text_ids if matching is None else matching & text_ids
+            total, exact = len(matching), True
+
+        return {
+            "jobs": jobs,
+            "facets": catalog.facet_counts(matching, top=facet_size),
+            "next_cursor": next_cursor,
+            "total": total,
+            "total_exact": exact
+        }
+
+    @staticmethod
+    async def recommend_jobs(user: dict, limit: int = 10):
+        """
+        Recommend jobs to a candidate from the skills of their latest parsed resume.
+
+        Candidate skills are looked up in the job catalog's inverted
+        skill -> jobs index, so only jobs sharing a skill are scored and
+        only the recommended ones are read from MongoDB.
+
+        Args:
+            user: Current candidate (id and username)
+            limit: Number of jobs to return
+
+        Returns:
+            Dictionary with resume_id, skills and the recommended jobs, best first
+        """
+        from app.schemas.job import PublicJobOut
+        resume = await db.resumes.find_one(
+            {"user_id": user["id"], "parse_phase": "full"},
+            {"resume_id": 1, "skills": 1},
+            sort=[("created_at", -1), ("_id", -1)]
+        )
+        if not resume:
+            raise HTTPException(404, detail="Upload a resume to get job recommendations")
+        skills = resume.get("skills") or []
+
+        applied = await db.applications.distinct("job_id", {"user_id": user["username"]})
+        catalog = get_job_catalog()
+        await catalog.reload()
+        matches = catalog.recommend(skills, limit, exclude=applied)
+
+        docs = await db.jobs.find({"_id": {"$in": [ObjectId(match["job_id"]) for match in matches]}}).to_list(length=len(matches))
+        by_id = {str(doc["_id"]): doc for doc in docs}
+        jobs = []
+        for match in matches:
+            job = by_id.get(match["job_id"])
+            if job is None:  # deleted since the catalog was loaded
+                continue
+            job["_id"] = match["job_id"]
+            jobs.append({
+                **PublicJobOut(**{**job, "score": match["score"]}).dict(by_alias=True),
+                "matched_skills": match["matched_skills"],
+            })
+        return {"resume_id": resume.get("resume_id"), "skills": skills, "jobs": jobs}
+
+    @staticmethod
+    async def get_best_resumes(job_id: str, k: int = 10):
+        """
+        Resumes semantically closest to a job posting, from the local embedding index.
+
+        Args:
+            job_id: Job to match resumes against
+            k: Number of resumes to return
+
+        Returns:
+            Dictionary with the job id and the closest resumes, most similar first
+        """
+        from app.services.embeddings import embed_text, from_binary, job_text
+        from app.services.resume_search import describe_hits
+        from app.services.vector_index import get_resume_vectors
+        try:
+            job = await db.jobs.find_one({"_id": ObjectId(job_id)})
+        except Exception:
+            raise HTTPException(400, detail="Invalid job ID")
+        if not job:
+            raise HTTPException(404, detail="Job not found")
+
+        vector = from_binary(job.get("embedding"))
+        if vector is None:
+            vector = embed_text(job_text(job))
+        if vector is None:
+            return {"job_id": job_id, "results": []}
+        hits = await get_resume_vectors().similar(vector, k)
+        return {"job_id": job_id, "results": await describe_hits(hits, "similarity")}
+
+    @staticmethod
+    async def backfill_search_fields():
+        """
+        Give jobs created before search fields existed a created_at and normalized facet fields.
+
+        Returns:
+            Number of jobs updated
+        """
+        updated = 0
+        from app.services.embeddings import EMBEDDING_VERSION, embedding_fields, job_text
+        missing = {"$or": [
+            {"created_at": {"$exists": False}},
+            {"location_normalized": {"$exists": False}},
+            {"tags_normalized": {"$exists": False}},
+            {"skills_normalized": {"$exists": False}},
+            {"embedding_version": {"$ne": EMBEDDING_VERSION}},
+        ]}
+        projection = {"title": 1, "description": 1, "location": 1, "tags": 1, "skills": 1, "created_at": 1}
+        async for job in db.jobs.find(missing, projection):
+            fields = derived_search_fields({key: job.get(key) for key in ("location", "tags", "skills")})
+            fields.update(embedding_fields(job_text(job)))
+            if "created_at" not in job:
+                fields["created_at"] = job["_id"].generation_time.replace(tzinfo=None)
+            await db.jobs.update_one({"_id": job["_id"]}, {"$set": fields})
+            updated += 1
+        return updated
 
 
 
     @staticmethod
-    async def apply_to_job(job_id, user_id, resume_text=None):
+    async def backfill_applicant_vectors(batch_size: int = 500):
+        """
+        Store term vectors on applications created before ranking existed.
+
+        Runs once per database: finding the remaining legacy applications
+        means scanning the collection, so completion is recorded in
+        `migrations` and later startups skip the scan.
+
+        Returns:
+            Number of applications updated
+        """
+        if await db.migrations.find_one({"_id": "applicant_vectors"}):
+            return 0
+        updated = 0
+        batch = []
+        async for app in db.applications.find({"terms": {"$exists": False}}, {"resume_text": 1}):
+            batch.append(app)
+            if len(batch) >= batch_size:
+                updated += len(await _store_applicant_vectors(batch))
+                batch = []
+        if batch:
+            updated += len(await _store_applicant_vectors(batch))
+        await db.migrations.update_one(
+            {"_id": "applicant_vectors"},
+            {"$set": {"completed_at": datetime.utcnow(), "updated": updated}},
+            upsert=True
+        )
+        return updated
+
+    @staticmethod
+    async def apply_to_job(job_id, user_id, resume_text=None, resume_id=None, skills=None):
+        from app.services.ranking_service import applicant_vector
         application = {
             "job_id": job_id,
             "user_id": user_id,
+            "resume_id": resume_id,
             "resume_text": resume_text,
             "created_at": datetime.utcnow()
         }
+        # Term vector used by ranked-applicants, computed once per application
+        application.update(await run_in_threadpool(applicant_vector, resume_text, skills))
         result = await db.applications.insert_one(application)
         application["_id"] = str(result.inserted_id)
         return application
 
     @staticmethod
     async def get_applications_by_job(job_id):
-        apps_cursor = db.applications.find({"job_id": job_id})
+        apps_cursor = db.applications.find({"job_id": job_id}, {"terms": 0})
         apps = []
         async for app in apps_cursor:
             app["_id"] = str(app["_id"])  # Convert ObjectId to string
@@ -60,15 +365,85 @@ class JobService:
     
     
 
+    @staticmethod
+    async def get_ranked_applicants(job_id: str, limit: int = 50):
+        """
+        Rank all applicants of a job with the deterministic scoring engine.
+
+        Args:
+            job_id: Job to rank applicants for
+            limit: Number of top applicants to return
+
+        Returns:
+            Dictionary with the total number of applicants and the top ones, best first
+        """
+        from app.services.ranking_service import job_vocabulary, rank_applicants, vocabulary_projection
+        try:
+            job = await db.jobs.find_one({"_id": ObjectId(job_id)})
+        except Exception:
+            raise HTTPException(400, detail="Invalid job id")
+        if not job:
+            raise HTTPException(404, detail="Job not found")
+
+        # Only the parts of each term vector that can score against this job leave MongoDB
+        columns, _, _ = job_vocabulary(job)
+        pipeline = [
+            {"$match": {"job_id": job_id}},
+            {"$project": {
+                "user_id": 1,
+                "resume_id": 1,
+                "created_at": 1,
+                "has_vector": {"$ne": [{"$type": "$terms"}, "missing"]},
+                **vocabulary_projection(columns)
+            }}
+        ]
+        applicants = await db.applications.aggregate(pipeline).to_list(length=None)
+
+        # Legacy applications are vectorized at startup; any left over are done here in bulk
+        legacy_ids = [app["_id"] for app in applicants if not app["has_vector"]]
+        if legacy_ids:
+            legacy = await db.applications.find({"_id": {"$in": legacy_ids}}, {"resume_text": 1}).to_list(length=None)
+            vectors = await _store_applicant_vectors(legacy)
+            for app in applicants:
+                if app["_id"] in vectors:
+                    app.update(vectors[app["_id"]])
+
+        ranked = await run_in_threadpool(rank_applicants, job, applicants, limit)
+        return {
+            "job_id": job_id,
+            "total_applicants": len(applicants),
+            "ranked": [
+                {
+                    "application_id": str(app["_id"]),
+                    "user_id": app.get("user_id"),
+                    "resume_id": app.get("resume_id"),
+                    "score": app["score"],
+                    "skill_match": app["skill_match"],
+                    "matched_skills": app["matched_skills"],
+                    "created_at": app.get("created_at")
+                }
+                for app in ranked
+            ]
+        }
+
     @staticmethod
     async def update_job(job_id: str, job_data, username: str):
+        fields = job_data.dict(exclude_unset=True)
+        fields.update(derived_search_fields(fields))
         result = await db.jobs.update_one(
             {"_id": ObjectId(job_id), "posted_by": username},
-            {"$set": job_data.dict(exclude_unset=True)}
+            {"$set": fields}
         )
         if result.matched_count == 0:
             raise HTTPException(404, detail="Job not found or unauthorized")
-        return await db.jobs.find_one({"_id": ObjectId(job_id)})
+        job = await db.jobs.find_one({"_id": ObjectId(job_id)})
+        if fields.keys() & {"title", "description", "skills", "tags"}:
+            from app.services.embeddings import embedding_fields, job_text
+            embedding = embedding_fields(job_text(job))
+            await db.jobs.update_one({"_id": job["_id"]}, {"$set": embedding})
+            job.update(embedding)
+        get_job_catalog().upsert(job)
+        return job
 
     @staticmethod
     async def delete_job(job_id: str, username: str):
@@ -77,5 +452,6 @@ class JobService:
         )
         if result.deleted_count == 0:
             raise HTTPException(404, detail="Job not found or unauthorized")
+        get_job_catalog().remove(job_id)
         return {"detail": "Job deleted"}
 
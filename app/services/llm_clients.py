@@ -0,0 +1,150 @@
+# app/services/llm_clients.py
+"""
+Provider clients shared by every analysis in a process.
+
+Building a client is not free: `openai.OpenAI()` opens its own HTTP
+connection pool (and pays DNS + TLS on first use), and Gemini needs
+`genai.configure` plus a `GenerativeModel`. The pool creates each provider's
+client once per process, on first use, and hands the same instance to every
+task so connections stay warm between analyses.
+
+Async clients (`openai.AsyncOpenAI`, a Gemini model used through
+`generate_content_async`) are bound to the event loop they first run on,
+so the pool keeps one set per loop: the worker's persistent loop
+(app/workers/event_loop.py) or the API's.
+
+A client is dropped and rebuilt on the next use after a connection-level
+failure, or when `health_check` finds it unusable. After a fork (Celery
+prefork children) the pool starts empty, since pooled sockets must not be
+shared between processes. The mock provider never needs a client.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Dict
+
+import google.generativeai as genai
+import openai
+from google.api_core import exceptions as google_exceptions
+
+from app.core.config import settings
+
+# Failures that mean the connection (not the request) is bad
+CONNECTION_ERRORS = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def configured_providers():
+    """Providers with credentials in the environment"""
+    providers = []
+    if os.getenv("GENAI_API_KEY"):
+        providers.append("gemini")
+    if os.getenv("OPENAI_API_KEY"):
+        providers.append("openai")
+    return providers
+
+
+class ProviderClientPool:
+    """One long-lived client per provider per process"""
+
+    def __init__(self):
+        self._clients: Dict[str, Any] = {}
+        self._async_clients = weakref.WeakKeyDictionary()  # event loop -> {provider: client}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _build(self, provider: str):
+        if provider == "gemini":
+            genai.configure(api_key=os.getenv("GENAI_API_KEY"))
+            return genai.GenerativeModel(settings.GEMINI_MODEL)
+        if provider == "openai":
+            return openai.OpenAI(timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS, max_retries=settings.LLM_MAX_RETRIES)
+        raise ValueError(f"No client for LLM provider: {provider}")
+
+    def _build_async(self, provider: str):
+        if provider == "gemini":
+            # A model's async transport is created on its first async call, so each loop gets its own model
+            genai.configure(api_key=os.getenv("GENAI_API_KEY"))
+            return genai.GenerativeModel(settings.GEMINI_MODEL)
+        if provider == "openai":
+            return openai.AsyncOpenAI(timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS, max_retries=settings.LLM_MAX_RETRIES)
+        raise ValueError(f"No async client for LLM provider: {provider}")
+
+    def _reset_after_fork(self):
+        if os.getpid() != self._pid:
+            # Forked: the parent's sockets belong to the parent
+            self._clients.clear()
+            self._async_clients = weakref.WeakKeyDictionary()
+            self._pid = os.getpid()
+
+    def get(self, provider: str):
+        """The process's client for a provider, created on first use"""
+        with self._lock:
+            self._reset_after_fork()
+            client = self._clients.get(provider)
+            if client is None:
+                client = self._build(provider)
+                self._clients[provider] = client
+                print(f"✅ {provider} client created (pid {self._pid})")
+            return client
+
+    def get_async(self, provider: str):
+        """The running event loop's async client for a provider, created on first use"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._reset_after_fork()
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(provider)
+            if client is None:
+                client = self._build_async(provider)
+                clients[provider] = client
+                print(f"✅ {provider} async client created (pid {self._pid})")
+            return client
+
+    def discard(self, provider: str):
+        """Drop the provider's sync client and its async clients on every loop"""
+        with self._lock:
+            self._clients.pop(provider, None)
+            for clients in self._async_clients.values():
+                clients.pop(provider, None)
+
+    def report_failure(self, provider: str, error: Exception):
+        """Drop the client after a connection-level failure so the next call reconnects"""
+        if isinstance(error, CONNECTION_ERRORS):
+            print(f"⚠️ Dropping {provider} client after connection error: {error}")
+            self.discard(provider)
+
+    def health_check(self, provider: str) -> bool:
+        """Cheap authenticated call (model lookup); an unhealthy client is discarded"""
+        try:
+            if provider == "gemini":
+                self.get(provider)
+                genai.get_model(f"models/{settings.GEMINI_MODEL}")
+            elif provider == "openai":
+                self.get(provider).models.retrieve(settings.OPENAI_MODEL)
+            return True
+        except Exception as e:
+            print(f"⚠️ {provider} health check failed: {e}")
+            self.discard(provider)
+            return False
+
+    def warm_up(self):
+        """Create and check the clients of every configured provider"""
+        for provider in configured_providers():
+            if self.health_check(provider):
+                print(f"✅ {provider} client ready")
+
+
+_pool = ProviderClientPool()
+
+
+def get_client_pool() -> ProviderClientPool:
+    return _pool
@@ -3,76 +3,114 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import smtplib
 from bson import ObjectId
-import google.generativeai as genai
-import openai
+from celery import group
+from celery.signals import worker_process_init
+from datetime import datetime
+import hashlib
 import json
 import os
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from app.core.config import settings
+from app.services.analysis_cache import analysis_cache_key, get_analysis_cache
+from app.services.llm_clients import get_client_pool
+from app.services.rate_limiter import estimate_tokens, get_rate_limiter
 from app.services.email_service import EmailService
+from app.services.resume_store import get_resume_store
+from app.services.skill_taxonomy import SOFT_MATCHER, TECHNICAL_MATCHER
 from app.workers.celery_worker import celery_app
+from app.workers.event_loop import run_in_worker_loop
 from app.db.sync_mongo import db_sync as db 
 
+SYSTEM_PROMPT = "You are an expert HR recruiter analyzing resumes. Provide detailed, accurate analysis in JSON format."
+
+
+def resolve_provider(provider: str) -> str:
+    """The provider that will actually run: Gemini without an API key falls back to mock"""
+    provider = (provider or "gemini").lower()
+    if provider == "gemini" and not os.getenv("GENAI_API_KEY"):
+        return "mock"
+    return provider
+
+
+def provider_model(provider: str) -> str:
+    """Model name used for a (resolved) provider"""
+    return {"gemini": settings.GEMINI_MODEL, "openai": settings.OPENAI_MODEL}.get(provider, provider)
+
+
+def _gemini_tokens_used(response) -> Optional[int]:
+    return getattr(getattr(response, "usage_metadata", None), "total_token_count", None)
+
+
+def _openai_tokens_used(response) -> Optional[int]:
+    return getattr(getattr(response, "usage", None), "total_tokens", None)
+
+
 class LLMService:
     """Service for integrating with various LLM providers"""
     
     def __init__(self, provider: str = "gemini"):
         self.provider = provider.lower()
         self._setup_provider()
+        self.model_name = provider_model(self.provider)
     
     def _setup_provider(self):
         """Setup the selected LLM provider"""
+        # Clients come from the per-process pool when a call needs them (sync, or async per event loop)
         if self.provider == "gemini":
-            # Configure Google Gemini
-            api_key = os.getenv("GENAI_API_KEY")
-            if api_key:
-                genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel('gemini-1.5-flash-latest')
-            else:
+            if not os.getenv("GENAI_API_KEY"):
                 print("Warning: GENAI_API_KEY not found, using mock service")
                 self.provider = "mock"
         
-        elif self.provider == "openai":
-            # OpenAI is already configured via environment variables
-            self.client = openai.OpenAI()
-        
-        elif self.provider == "mock":
-            # Mock service for development
+        elif self.provider in ("openai", "mock"):
+            # OpenAI is configured via environment variables; mock needs nothing
             pass
         
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
     
-    def analyze_resume(self, resume_text: str, job_description: str = "") -> Dict[str, Any]:
+    def analyze_resume(self, resume_text: str, job_description: str = "", features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Analyze resume and provide scoring and insights
         
         Args:
             resume_text: Extracted text from resume
             job_description: Optional job description for matching
+            features: Optional structured features extracted at parse time
             
         Returns:
             Dictionary containing analysis results
         """
         
-        prompt = self._create_analysis_prompt(resume_text, job_description)
-        
         if self.provider == "gemini":
-            return self._analyze_with_gemini(prompt)
+            return self._analyze_with_gemini(self._create_analysis_prompt(resume_text, job_description, features))
         elif self.provider == "openai":
-            return self._analyze_with_openai(prompt)
+            return self._analyze_with_openai(self._create_analysis_prompt(resume_text, job_description, features))
         else:
-            return self._analyze_with_mock(resume_text)
+            return self._analyze_with_mock(resume_text, features)
     
-    def _create_analysis_prompt(self, resume_text: str, job_description: str = "") -> str:
+    def _create_analysis_prompt(self, resume_text: str, job_description: str = "", features: Optional[Dict[str, Any]] = None) -> str:
         """Create a comprehensive prompt for resume analysis"""
         
+        features_block = ""
+        if features:
+            # Parser output is compact and saves the model re-deriving the basics
+            summary = {
+                key: features.get(key)
+                for key in ("skills", "soft_skills", "years_experience", "experience_ranges", "degrees", "sections")
+                if features.get(key)
+            }
+            features_block = f"""
+        PRE-EXTRACTED FEATURES (from the resume parser; verify against the text):
+        {json.dumps(summary, separators=(",", ":"))}
+"""
+
         base_prompt = f"""
         Analyze the following resume and provide a comprehensive evaluation:
 
         RESUME TEXT:
         {resume_text}
-
+{features_block}
         Please provide analysis in the following JSON format:
         {{
             "overall_score": <score from 1-100>,
@@ -115,90 +153,150 @@ class LLMService:
         
         return base_prompt
     
+    async def analyze_resume_async(self, resume_text: str, job_description: str = "", features: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Non-blocking variant of analyze_resume on the providers' async clients.
+
+        Many calls can run concurrently on one event loop. A provider request
+        that takes longer than `timeout` (time queued behind the shared rate
+        limit not included) is cancelled and returns an error analysis;
+        cancelling the caller cancels the provider request as well.
+
+        Args:
+            resume_text: Extracted text from resume
+            job_description: Optional job description for matching
+            features: Optional structured features extracted at parse time
+            timeout: Seconds before the call is abandoned, defaults to LLM_REQUEST_TIMEOUT_SECONDS
+
+        Returns:
+            Dictionary containing analysis results
+        """
+        if self.provider == "mock":
+            return self._analyze_with_mock(resume_text, features)
+
+        prompt = self._create_analysis_prompt(resume_text, job_description, features)
+        timeout = timeout or settings.LLM_REQUEST_TIMEOUT_SECONDS
+        if self.provider == "gemini":
+            return await self._analyze_with_gemini_async(prompt, timeout)
+        return await self._analyze_with_openai_async(prompt, timeout)
+
+    def _parse_response(self, response_text: str) -> Dict[str, Any]:
+        """Analysis JSON from a model answer, or a fallback analysis when there is none"""
+        try:
+            # Find JSON in the response
+            start_idx = response_text.find('{')
+            end_idx = response_text.rfind('}') + 1
+
+            if start_idx != -1 and end_idx != -1:
+                analysis = json.loads(response_text[start_idx:end_idx])
+            else:
+                # Fallback if JSON parsing fails
+                analysis = self._create_fallback_analysis(response_text)
+
+        except json.JSONDecodeError:
+            analysis = self._create_fallback_analysis(response_text)
+
+        analysis["provider"] = self.provider
+        analysis["raw_response"] = response_text
+        return analysis
+
+    def _openai_messages(self, prompt: str):
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
     def _analyze_with_gemini(self, prompt: str) -> Dict[str, Any]:
         """Analyze using Google Gemini"""
         try:
-            response = self.model.generate_content(prompt)
-            
-            # Extract JSON from response
-            response_text = response.text
-            
-            # Try to parse JSON from response
-            try:
-                # Find JSON in the response
-                start_idx = response_text.find('{')
-                end_idx = response_text.rfind('}') + 1
-                
-                if start_idx != -1 and end_idx != -1:
-                    json_str = response_text[start_idx:end_idx]
-                    analysis = json.loads(json_str)
-                else:
-                    # Fallback if JSON parsing fails
-                    analysis = self._create_fallback_analysis(response_text)
-                
-            except json.JSONDecodeError:
-                analysis = self._create_fallback_analysis(response_text)
-            
-            analysis["provider"] = "gemini"
-            analysis["raw_response"] = response_text
-            
-            return analysis
+            # Queue for the cluster-wide rate limit instead of risking a 429
+            limiter, estimate = get_rate_limiter(), estimate_tokens(prompt)
+            limiter.acquire("gemini", self.model_name, estimate)
+            response = get_client_pool().get("gemini").generate_content(prompt)
+            limiter.settle("gemini", self.model_name, estimate, _gemini_tokens_used(response))
+            return self._parse_response(response.text)
             
         except Exception as e:
             print(f"Error with Gemini API: {e}")
+            get_client_pool().report_failure("gemini", e)
             return self._create_error_analysis(str(e))
     
     def _analyze_with_openai(self, prompt: str) -> Dict[str, Any]:
         """Analyze using OpenAI"""
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert HR recruiter analyzing resumes. Provide detailed, accurate analysis in JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
+            limiter, estimate = get_rate_limiter(), estimate_tokens(prompt)
+            limiter.acquire("openai", self.model_name, estimate)
+            response = get_client_pool().get("openai").chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=self._openai_messages(prompt),
                 temperature=0.3
             )
+            limiter.settle("openai", self.model_name, estimate, _openai_tokens_used(response))
+            return self._parse_response(response.choices[0].message.content)
             
-            response_text = response.choices[0].message.content
-            
-            # Try to parse JSON from response
-            try:
-                start_idx = response_text.find('{')
-                end_idx = response_text.rfind('}') + 1
-                
-                if start_idx != -1 and end_idx != -1:
-                    json_str = response_text[start_idx:end_idx]
-                    analysis = json.loads(json_str)
-                else:
-                    analysis = self._create_fallback_analysis(response_text)
-                
-            except json.JSONDecodeError:
-                analysis = self._create_fallback_analysis(response_text)
-            
-            analysis["provider"] = "openai"
-            analysis["raw_response"] = response_text
-            
-            return analysis
-            
         except Exception as e:
             print(f"Error with OpenAI API: {e}")
+            get_client_pool().report_failure("openai", e)
+            return self._create_error_analysis(str(e))
+
+    async def _analyze_with_gemini_async(self, prompt: str, timeout: float) -> Dict[str, Any]:
+        """Analyze using Google Gemini's async API"""
+        try:
+            limiter, estimate = get_rate_limiter(), estimate_tokens(prompt)
+            await limiter.acquire_async("gemini", self.model_name, estimate)
+            model = get_client_pool().get_async("gemini")
+            response = await asyncio.wait_for(model.generate_content_async(prompt), timeout)
+            await limiter.settle_async("gemini", self.model_name, estimate, _gemini_tokens_used(response))
+            return self._parse_response(response.text)
+
+        except asyncio.TimeoutError:
+            return self._timed_out("gemini")
+        except Exception as e:
+            print(f"Error with Gemini API: {e}")
+            get_client_pool().report_failure("gemini", e)
+            return self._create_error_analysis(str(e))
+
+    async def _analyze_with_openai_async(self, prompt: str, timeout: float) -> Dict[str, Any]:
+        """Analyze using the async OpenAI client"""
+        try:
+            limiter, estimate = get_rate_limiter(), estimate_tokens(prompt)
+            await limiter.acquire_async("openai", self.model_name, estimate)
+            client = get_client_pool().get_async("openai")
+            response = await asyncio.wait_for(client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=self._openai_messages(prompt),
+                temperature=0.3
+            ), timeout)
+            await limiter.settle_async("openai", self.model_name, estimate, _openai_tokens_used(response))
+            return self._parse_response(response.choices[0].message.content)
+
+        except asyncio.TimeoutError:
+            return self._timed_out("openai")
+        except Exception as e:
+            print(f"Error with OpenAI API: {e}")
+            get_client_pool().report_failure("openai", e)
             return self._create_error_analysis(str(e))
     
-    def _analyze_with_mock(self, resume_text: str) -> Dict[str, Any]:
+    def _timed_out(self, provider: str) -> Dict[str, Any]:
+        print(f"Error with {provider} API: timed out")
+        get_client_pool().report_failure(provider, TimeoutError())
+        return self._create_error_analysis(f"{provider} request timed out")
+
+    def _analyze_with_mock(self, resume_text: str, features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Mock analysis for development/testing"""
         
-        # Simple keyword-based analysis for development
-        technical_keywords = ["python", "javascript", "java", "react", "sql", "aws", "docker", "kubernetes"]
-        soft_keywords = ["leadership", "communication", "teamwork", "problem-solving", "analytical"]
-        
-        text_lower = resume_text.lower()
-        
-        found_technical = [skill for skill in technical_keywords if skill in text_lower]
-        found_soft = [skill for skill in soft_keywords if skill in text_lower]
-        
-        # Estimate experience based on text length and keywords
-        experience_years = min(len(resume_text) // 500, 15)
+        if features:
+            # Precomputed at parse time: no need to scan the text again
+            found_technical = list(features.get("skills", []))
+            found_soft = list(features.get("soft_skills", []))
+            experience_years = min(int(features.get("years_experience") or 0), 15)
+        else:
+            # One pass over the text for the whole skill taxonomy
+            found_technical = TECHNICAL_MATCHER.find(resume_text)
+            found_soft = SOFT_MATCHER.find(resume_text)
+            
+            # Estimate experience based on text length and keywords
+            experience_years = min(len(resume_text) // 500, 15)
         
         overall_score = min(
             50 + len(found_technical) * 5 + len(found_soft) * 3 + experience_years * 2,
@@ -284,33 +382,53 @@ class LLMService:
         }
 
 
-# The Celery task now handles the email notification
-@celery_app.task
-def analyze_resume_task(resume_id: str, admin_user_id: str, job_description: str = "", provider: str = "gemini"):
-    # Load resume text from JSON
-    json_path = f"app/uploads/json/{resume_id}.json"
-    if not os.path.exists(json_path):
-        print(f"❌ Resume JSON not found: {json_path}")
-        return {"error": "Resume text not found"}
+@lru_cache(maxsize=1)
+def prompt_template_version() -> str:
+    """
+    Fingerprint of the prompt template, part of every analysis cache key.
 
-    with open(json_path, 'r') as f:
-        resume_data = json.load(f)
+    The template is rendered with placeholder inputs and hashed, so any edit
+    to the prompt wording, the JSON schema or the system prompt yields a new
+    version and old cache entries are simply never read again.
+    """
+    template = LLMService.__new__(LLMService)._create_analysis_prompt(
+        "<RESUME>", "<JOB DESCRIPTION>", {"skills": ["<SKILL>"]}
+    )
+    return hashlib.sha256(f"{SYSTEM_PROMPT}\n{template}".encode("utf-8")).hexdigest()[:16]
 
-    resume_text = resume_data.get("text", "")
-    llm_service = LLMService(provider=provider)
-    analysis = llm_service.analyze_resume(resume_text, job_description)
 
-    # Save analysis to JSON
-    analysis_path = f"app/uploads/json/{resume_id}_analysis.json"
-    with open(analysis_path, 'w') as f:
-        json.dump(analysis, f, indent=4)
+def analysis_cache_key_for(resume_text: str, job_description: str, provider: str, features: Optional[Dict[str, Any]] = None) -> str:
+    """Cache key of an analysis request, computed the same way by the API and the worker"""
+    provider = resolve_provider(provider)
+    return analysis_cache_key(resume_text, job_description, provider, provider_model(provider), prompt_template_version(), features)
 
-    # Retrieve resume metadata and candidate email using synchronous PyMongo
-    resume_meta = db.resumes.find_one({"resume_id": resume_id})
-    if not resume_meta:
-        print(f"❌ Resume metadata not found for resume_id: {resume_id}")
-        return {"error": "Resume metadata not found"}
 
+@worker_process_init.connect
+def _warm_up_llm_clients(**kwargs):
+    # Prefork children connect before their first task; solo/thread pools create clients lazily
+    get_client_pool().warm_up()
+
+
+def _analysis_input(resume_id: str, resume_meta: Optional[Dict[str, Any]]):
+    """
+    Text and parser features to analyze for a resume.
+
+    Returns:
+        (text, features, partial_text); text is None when nothing is stored yet
+    """
+    # Deduplicated uploads share the original's text
+    text_id = (resume_meta or {}).get("duplicate_of") or resume_id
+    resume_text = get_resume_store().get_text(text_id)
+    if resume_text is None and (resume_meta or {}).get("preview_text"):
+        # Full extraction still queued: analyze the first-pages preview for now
+        return resume_meta["preview_text"], None, True
+    if resume_text is None:
+        print(f"❌ Resume text not found: {text_id}")
+    return resume_text, (resume_meta or {}).get("features"), False
+
+
+def _notify_candidate(resume_id: str, resume_meta: Dict[str, Any], analysis: Dict[str, Any]):
+    """Enqueue the analysis notification email to the resume's owner, if they have an address"""
     candidate_user_id = resume_meta.get("user_id")
     user_meta = None
     if candidate_user_id:
@@ -351,7 +469,190 @@ def analyze_resume_task(resume_id: str, admin_user_id: str, job_description: str
             )
             print(f"✅ Email notification task enqueued: {email_task.id} for {recipient_email}")
 
-    return {"status": "success", "analysis": analysis}
+
+# The Celery task now handles the email notification
+@celery_app.task
+def analyze_resume_task(resume_id: str, admin_user_id: str, job_description: str = "", provider: str = "gemini"):
+    # Retrieve resume metadata using synchronous PyMongo
+    resume_meta = db.resumes.find_one({"resume_id": resume_id})
+
+    resume_text, features, partial_text = _analysis_input(resume_id, resume_meta)
+    if resume_text is None:
+        return {"error": "Resume text not found"}
+
+    # Same text, job description, provider, model and prompt: reuse the cached analysis
+    cache = get_analysis_cache()
+    cache_key = analysis_cache_key_for(resume_text, job_description, provider, features)
+    analysis = cache.get(cache_key)
+    cache_status = "hit" if analysis else "miss"
+    if analysis:
+        print(f"♻️ Analysis cache hit for {resume_id}")
+    else:
+        llm_service = LLMService(provider=provider)
+        analysis = run_in_worker_loop(llm_service.analyze_resume_async(resume_text, job_description, features))
+        if partial_text:
+            analysis["partial_text"] = True
+        cache.put(cache_key, analysis)
+
+    # Save analysis
+    get_resume_store().put_analysis(resume_id, analysis)
+
+    if not resume_meta:
+        print(f"❌ Resume metadata not found for resume_id: {resume_id}")
+        return {"error": "Resume metadata not found"}
+
+    _notify_candidate(resume_id, resume_meta, analysis)
+
+    return {"status": "success", "cache": cache_status, "analysis": analysis}
+
+
+@celery_app.task(name="app.services.llm_service.notify_analysis_task")
+def notify_analysis_task(resume_id: str, analysis: Dict[str, Any]):
+    """
+    Notify the candidate of an analysis answered from the cache by the API,
+    exactly as analyze_resume_task does after analyzing.
+    """
+    resume_meta = db.resumes.find_one({"resume_id": resume_id}, {"user_id": 1})
+    if not resume_meta:
+        print(f"❌ Resume metadata not found for resume_id: {resume_id}")
+        return
+    _notify_candidate(resume_id, resume_meta, analysis)
+
+
+async def analyze_concurrently(llm_service: "LLMService", items: List[Tuple[str, str, Optional[Dict[str, Any]]]], job_description: str, concurrency: int, on_result=None) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyze many resumes with at most `concurrency` provider calls in flight.
+
+    Args:
+        llm_service: Service whose async provider client is shared by every call
+        items: (resume_id, text, features) to analyze
+        job_description: Job description every resume is matched against
+        concurrency: Maximum simultaneous provider calls
+        on_result: Optional coroutine function called with (resume_id, analysis) as each finishes
+
+    Returns:
+        Analyses keyed by resume id
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def analyze(resume_id, text, features):
+        async with semaphore:
+            analysis = await llm_service.analyze_resume_async(text, job_description, features)
+        if on_result is not None:
+            await on_result(resume_id, analysis)
+        return resume_id, analysis
+
+    return dict(await asyncio.gather(*(analyze(*item) for item in items)))
+
+
+def _record_batch_results(batch_id: str, analyses: Dict[str, Dict[str, Any]], cached: int = 0, missing: Optional[List[str]] = None):
+    """Bulk-write analyses to the store and add their outcome to the batch counters"""
+    missing = missing or []
+    get_resume_store().put_analyses(analyses)
+    failed = [resume_id for resume_id, analysis in analyses.items() if "error" in analysis] + missing
+    now = datetime.utcnow()
+    update = {
+        "$inc": {"analyzed": len(analyses) + len(missing) - len(failed), "cached": cached, "failed": len(failed)},
+        "$set": {"updated_at": now},
+    }
+    if failed:
+        update["$push"] = {"failed_resume_ids": {"$each": failed}}
+    db.analysis_batches.update_one({"_id": batch_id}, update)
+    db.analysis_batches.update_one(
+        {"_id": batch_id, "status": "processing", "$expr": {"$gte": [{"$add": ["$analyzed", "$failed"]}, "$total"]}},
+        {"$set": {"status": "completed", "completed_at": now}}
+    )
+
+
+@celery_app.task(name="app.services.llm_service.analyze_resume_batch_task")
+def analyze_resume_batch_task(batch_id: str, resume_ids: List[str], job_description: str = "", provider: str = "gemini"):
+    """
+    Analyze a chunk of a batch against one job description.
+
+    Cached analyses come from one MGET; the rest are analyzed concurrently
+    (ANALYSIS_BATCH_CONCURRENCY calls in flight) and written to the store
+    ANALYSIS_BATCH_WRITE_SIZE at a time, so batch progress moves while the
+    chunk runs. No emails are sent for batch screening.
+    """
+    metas = {
+        doc["resume_id"]: doc
+        for doc in db.resumes.find(
+            {"resume_id": {"$in": resume_ids}},
+            {"resume_id": 1, "duplicate_of": 1, "features": 1, "preview_text": 1}
+        )
+    }
+    inputs, missing = {}, []
+    for resume_id in resume_ids:
+        resume_text, features, partial_text = _analysis_input(resume_id, metas.get(resume_id))
+        if resume_text is None:
+            missing.append(resume_id)
+        else:
+            inputs[resume_id] = (resume_text, features, partial_text)
+
+    cache = get_analysis_cache()
+    keys = {
+        resume_id: analysis_cache_key_for(resume_text, job_description, provider, features)
+        for resume_id, (resume_text, features, _) in inputs.items()
+    }
+    hits = {
+        resume_id: analysis
+        for resume_id, analysis in zip(keys, cache.get_many(list(keys.values())))
+        if analysis
+    }
+    _record_batch_results(batch_id, hits, cached=len(hits), missing=missing)
+
+    to_analyze = [(resume_id, text, features) for resume_id, (text, features, _) in inputs.items() if resume_id not in hits]
+    if not to_analyze:
+        return {"status": "success", "cached": len(hits), "analyzed": 0, "missing": len(missing)}
+
+    pending: Dict[str, Dict[str, Any]] = {}
+
+    async def collect(resume_id, analysis):
+        if inputs[resume_id][2]:
+            analysis["partial_text"] = True
+        pending[resume_id] = analysis
+        if len(pending) >= settings.ANALYSIS_BATCH_WRITE_SIZE:
+            await flush()
+
+    async def flush():
+        ready = dict(pending)
+        pending.clear()
+        await asyncio.to_thread(cache.put_many, {keys[resume_id]: analysis for resume_id, analysis in ready.items()})
+        await asyncio.to_thread(_record_batch_results, batch_id, ready)
+
+    async def run():
+        await analyze_concurrently(
+            LLMService(provider=provider), to_analyze, job_description,
+            settings.ANALYSIS_BATCH_CONCURRENCY, on_result=collect
+        )
+        if pending:
+            await flush()
+
+    run_in_worker_loop(run())
+    print(f"✅ Analysis batch {batch_id}: {len(to_analyze)} analyzed, {len(hits)} cached, {len(missing)} missing")
+    return {"status": "success", "cached": len(hits), "analyzed": len(to_analyze), "missing": len(missing)}
+
+
+def dispatch_analysis_batch(batch_id: str, resume_ids: List[str], job_description: str, provider: str, chunk_size: int = None) -> str:
+    """
+    Fan a batch analysis out as a group of chunk tasks.
+
+    Args:
+        batch_id: Batch whose counters the chunks update
+        resume_ids: Resumes to analyze
+        job_description: Job description every resume is matched against
+        provider: LLM provider to use
+        chunk_size: Resumes per task, defaults to ANALYSIS_BATCH_CHUNK_SIZE
+
+    Returns:
+        Id of the group result
+    """
+    chunk_size = chunk_size or settings.ANALYSIS_BATCH_CHUNK_SIZE
+    result = group(
+        analyze_resume_batch_task.s(batch_id, resume_ids[start:start + chunk_size], job_description, provider)
+        for start in range(0, len(resume_ids), chunk_size)
+    ).apply_async()
+    return result.id
 
 
 def trigger_resume_analysis(resume_id: str, job_description: str, provider: str, admin_user_id: str):
@@ -370,10 +671,13 @@ def trigger_resume_analysis(resume_id: str, job_description: str, provider: str,
 
 def get_resume_analysis(resume_id: str) -> Optional[Dict[str, Any]]:
     """
-    Helper function to retrieve the final analysis from the saved file.
+    Helper function to retrieve the final analysis from the resume store.
+    """
+    return get_resume_store().get_analysis(resume_id)
+
+
+async def get_resume_analysis_async(resume_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Non-blocking variant of get_resume_analysis for request handlers.
     """
-    analysis_path = f"app/uploads/json/{resume_id}_analysis.json"
-    if os.path.exists(analysis_path):
-        with open(analysis_path, 'r') as f:
-            return json.load(f)
-    return None
+    return await get_resume_store().get_analysis_async(resume_id)
@@ -0,0 +1,126 @@
+# app/services/near_duplicates.py
+"""
+Near-duplicate resume detection with MinHash and locality-sensitive hashing.
+
+At parse time each resume gets a MinHash signature of its word 3-shingles.
+The signature is cut into bands and each band is hashed into a short key
+stored in the multikey-indexed `lsh_bands` field. Two resumes that share any
+band key are candidates; their signatures then estimate Jaccard similarity
+directly. With 16 bands of 8 rows, pairs above roughly 0.7 similarity
+almost always share a band and pairs below 0.4 almost never do, so a
+lookup touches only a handful of documents. Common boilerplate can still
+put many resumes in one bucket, so a lookup verifies at most
+NEAR_DUPLICATE_CANDIDATES of them: those sharing the most bands first.
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.services.resume_search import tokenize
+
+NUM_PERMUTATIONS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_CANDIDATES = 50
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_random = np.random.RandomState(1)
+# Fixed seed: signatures must stay comparable across processes and restarts
+_A = _random.randint(1, 1 << 32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _random.randint(0, 1 << 32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Distinct word n-grams of the text (the words themselves for very short texts)"""
+    words = tokenize(text)
+    if len(words) < size:
+        return set(words)
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> Optional[List[int]]:
+    """
+    MinHash signature of the text's shingles.
+
+    Returns:
+        NUM_PERMUTATIONS 32-bit integers, or None for text with no words
+    """
+    values = shingles(text)
+    if not values:
+        return None
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest(), "little") for value in values),
+        dtype=np.uint64, count=len(values)
+    )
+    # Operands are below 2**32, so a * x + b cannot overflow 64 bits
+    permuted = (np.outer(hashes, _A) + _B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.int64).tolist()
+
+
+def band_keys(signature: List[int]) -> List[str]:
+    """One short key per band; resumes sharing any key are near-duplicate candidates"""
+    rows = np.asarray(signature, dtype=np.uint32)
+    return [
+        f"{band:02d}:{hashlib.blake2b(rows[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes(), digest_size=8).hexdigest()}"
+        for band in range(BANDS)
+    ]
+
+
+def candidate_pipeline(bands: List[str], resume_id: str, limit: int = NEAR_DUPLICATE_CANDIDATES) -> List[Dict[str, Any]]:
+    """
+    Aggregation returning the resumes most likely to be near-duplicates of one resume.
+
+    Candidates share at least one band key with it. The more bands two
+    signatures share, the more similar they are, so candidates are ordered by
+    shared bands (earliest upload first on ties) and cut at `limit`.
+
+    Args:
+        bands: Band keys of the resume being checked
+        resume_id: The resume itself, excluded from the candidates
+        limit: Most candidates to return
+
+    Returns:
+        Pipeline for resumes.aggregate yielding resume_id, minhash, created_at and shared_bands
+    """
+    return [
+        {"$match": {"lsh_bands": {"$in": bands}, "resume_id": {"$ne": resume_id}, "duplicate_of": {"$exists": False}}},
+        {"$project": {
+            "resume_id": 1,
+            "minhash": 1,
+            "created_at": 1,
+            "shared_bands": {"$size": {"$setIntersection": ["$lsh_bands", bands]}}
+        }},
+        {"$sort": {"shared_bands": -1, "created_at": 1}},
+        {"$limit": limit},
+    ]
+
+
+def estimated_similarity(first: List[int], second: List[int]) -> float:
+    """Estimated Jaccard similarity: the share of positions where two signatures agree"""
+    return float(np.mean(np.asarray(first) == np.asarray(second)))
+
+
+def rank_candidates(signature: List[int], candidates: Iterable[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Keep the LSH candidates whose estimated similarity reaches the threshold.
+
+    Args:
+        signature: MinHash signature of the resume being checked
+        candidates: Documents with resume_id and minhash
+        threshold: Minimum estimated Jaccard similarity
+
+    Returns:
+        [{resume_id, similarity}], most similar first
+    """
+    matches = []
+    for candidate in candidates:
+        if not candidate.get("minhash"):
+            continue
+        similarity = estimated_similarity(signature, candidate["minhash"])
+        if similarity >= threshold:
+            matches.append({"resume_id": candidate["resume_id"], "similarity": round(similarity, 3)})
+    return sorted(matches, key=lambda match: match["similarity"], reverse=True)
@@ -0,0 +1,209 @@
+# app/services/pdf_extraction.py
+"""
+Page-level PDF text extraction engine.
+
+Short documents are read serially in-process. Longer ones are split into
+page ranges that are extracted in parallel by a shared process pool. Page
+texts are collected in a list and joined once, and every page runs under a
+time cap so a single pathological page cannot stall the whole parse.
+"""
+
+import math
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+import PyPDF2
+
+PARALLEL_MIN_PAGES = 8      # below this, pool overhead outweighs the gain
+MIN_PAGES_PER_CHUNK = 2
+PAGE_TIMEOUT_SECONDS = 5.0
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+class PageTimeout(Exception):
+    """Raised when extracting a single page exceeds its time budget"""
+
+
+@contextmanager
+def _page_deadline(seconds: Optional[float]):
+    """
+    Raise PageTimeout if the block runs longer than `seconds`.
+
+    Relies on SIGALRM, so it only arms in the main thread of a POSIX process
+    (pool workers and the solo Celery worker); elsewhere it is a no-op.
+    """
+    if (
+        not seconds
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def _on_alarm(signum, frame):
+        raise PageTimeout()
+
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _extract_pages(reader: PyPDF2.PdfReader, start: int, end: int, page_timeout: Optional[float]) -> Tuple[List[str], int]:
+    """Extract pages [start, end) and return their texts plus the number of timed-out pages"""
+    texts = []
+    timed_out = 0
+    for index in range(start, end):
+        try:
+            with _page_deadline(page_timeout):
+                texts.append(reader.pages[index].extract_text() or "")
+        except PageTimeout:
+            texts.append("")
+            timed_out += 1
+    return texts, timed_out
+
+
+def _extract_range(file_path: str, start: int, end: int, page_timeout: Optional[float]) -> Tuple[List[str], int]:
+    with open(file_path, "rb") as f:
+        return _extract_pages(PyPDF2.PdfReader(f), start, end, page_timeout)
+
+
+def _document_metadata(reader: PyPDF2.PdfReader) -> Dict[str, str]:
+    """Document info dictionary as plain strings (title, author, ...)"""
+    try:
+        info = reader.metadata
+    except Exception:
+        return {}
+    if not info:
+        return {}
+    fields = {
+        "title": "/Title",
+        "author": "/Author",
+        "creator": "/Creator",
+        "producer": "/Producer",
+        "created": "/CreationDate",
+    }
+    return {name: str(info[key]) for name, key in fields.items() if info.get(key)}
+
+
+def _can_use_pool() -> bool:
+    # Daemonic processes (e.g. Celery prefork children) may not spawn children
+    return not multiprocessing.current_process().daemon
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=max_workers)
+            _pool_workers = max_workers
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+
+
+def split_page_ranges(page_count: int, workers: int, pages_per_chunk: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Split [0, page_count) into contiguous ranges, roughly one per worker"""
+    if page_count <= 0:
+        return []
+    if not pages_per_chunk:
+        pages_per_chunk = max(MIN_PAGES_PER_CHUNK, math.ceil(page_count / max(workers, 1)))
+    return [
+        (start, min(start + pages_per_chunk, page_count))
+        for start in range(0, page_count, pages_per_chunk)
+    ]
+
+
+def extract_text(
+    file_path: str,
+    max_workers: Optional[int] = None,
+    pages_per_chunk: Optional[int] = None,
+    parallel_min_pages: int = PARALLEL_MIN_PAGES,
+    page_timeout: Optional[float] = PAGE_TIMEOUT_SECONDS,
+) -> Dict[str, Any]:
+    """
+    Extract the text of a PDF, in parallel by page range when it is long enough.
+
+    Args:
+        file_path: Path to the PDF
+        max_workers: Process pool size, defaults to the CPU count
+        pages_per_chunk: Pages per pool task, defaults to an even split across workers
+        parallel_min_pages: Documents shorter than this are extracted serially
+        page_timeout: Seconds allowed per page; slower pages are skipped
+
+    Returns:
+        Dictionary with the joined text, page count, document metadata,
+        number of timed-out pages and whether the process pool was used
+    """
+    with open(file_path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        page_count = len(reader.pages)
+        metadata = _document_metadata(reader)
+
+    workers = max_workers or os.cpu_count() or 1
+    ranges = split_page_ranges(page_count, workers, pages_per_chunk)
+    parallel = page_count >= parallel_min_pages and len(ranges) > 1 and workers > 1 and _can_use_pool()
+
+    results = None
+    if parallel:
+        try:
+            pool = _get_pool(workers)
+            futures = [pool.submit(_extract_range, file_path, start, end, page_timeout) for start, end in ranges]
+            results = [future.result() for future in futures]
+        except BrokenProcessPool:
+            _reset_pool()
+            parallel = False
+    if results is None:
+        results = [_extract_range(file_path, 0, page_count, page_timeout)]
+
+    return {
+        "text": "".join(text for texts, _ in results for text in texts),
+        "page_count": page_count,
+        "metadata": metadata,
+        "pages_timed_out": sum(timed_out for _, timed_out in results),
+        "parallel": parallel
+    }
+
+
+def extract_preview(file_path: str, max_pages: int = 2, page_timeout: Optional[float] = PAGE_TIMEOUT_SECONDS) -> Dict[str, Any]:
+    """
+    Cheap first pass: text of the first `max_pages` pages plus document metadata.
+
+    Returns:
+        Same shape as extract_text, with `complete` set when the preview
+        already covers every page
+    """
+    with open(file_path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        page_count = len(reader.pages)
+        texts, timed_out = _extract_pages(reader, 0, min(max_pages, page_count), page_timeout)
+        metadata = _document_metadata(reader)
+
+    return {
+        "text": "".join(texts),
+        "page_count": page_count,
+        "metadata": metadata,
+        "pages_timed_out": timed_out,
+        "parallel": False,
+        "complete": page_count <= max_pages and not timed_out
+    }
@@ -0,0 +1,175 @@
+# app/services/ranking_service.py
+"""
+Deterministic job-to-applicant ranking without LLM calls.
+
+Each application stores a compact term vector of its resume when it is
+created. To rank, MongoDB filters every vector down to the job's vocabulary
+server-side (vocabulary_projection), and the engine builds a sparse
+applicant x job-term matrix from what is left and scores every applicant
+with one matrix-vector product. Neither the wire transfer nor the Python
+work grows with resume length.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.services.resume_features import extract_features
+from app.services.skill_taxonomy import normalize_skill
+from app.services.resume_search import tokenize
+
+MAX_APPLICANT_TERMS = 300
+
+# Weight of a job term by where it appears in the posting
+SKILL_WEIGHT = 3.0
+TAG_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Term-frequency saturation, as in BM25: the 5th mention matters far less than the 1st
+TF_SATURATION = 1.2
+
+
+def applicant_vector(resume_text: str, skills: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Compact representation of a resume stored on the application.
+
+    Terms are stored as {"t": term, "n": count} pairs rather than a mapping
+    because tokens such as "node.js" are not valid MongoDB field names.
+
+    Args:
+        resume_text: Full resume text
+        skills: Canonical skills already extracted at parse time, if available
+
+    Returns:
+        Dictionary with canonical skills and the most frequent terms and their counts
+    """
+    if skills is None:
+        skills = extract_features(resume_text or "")["skills"]
+    counts = Counter(tokenize(resume_text or "")).most_common(MAX_APPLICANT_TERMS)
+    return {
+        "skills": list(skills),
+        "terms": [{"t": term, "n": count} for term, count in counts],
+    }
+
+
+def job_vocabulary(job: Dict[str, Any]) -> Tuple[List[str], np.ndarray, List[str]]:
+    """
+    Columns of the ranking matrix for one job.
+
+    Canonical skills become "skill:<name>" columns matched against the
+    applicant's extracted skills; words from skills, tags and description
+    become plain term columns matched against the applicant's term counts.
+
+    Returns:
+        (column names, column weights, canonical job skills)
+    """
+    weights: Dict[str, float] = {}
+
+    def add(column: str, weight: float):
+        weights[column] = max(weights.get(column, 0.0), weight)
+
+    job_skills = list(dict.fromkeys(normalize_skill(skill) for skill in job.get("skills") or [] if skill.strip()))
+    for skill in job_skills:
+        add(f"skill:{skill}", SKILL_WEIGHT)
+        for term in tokenize(skill):
+            add(term, SKILL_WEIGHT)
+    for tag in job.get("tags") or []:
+        for term in tokenize(tag):
+            add(term, TAG_WEIGHT)
+    for term in tokenize(f"{job.get('title', '')} {job.get('description', '')}"):
+        add(term, DESCRIPTION_WEIGHT)
+
+    columns = list(weights)
+    return columns, np.array([weights[column] for column in columns], dtype=np.float64), job_skills
+
+
+def vocabulary_projection(columns: List[str]) -> Dict[str, Any]:
+    """$project stage fields keeping only the skills and terms that are job columns"""
+    skills = [column[len("skill:"):] for column in columns if column.startswith("skill:")]
+    terms = [column for column in columns if not column.startswith("skill:")]
+    return {
+        "skills": {"$setIntersection": [{"$ifNull": ["$skills", []]}, skills]},
+        "terms": {"$filter": {"input": "$terms", "cond": {"$in": ["$$this.t", terms]}}},
+    }
+
+
+def build_matrix(applicants: List[Dict[str, Any]], columns: List[str]) -> sparse.csr_matrix:
+    """Applicant x column CSR matrix of saturated term frequencies (skill columns are 0/1)"""
+    column_index = {column: position for position, column in enumerate(columns)}
+    indptr = [0]
+    indices: List[int] = []
+    data: List[float] = []
+    for applicant in applicants:
+        for skill in applicant.get("skills") or []:
+            position = column_index.get(f"skill:{skill}")
+            if position is not None:
+                indices.append(position)
+                data.append(1.0)
+        for term in applicant.get("terms") or []:
+            position = column_index.get(term["t"])
+            if position is not None:
+                indices.append(position)
+                data.append(term["n"] / (term["n"] + TF_SATURATION))
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(len(applicants), len(columns))
+    )
+
+
+def rank_applicants(job: Dict[str, Any], applicants: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Score every applicant of a job at once.
+
+    The score is the IDF-weighted share of the job's weighted vocabulary the
+    applicant covers (0-100). Terms every applicant has count for less than
+    terms that set candidates apart.
+
+    Args:
+        job: Job document (title, description, skills, tags)
+        applicants: Documents with skills and terms (whole or already restricted to the job's vocabulary)
+        limit: Number of top applicants to return, all by default
+
+    Returns:
+        Applicants best first, each with score, skill_match and matched_skills added
+    """
+    if not applicants:
+        return []
+    columns, weights, job_skills = job_vocabulary(job)
+    if not columns:
+        return [{**applicant, "score": 0.0, "skill_match": 0.0, "matched_skills": []} for applicant in applicants[:limit]]
+
+    matrix = build_matrix(applicants, columns)
+    count = matrix.shape[0]
+    document_frequency = np.bincount(matrix.indices, minlength=len(columns))
+    idf = np.log((count + 1) / (document_frequency + 1)) + 1.0
+    column_weights = weights * idf
+    scores = matrix @ column_weights / column_weights.sum() * 100
+
+    skill_columns = np.array([position for position, column in enumerate(columns) if column.startswith("skill:")], dtype=np.int64)
+    if len(skill_columns):
+        skill_hits = np.asarray(matrix[:, skill_columns].sum(axis=1)).ravel()
+        skill_match = skill_hits / len(skill_columns) * 100
+    else:
+        skill_match = np.zeros(count)
+
+    limit = count if limit is None else min(limit, count)
+    if limit < count:
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        order = top[np.argsort(-scores[top], kind="stable")]
+    else:
+        order = np.argsort(-scores, kind="stable")
+
+    ranked = []
+    for row in order:
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        matched = {columns[position][len("skill:"):] for position in matrix.indices[start:end] if columns[position].startswith("skill:")}
+        ranked.append({
+            **applicants[row],
+            "score": round(float(scores[row]), 2),
+            "skill_match": round(float(skill_match[row]), 1),
+            "matched_skills": [skill for skill in job_skills if skill in matched],
+        })
+    return ranked
@@ -0,0 +1,235 @@
+# app/services/rate_limiter.py
+"""
+Cluster-wide rate limits for LLM providers, shared by every worker through Redis.
+
+Each provider/model pair has one Redis hash holding two token buckets: one
+for requests per minute and one for tokens per minute. Each bucket refills
+continuously at its per-minute limit and holds at most one minute's worth.
+A Lua script refills the buckets and takes a call's cost from both in one
+atomic step, using the Redis server clock so worker clocks never disagree.
+
+Taking from a bucket is a reservation: the cost is deducted even when the
+bucket cannot cover it yet, and the script returns how long the caller must
+wait before sending. Later callers see the debt and queue behind it, so
+waiting workers are served in arrival order with one round trip each, rather
+than polling and retrying in a burst. A caller whose wait would exceed
+LLM_RATE_LIMIT_MAX_WAIT_SECONDS reserves nothing and gets RateLimitTimeout.
+
+Token costs are estimated from the prompt before the call and corrected
+with the usage the provider reports afterwards. A limit of 0 disables that
+bucket. If Redis is unavailable, calls go ahead unthrottled.
+"""
+
+import asyncio
+import random
+import time
+from typing import Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+KEY_PREFIX = "ratelimit:"
+
+# KEYS[1]: bucket hash. ARGV: requests/min, tokens/min, token cost, max wait (ms).
+# Returns {reserved (0/1), wait in ms}.
+ACQUIRE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'ts')
+local elapsed = 0
+if state[3] then
+    elapsed = math.max(0, now - tonumber(state[3]))
+end
+
+local function refill(level, capacity)
+    if not level then
+        return capacity
+    end
+    return math.min(capacity, tonumber(level) + elapsed * capacity / 60000)
+end
+
+local wait = 0
+local requests = 0
+local tokens = 0
+if rpm > 0 then
+    requests = refill(state[1], rpm)
+    if requests < 1 then
+        wait = math.max(wait, (1 - requests) * 60000 / rpm)
+    end
+end
+if tpm > 0 then
+    -- A single call larger than the whole budget waits for a full bucket
+    cost = math.min(cost, tpm)
+    tokens = refill(state[2], tpm)
+    if tokens < cost then
+        wait = math.max(wait, (cost - tokens) * 60000 / tpm)
+    end
+end
+wait = math.ceil(wait)
+if wait > max_wait then
+    return {0, wait}
+end
+
+redis.call('HSET', KEYS[1], 'ts', now)
+if rpm > 0 then
+    redis.call('HSET', KEYS[1], 'requests', requests - 1)
+end
+if tpm > 0 then
+    redis.call('HSET', KEYS[1], 'tokens', tokens - cost)
+end
+-- Idle buckets are full again after a minute; let them expire after that
+redis.call('PEXPIRE', KEYS[1], 60000 + wait)
+return {1, wait}
+"""
+
+# KEYS[1]: bucket hash. ARGV[1]: tokens to give back (negative to charge more).
+SETTLE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], 'tokens') == 1 then
+    return redis.call('HINCRBYFLOAT', KEYS[1], 'tokens', ARGV[1])
+end
+return false
+"""
+
+
+class RateLimitTimeout(Exception):
+    """The provider's queue is longer than the caller is willing to wait"""
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough token cost of a call: about 4 characters per prompt token plus the expected answer"""
+    return len(prompt) // 4 + settings.LLM_EXPECTED_OUTPUT_TOKENS
+
+
+def provider_limits(provider: str) -> Tuple[int, int]:
+    """(requests/min, tokens/min) configured for a provider; 0 means unlimited"""
+    if provider == "gemini":
+        return settings.GEMINI_REQUESTS_PER_MINUTE, settings.GEMINI_TOKENS_PER_MINUTE
+    if provider == "openai":
+        return settings.OPENAI_REQUESTS_PER_MINUTE, settings.OPENAI_TOKENS_PER_MINUTE
+    return 0, 0
+
+
+class ProviderRateLimiter:
+    """Reserve request and token budget from the shared buckets before calling a provider"""
+
+    def __init__(self, client=None, async_client=None, max_wait_seconds: Optional[float] = None):
+        self._client = client
+        self._async_client = async_client
+        self._scripts = {}
+        self.max_wait_seconds = settings.LLM_RATE_LIMIT_MAX_WAIT_SECONDS if max_wait_seconds is None else max_wait_seconds
+
+    @property
+    def client(self):
+        if self._client is None:
+            from app.db.redis_client import redis_sync
+            self._client = redis_sync
+        return self._client
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            from app.db.redis_client import redis_aio
+            self._async_client = redis_aio
+        return self._async_client
+
+    def _script(self, client, source: str):
+        # register_script only hashes the source; EVALSHA falls back to EVAL on a cold server
+        key = (id(client), source)
+        if key not in self._scripts:
+            self._scripts[key] = client.register_script(source)
+        return self._scripts[key]
+
+    def _acquire_args(self, provider: str, model: str, tokens: int):
+        rpm, tpm = provider_limits(provider)
+        if not rpm and not tpm:
+            return None
+        return [f"{KEY_PREFIX}{provider}:{model}"], [rpm, tpm, max(int(tokens), 0), int(self.max_wait_seconds * 1000)]
+
+    def _wait_seconds(self, provider: str, model: str, reply) -> float:
+        reserved, wait_ms = int(reply[0]), int(reply[1])
+        if not reserved:
+            raise RateLimitTimeout(f"{provider}/{model} rate limit queue is {wait_ms / 1000:.0f}s long")
+        # A little jitter so callers released together do not hit the provider in the same millisecond
+        return wait_ms / 1000 + random.uniform(0, 0.05) if wait_ms else 0.0
+
+    def acquire(self, provider: str, model: str, tokens: int) -> float:
+        """
+        Reserve one request and `tokens` tokens, sleeping until they are available.
+
+        Args:
+            provider: Resolved provider name
+            model: Model the call goes to
+            tokens: Estimated token cost of the call
+
+        Returns:
+            Seconds spent waiting
+        """
+        args = self._acquire_args(provider, model, tokens)
+        if args is None:
+            return 0.0
+        try:
+            reply = self._script(self.client, ACQUIRE_SCRIPT)(keys=args[0], args=args[1])
+        except RedisError as e:
+            print(f"⚠️ Rate limiter unavailable, calling {provider} unthrottled: {e}")
+            return 0.0
+        wait = self._wait_seconds(provider, model, reply)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, provider: str, model: str, tokens: int) -> float:
+        """Non-blocking variant of acquire: waiting callers yield the event loop"""
+        args = self._acquire_args(provider, model, tokens)
+        if args is None:
+            return 0.0
+        try:
+            reply = await self._script(self.async_client, ACQUIRE_SCRIPT)(keys=args[0], args=args[1])
+        except RedisError as e:
+            print(f"⚠️ Rate limiter unavailable, calling {provider} unthrottled: {e}")
+            return 0.0
+        wait = self._wait_seconds(provider, model, reply)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _settle_args(self, provider: str, model: str, estimated: int, actual: Optional[int]):
+        tpm = provider_limits(provider)[1]
+        if not tpm or not actual or actual == estimated:
+            return None
+        # The script charged at most a full bucket for the estimate
+        return [f"{KEY_PREFIX}{provider}:{model}"], [min(estimated, tpm) - actual]
+
+    def settle(self, provider: str, model: str, estimated: int, actual: Optional[int]):
+        """Correct the token bucket once the provider reports what a call really used"""
+        args = self._settle_args(provider, model, estimated, actual)
+        if args is None:
+            return
+        try:
+            self._script(self.client, SETTLE_SCRIPT)(keys=args[0], args=args[1])
+        except RedisError as e:
+            print(f"⚠️ Rate limiter unavailable: {e}")
+
+    async def settle_async(self, provider: str, model: str, estimated: int, actual: Optional[int]):
+        args = self._settle_args(provider, model, estimated, actual)
+        if args is None:
+            return
+        try:
+            await self._script(self.async_client, SETTLE_SCRIPT)(keys=args[0], args=args[1])
+        except RedisError as e:
+            print(f"⚠️ Rate limiter unavailable: {e}")
+
+
+_limiter: Optional[ProviderRateLimiter] = None
+
+
+def get_rate_limiter() -> ProviderRateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = ProviderRateLimiter()
+    return _limiter
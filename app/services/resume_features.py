@@ -0,0 +1,161 @@
+# app/services/resume_features.py
+"""
+Structured features pulled out of resume text once, at parse time.
+
+The output is small enough to live on the resume document, so matching,
+filtering and prompt building read precomputed fields instead of scanning
+the raw text again.
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.skill_taxonomy import SOFT_MATCHER, TECHNICAL_MATCHER
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "profile", "objective", "about me", "professional summary"],
+    "experience": ["experience", "work experience", "professional experience", "employment history", "work history", "employment"],
+    "education": ["education", "academic background", "qualifications"],
+    "skills": ["skills", "technical skills", "core competencies", "technologies"],
+    "projects": ["projects", "personal projects"],
+    "certifications": ["certifications", "certificates", "licenses"],
+    "languages": ["languages"],
+    "awards": ["awards", "honors", "achievements"],
+    "publications": ["publications"],
+}
+
+DEGREE_PATTERNS = {
+    "phd": r"ph\.?\s?d\.?|doctorate",
+    "master": r"master'?s?|m\.?\s?sc\.?|m\.?s\.|mba|m\.?\s?tech|m\.?eng",
+    "bachelor": r"bachelor'?s?|b\.?\s?sc\.?|b\.?s\.|b\.?a\.|b\.?\s?tech|b\.?eng|b\.?e\.",
+    "associate": r"associate'?s? degree",
+    "diploma": r"diploma",
+}
+DEGREE_RANK = {"diploma": 1, "associate": 1, "bachelor": 2, "master": 3, "phd": 4}
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s*\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+_OPEN_END = r"present|current|now|today|date"
+DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|{_OPEN_END})",
+    re.IGNORECASE
+)
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?", re.IGNORECASE)
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w-]+/?", re.IGNORECASE)
+
+
+_HEADING_TO_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_DEGREE_RES = {degree: re.compile(rf"(?<!\w)(?:{pattern})(?!\w)", re.IGNORECASE) for degree, pattern in DEGREE_PATTERNS.items()}
+
+
+def find_sections(text: str) -> List[Tuple[str, int]]:
+    """(section, start offset) for every heading line, in document order"""
+    sections = []
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        heading = line.strip().rstrip(":").strip().lower()
+        if heading and len(heading) <= 40 and heading in _HEADING_TO_SECTION:
+            sections.append((_HEADING_TO_SECTION[heading], offset))
+        offset += len(line)
+    return sections
+
+
+def _section_at(sections: List[Tuple[str, int]], position: int) -> Optional[str]:
+    current = None
+    for section, start in sections:
+        if start > position:
+            break
+        current = section
+    return current
+
+
+def _parse_date(value: str, now: datetime) -> Optional[Tuple[int, int]]:
+    value = value.strip().lower()
+    if re.fullmatch(_OPEN_END, value):
+        return now.year, now.month
+    if "/" in value:
+        month, year = value.split("/")
+        return int(year), max(1, min(int(month), 12))
+    year = int(value[-4:])
+    month = MONTHS.get(value[:3], 1) if value[0].isalpha() else 1
+    return year, month
+
+
+def find_date_ranges(text: str, sections: List[Tuple[str, int]] = (), now: Optional[datetime] = None) -> List[Tuple[int, int, int, int]]:
+    """(start_year, start_month, end_year, end_month) outside the education section"""
+    now = now or datetime.utcnow()
+    ranges = []
+    for match in DATE_RANGE_RE.finditer(text):
+        if _section_at(sections, match.start()) == "education":
+            continue
+        start = _parse_date(match.group("start"), now)
+        end = _parse_date(match.group("end"), now)
+        if not start or not end or not (1950 <= start[0] <= now.year) or end < start:
+            continue
+        ranges.append((*start, *end))
+    return ranges
+
+
+def years_of_experience(ranges: List[Tuple[int, int, int, int]]) -> float:
+    """Total span covered by the ranges, with overlaps merged"""
+    intervals = sorted((sy * 12 + sm - 1, ey * 12 + em) for sy, sm, ey, em in ranges)
+    months = 0
+    current_start = current_end = None
+    for start, end in intervals:
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        months += current_end - current_start
+    return round(months / 12, 1)
+
+
+def find_degrees(text: str) -> List[str]:
+    return [degree for degree, regex in _DEGREE_RES.items() if regex.search(text)]
+
+
+def find_contact(text: str) -> Dict[str, str]:
+    contact = {}
+    for field, regex in (("email", EMAIL_RE), ("linkedin", LINKEDIN_RE), ("github", GITHUB_RE)):
+        match = regex.search(text)
+        if match:
+            contact[field] = match.group(0).strip()
+    for match in PHONE_RE.finditer(text):
+        # Date ranges such as "2016 - 2019" look like short phone numbers
+        if sum(char.isdigit() for char in match.group(0)) >= 9:
+            contact["phone"] = match.group(0).strip()
+            break
+    return contact
+
+
+def extract_features(text: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Extract sections, skills, employment ranges, education and contact details.
+
+    Returns:
+        Compact dictionary suitable for storing on the resume document
+    """
+    sections = find_sections(text)
+    ranges = find_date_ranges(text, sections, now)
+    degrees = find_degrees(text)
+    return {
+        "sections": list(dict.fromkeys(section for section, _ in sections)),
+        "skills": TECHNICAL_MATCHER.find(text),
+        "soft_skills": SOFT_MATCHER.find(text),
+        "experience_ranges": [f"{sy:04d}-{sm:02d}/{ey:04d}-{em:02d}" for sy, sm, ey, em in ranges],
+        "years_experience": years_of_experience(ranges),
+        "degrees": degrees,
+        "highest_degree": max(degrees, key=DEGREE_RANK.get) if degrees else None,
+        "contact": find_contact(text),
+    }
@@ -0,0 +1,328 @@
+# app/services/resume_search.py
+"""
+In-process BM25 full-text index over extracted resume text.
+
+The index lives in the API process. It is loaded from disk at startup and
+kept current by polling `resumes` for documents whose `parsed_at` is newer
+than the last one indexed, so resumes become searchable shortly after
+their full parse finishes (or is re-run) without a rebuild.
+"""
+
+import asyncio
+import heapq
+from abc import ABC, abstractmethod
+import math
+import os
+import pickle
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+INDEX_FORMAT_VERSION = 1
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the to was were with "
+    "i my me we our you your he she they their this these those will would can".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased terms; keeps c++, c#, node.js but drops sentence-final dots"""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        token = token.rstrip(".")
+        if token and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of term -> {document number: term frequency}"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_ids: List[Optional[str]] = []       # document number -> resume id (None once removed)
+        self.doc_lengths: List[int] = []
+        self.doc_terms: List[Tuple[str, ...]] = []   # distinct terms, to unlink a document on update
+        self.doc_parsed_at: List[Optional[datetime]] = []
+        self.doc_numbers: Dict[str, int] = {}
+        self.total_length = 0
+        self.watermark: Optional[datetime] = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.doc_numbers)
+
+    def remove_document(self, resume_id: str):
+        with self._lock:
+            number = self.doc_numbers.pop(resume_id, None)
+            if number is None:
+                return
+            for term in self.doc_terms[number]:
+                postings = self.postings.get(term)
+                if postings is not None:
+                    postings.pop(number, None)
+                    if not postings:
+                        del self.postings[term]
+            self.total_length -= self.doc_lengths[number]
+            self.doc_ids[number] = None
+            self.doc_lengths[number] = 0
+            self.doc_terms[number] = ()
+            self.doc_parsed_at[number] = None
+
+    def add_document(self, resume_id: str, text: str, parsed_at: Optional[datetime] = None):
+        """Index a resume, replacing any earlier version of it"""
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self.remove_document(resume_id)
+            number = len(self.doc_ids)
+            self.doc_ids.append(resume_id)
+            self.doc_lengths.append(sum(counts.values()))
+            self.doc_terms.append(tuple(counts))
+            self.doc_parsed_at.append(parsed_at)
+            self.doc_numbers[resume_id] = number
+            self.total_length += self.doc_lengths[number]
+            for term, frequency in counts.items():
+                self.postings.setdefault(term, {})[number] = frequency
+            if parsed_at and (self.watermark is None or parsed_at > self.watermark):
+                self.watermark = parsed_at
+
+    def is_current(self, resume_id: str, parsed_at: Optional[datetime]) -> bool:
+        number = self.doc_numbers.get(resume_id)
+        return number is not None and self.doc_parsed_at[number] == parsed_at
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank documents against a free-text query.
+
+        Returns:
+            Up to k (resume_id, score) pairs, best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self.doc_numbers)
+            if not terms or not doc_count:
+                return []
+            average_length = self.total_length / doc_count or 1.0
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for number, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[number] / average_length)
+                    scores[number] = scores.get(number, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(self.doc_ids[number], round(score, 4)) for number, score in best]
+
+    def compact(self):
+        """Renumber documents to drop the slots left by replaced or removed resumes"""
+        with self._lock:
+            live = [(resume_id, number) for resume_id, number in self.doc_numbers.items()]
+            renumber = {old: new for new, (_, old) in enumerate(live)}
+            self.postings = {
+                term: {renumber[number]: frequency for number, frequency in postings.items()}
+                for term, postings in self.postings.items()
+            }
+            self.doc_ids = [resume_id for resume_id, _ in live]
+            self.doc_lengths = [self.doc_lengths[old] for _, old in live]
+            self.doc_terms = [self.doc_terms[old] for _, old in live]
+            self.doc_parsed_at = [self.doc_parsed_at[old] for _, old in live]
+            self.doc_numbers = {resume_id: new for new, (resume_id, _) in enumerate(live)}
+
+    def save(self, path: str):
+        with self._lock:
+            if len(self.doc_ids) > 2 * len(self.doc_numbers) + 100:
+                self.compact()
+            state = {
+                "version": INDEX_FORMAT_VERSION,
+                "k1": self.k1,
+                "b": self.b,
+                "postings": self.postings,
+                "doc_ids": self.doc_ids,
+                "doc_lengths": self.doc_lengths,
+                "doc_terms": self.doc_terms,
+                "doc_parsed_at": self.doc_parsed_at,
+                "watermark": self.watermark,
+            }
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BM25Index"]:
+        """Load a saved index, or None if there is none or it is from another format version"""
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        if state.get("version") != INDEX_FORMAT_VERSION:
+            return None
+        index = cls(k1=state["k1"], b=state["b"])
+        index.postings = state["postings"]
+        index.doc_ids = state["doc_ids"]
+        index.doc_lengths = state["doc_lengths"]
+        index.doc_terms = state["doc_terms"]
+        index.doc_parsed_at = state["doc_parsed_at"]
+        index.doc_numbers = {resume_id: number for number, resume_id in enumerate(index.doc_ids) if resume_id is not None}
+        index.total_length = sum(index.doc_lengths)
+        index.watermark = state["watermark"]
+        return index
+
+
+async def parsed_resumes_since(watermark, projection: Optional[Dict[str, Any]] = None, extra_filter: Optional[Dict[str, Any]] = None):
+    """
+    Fully parsed, non-duplicate resumes parsed at or after a watermark, oldest first.
+
+    parsed_at is stamped by the worker before its write commits, so a slower
+    worker can commit a resume older than the watermark. The scan therefore
+    starts RESUME_INDEX_LAG_SECONDS before the watermark; callers skip the
+    resumes they already hold (is_current).
+
+    Args:
+        watermark: Newest parsed_at already indexed, or None for all of them
+        projection: Fields wanted besides resume_id and parsed_at
+        extra_filter: Further conditions (e.g. the embedding version an index needs)
+
+    Yields:
+        Resume documents
+    """
+    from app.db.mongo import db
+    query = {"parse_phase": "full", "duplicate_of": {"$exists": False}, **(extra_filter or {})}
+    if watermark is not None:
+        query["parsed_at"] = {"$gte": watermark - timedelta(seconds=settings.RESUME_INDEX_LAG_SECONDS)}
+    else:
+        query["parsed_at"] = {"$exists": True}
+    cursor = db.resumes.find(query, {"resume_id": 1, "parsed_at": 1, **(projection or {})}).sort("parsed_at", 1)
+    async for doc in cursor:
+        yield doc
+
+
+class PolledResumeIndex(ABC):
+    """Throttled, serialized incremental refresh shared by the resume indexes that poll parsed_at"""
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._last_refresh = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+    @abstractmethod
+    async def _index_new(self) -> int:
+        """Index what parsed_resumes_since yields past the watermark; returns how many were (re)indexed"""
+
+    async def refresh(self, force: bool = False) -> int:
+        """
+        Index resumes fully parsed since the watermark, at most once per refresh_seconds unless forced.
+
+        Returns:
+            Number of resumes (re)indexed
+        """
+        if not force and time.monotonic() - self._last_refresh < self.refresh_seconds:
+            return 0
+        async with self._refresh_lock:
+            indexed = await self._index_new()
+            self._last_refresh = time.monotonic()
+            return indexed
+
+
+class ResumeSearchService(PolledResumeIndex):
+    """Owns the process-wide index, its persistence and incremental refresh"""
+
+    def __init__(self, path: str, refresh_seconds: float):
+        super().__init__(refresh_seconds)
+        self.path = path
+        self.index = BM25Index.load(path) or BM25Index()
+
+    async def _index_new(self) -> int:
+        # The watermark is saved with the index, so a restart resumes where it stopped
+        from app.services.resume_store import get_resume_store
+        store = get_resume_store()
+        indexed = 0
+        async for doc in parsed_resumes_since(self.index.watermark):
+            if self.index.is_current(doc["resume_id"], doc["parsed_at"]):
+                continue
+            text = await store.get_text_async(doc["resume_id"])
+            if text is None:
+                continue
+            self.index.add_document(doc["resume_id"], text, doc["parsed_at"])
+            indexed += 1
+
+        if indexed:
+            await run_in_threadpool(self.index.save, self.path)
+            print(f"✅ Search index: {indexed} resume(s) indexed, {len(self.index)} total")
+        return indexed
+
+    async def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        await self.refresh()
+        return self.index.search(query, k)
+
+
+_service: Optional[ResumeSearchService] = None
+_service_lock = threading.Lock()
+
+
+def get_resume_search() -> ResumeSearchService:
+    """Get the process-wide search service, loading the saved index on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ResumeSearchService(
+                    settings.RESUME_SEARCH_INDEX_PATH,
+                    settings.RESUME_SEARCH_REFRESH_SECONDS
+                )
+    return _service
+
+
+HIT_PROJECTION = {
+    "resume_id": 1,
+    "filename": 1,
+    "headline": {"$substrCP": ["$preview_text", 0, 200]},
+    "skills": 1,
+    "years_experience": 1,
+    "created_at": 1
+}
+
+
+async def describe_hits(hits: List[Tuple[str, float]], score_field: str = "score") -> List[Dict[str, Any]]:
+    """
+    Resume summaries for ranked (resume_id, score) hits, in hit order.
+
+    Resumes deleted since they were indexed are dropped.
+    """
+    from app.db.mongo import db
+    if not hits:
+        return []
+    resumes = {}
+    async for r in db.resumes.find({"resume_id": {"$in": [resume_id for resume_id, _ in hits]}}, HIT_PROJECTION):
+        resumes[r["resume_id"]] = r
+
+    results = []
+    for resume_id, score in hits:
+        r = resumes.get(resume_id)
+        if r is None:
+            continue
+        results.append({
+            "resume_id": resume_id,
+            score_field: score,
+            "filename": r.get("filename", ""),
+            "headline": r.get("headline", ""),
+            "skills": r.get("skills", []),
+            "years_experience": r.get("years_experience"),
+            "created_at": r.get("created_at")
+        })
+    return results
@@ -1,51 +1,322 @@
 # app/services/resume_service.py
+from celery import chord, group
+from concurrent.futures.process import BrokenProcessPool
+from pymongo.errors import ConnectionFailure
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from app.core.config import settings
 from app.workers.celery_worker import celery_app
-from app.db.mongo import db  # synchronous pymongo instance
-import PyPDF2
-import json
+from app.db.sync_mongo import db_sync
+from app.services.pdf_extraction import extract_text, extract_preview
+from app.services.resume_features import extract_features
+from app.services.resume_store import get_resume_store
+from app.services.near_duplicates import band_keys, candidate_pipeline, minhash_signature, rank_candidates
+from app.services.embeddings import embedding_fields
 import os
+import random
 from datetime import datetime
 
-JSON_DIR = "app/uploads/json"
+# Failures worth retrying; anything else means the file itself is bad
+TRANSIENT_PARSE_ERRORS = (
+    ConnectionFailure,
+    RedisConnectionError,
+    RedisTimeoutError,
+    BrokenProcessPool,
+    TimeoutError,
+    ConnectionError,
+)
 
-@celery_app.task(name="app.services.resume_service.parse_resume_task")
-def parse_resume_task(file_path: str, user_id: str = None):
+
+def _resume_id_from_path(file_path: str) -> str:
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def _record_parse_phase(resume_id: str, fields: dict, user_id: str = None):
     """
-    Parse PDF, save text to JSON, and store metadata in MongoDB.
+    Write parse progress to the resume and to any uploads deduplicated onto it.
+
+    The resume is upserted by resume_id, so re-running a parse never fails on
+    an existing document and recreates metadata that went missing.
     """
-    extracted_text = ""
-    try:
-        with open(file_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                extracted_text += page.extract_text() or ""
-    except Exception as e:
-        print(f"❌ Error parsing PDF: {e}")
+    now = datetime.utcnow()
+    fields = {**fields, "updated_at": now}
+    if "preview_text" in fields:
+        fields["preview_text"] = fields["preview_text"][:settings.RESUME_PREVIEW_CHARS]
+    db_sync.resumes.update_one(
+        {"resume_id": resume_id},
+        {
+            "$set": fields,
+            "$setOnInsert": {
+                "user_id": user_id,
+                "filename": f"{resume_id}.pdf",
+                "status": "uploaded",
+                "created_at": now
+            }
+        },
+        upsert=True
+    )
+    db_sync.resumes.update_many({"duplicate_of": resume_id}, {"$set": fields})
+
+
+def _full_text_fields(text: str) -> dict:
+    """
+    Structured features stored next to the parse state once the full text is known.
+    Skills, years of experience and highest degree are top-level so they can be indexed;
+    the embedding feeds semantic (similar-candidate) search.
+    """
+    features = extract_features(text)
+    return {
+        "features": features,
+        "skills": features["skills"],
+        "years_experience": features["years_experience"],
+        "highest_degree": features["highest_degree"],
+        **embedding_fields(text),
+    }
+
+
+def _flag_near_duplicates(resume_id: str, text: str):
+    """
+    Store the resume's MinHash signature and LSH band keys, and flag it when
+    an earlier resume is a near-duplicate. Only this resume is updated:
+    exact duplicates linked to it are already marked by duplicate_of.
+    """
+    signature = minhash_signature(text)
+    if signature is None:
         return
+    bands = band_keys(signature)
+    candidates = list(db_sync.resumes.aggregate(candidate_pipeline(bands, resume_id)))
+    matches = rank_candidates(signature, candidates, settings.NEAR_DUPLICATE_THRESHOLD)
+
+    # Flag against the earliest-uploaded match so the original is never marked as the copy
+    own = db_sync.resumes.find_one({"resume_id": resume_id}, {"created_at": 1}) or {}
+    created = {candidate["resume_id"]: candidate.get("created_at") for candidate in candidates}
+    earlier = [
+        match for match in matches
+        if created.get(match["resume_id"]) and own.get("created_at") and created[match["resume_id"]] < own["created_at"]
+    ]
+    db_sync.resumes.update_one(
+        {"resume_id": resume_id},
+        {"$set": {
+            "minhash": signature,
+            "lsh_bands": bands,
+            "near_duplicates": matches,
+            "near_duplicate_of": earlier[0]["resume_id"] if earlier else None
+        }}
+    )
+    if earlier:
+        print(f"⚠️ {resume_id} is a near-duplicate of {earlier[0]['resume_id']} (similarity {earlier[0]['similarity']})")
+
+
+def _store_full_text(file_path: str, user_id: str = None):
+    """
+    Full extraction: store the complete text and mark the resume as fully parsed.
+    Idempotent; raises on failure.
+    """
+    extraction = extract_text(file_path)
+    extracted_text = extraction["text"]
+    if extraction["pages_timed_out"]:
+        print(f"⚠️ Skipped {extraction['pages_timed_out']} slow page(s) in {file_path}")
+
+    resume_id = _resume_id_from_path(file_path)
+
+    # store extracted text
+    get_resume_store().put_text(resume_id, extracted_text)
+
+    _record_parse_phase(resume_id, {
+        "parse_phase": "full",
+        "preview_text": extracted_text,
+        "page_count": extraction["page_count"],
+        "pdf_metadata": extraction["metadata"],
+        "parsed_at": datetime.utcnow(),
+        **_full_text_fields(extracted_text)
+    }, user_id)
+    _flag_near_duplicates(resume_id, extracted_text)
+
+    print(f"✅ Text stored for {resume_id}")
+
+
+def _store_preview(file_path: str, user_id: str = None) -> bool:
+    """
+    Preview extraction: store the first pages and metadata. Idempotent; raises on failure.
 
-    # prepare resume id
-    resume_id = os.path.splitext(os.path.basename(file_path))[0]
-
-    # store JSON backup
-    os.makedirs(JSON_DIR, exist_ok=True)
-    json_data = {"text": extracted_text}
-    with open(os.path.join(JSON_DIR, f"{resume_id}.json"), "w") as out:
-        json.dump(json_data, out)
-
-    # insert into MongoDB (synchronous)
-    resume_doc = {
-        "_id": resume_id,
-        "user_id": user_id,
-        "filename": os.path.basename(file_path),
-        "text": extracted_text,
-        "status": "uploaded",
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
+    Returns:
+        True if the preview already covered the whole document
+    """
+    resume_id = _resume_id_from_path(file_path)
+    preview = extract_preview(file_path, max_pages=settings.RESUME_PREVIEW_PAGES)
+
+    fields = {
+        "preview_text": preview["text"],
+        "page_count": preview["page_count"],
+        "pdf_metadata": preview["metadata"],
     }
+    if preview["complete"]:
+        # Short document: the preview already is the full text
+        get_resume_store().put_text(resume_id, preview["text"])
+        _record_parse_phase(resume_id, {
+            **fields,
+            "parse_phase": "full",
+            "parsed_at": datetime.utcnow(),
+            **_full_text_fields(preview["text"])
+        }, user_id)
+        _flag_near_duplicates(resume_id, preview["text"])
+        print(f"✅ Text stored for {resume_id}")
+        return True
+
+    _record_parse_phase(resume_id, {**fields, "parse_phase": "preview"}, user_id)
+    return False
+
+
+def _retry_countdown(retries: int) -> float:
+    """Exponential backoff with full jitter"""
+    cap = min(settings.RESUME_PARSE_RETRY_BACKOFF * (2 ** retries), settings.RESUME_PARSE_RETRY_BACKOFF_MAX)
+    return random.uniform(0, cap)
+
+
+def _dead_letter(file_path: str, user_id: str, batch_id: str, phase: str, error: Exception, attempts: int):
+    """
+    Park a resume that cannot be parsed, with the error, and mark it failed.
+    """
+    resume_id = _resume_id_from_path(file_path)
+    now = datetime.utcnow()
+    db_sync.resume_dead_letters.update_one(
+        {"_id": resume_id},
+        {
+            "$set": {
+                "file_path": file_path,
+                "user_id": user_id,
+                "batch_id": batch_id,
+                "phase": phase,
+                "error": str(error)[:1000],
+                "error_type": type(error).__name__,
+                "attempts": attempts,
+                "status": "dead",
+                "failed_at": now
+            },
+            "$inc": {"failures": 1}
+        },
+        upsert=True
+    )
+    _record_parse_phase(resume_id, {"parse_phase": "failed", "parse_error": str(error)[:500]}, user_id)
+    print(f"☠️ {resume_id} moved to dead-letter queue after {attempts} attempt(s): {error}")
+
+
+def _run_parse_step(task, phase: str, step, file_path: str, user_id: str = None, batch_id: str = None):
+    """
+    Run a parse step with retries for transient failures.
+
+    Transient errors are retried with backoff until max_retries, then
+    dead-lettered like any other (poison) error.
+
+    Returns:
+        (succeeded, step result)
+    """
     try:
-        db["resumes"].insert_one(resume_doc)
-        print(f"✅ Resume saved in Mongo with id {resume_id}")
+        return True, step(file_path, user_id)
+    except TRANSIENT_PARSE_ERRORS as e:
+        if task.request.retries < task.max_retries:
+            print(f"🔁 Transient error on {file_path} ({e}); retry {task.request.retries + 1}/{task.max_retries}")
+            raise task.retry(exc=e, countdown=_retry_countdown(task.request.retries))
+        _dead_letter(file_path, user_id, batch_id, phase, e, task.request.retries + 1)
     except Exception as e:
-        print(f"⚠️ Could not save resume in Mongo: {e}")
+        _dead_letter(file_path, user_id, batch_id, phase, e, task.request.retries + 1)
+    return False, None
+
+
+def _bump_batch(batch_id: str, parsed: int = 0, failed: int = 0):
+    """
+    Add parse outcomes to a batch and close it once every queued file is accounted for.
+    """
+    now = datetime.utcnow()
+    db_sync.resume_batches.update_one(
+        {"_id": batch_id},
+        {"$inc": {"parsed": parsed, "failed": failed}, "$set": {"updated_at": now}}
+    )
+    db_sync.resume_batches.update_one(
+        {"_id": batch_id, "status": "processing", "$expr": {"$gte": [{"$add": ["$parsed", "$failed"]}, "$queued"]}},
+        {"$set": {"status": "completed", "completed_at": now}}
+    )
+
 
-    print(f"✅ JSON saved for {resume_id}")
+@celery_app.task(bind=True, name="app.services.resume_service.parse_resume_task", max_retries=settings.RESUME_PARSE_MAX_RETRIES)
+def parse_resume_task(self, file_path: str, user_id: str = None):
+    """
+    Phase 1: store a first-pages preview and the document metadata right away,
+    then queue full extraction at low priority.
+    """
+    succeeded, complete = _run_parse_step(self, "preview", _store_preview, file_path, user_id)
+    if not succeeded or complete:
+        return
+
+    complete_resume_parse_task.apply_async(
+        args=[file_path, user_id],
+        priority=settings.RESUME_FULL_PARSE_PRIORITY
+    )
+    print(f"✅ Preview stored for {_resume_id_from_path(file_path)}, full extraction queued")
+
+
+@celery_app.task(bind=True, name="app.services.resume_service.complete_resume_parse_task", max_retries=settings.RESUME_PARSE_MAX_RETRIES)
+def complete_resume_parse_task(self, file_path: str, user_id: str = None, batch_id: str = None):
+    """
+    Phase 2: full extraction of a resume whose preview is already stored.
+    """
+    succeeded, _ = _run_parse_step(self, "full", _store_full_text, file_path, user_id, batch_id)
+    if batch_id:
+        _bump_batch(batch_id, parsed=int(succeeded), failed=int(not succeeded))
+
+
+@celery_app.task(name="app.services.resume_service.parse_resume_chunk_task")
+def parse_resume_chunk_task(file_paths: list, batch_id: str = None):
+    """
+    Parse a chunk of a bulk upload and add the outcome to the batch counters.
+
+    Poison files are dead-lettered without affecting the rest of the chunk;
+    files that hit a transient error are handed to complete_resume_parse_task,
+    which retries them on its own and reports to the batch when done.
+    """
+    parsed = failed = deferred = 0
+    for file_path in file_paths:
+        try:
+            _store_full_text(file_path)
+            parsed += 1
+        except TRANSIENT_PARSE_ERRORS:
+            complete_resume_parse_task.apply_async(
+                args=[file_path, None, batch_id],
+                countdown=_retry_countdown(0)
+            )
+            deferred += 1
+        except Exception as e:
+            _dead_letter(file_path, None, batch_id, "full", e, 1)
+            failed += 1
+
+    if batch_id:
+        _bump_batch(batch_id, parsed=parsed, failed=failed)
+    return {"parsed": parsed, "failed": failed, "deferred": deferred}
+
+
+@celery_app.task(name="app.services.resume_service.finalize_resume_batch_task")
+def finalize_resume_batch_task(chunk_results: list, batch_id: str):
+    """
+    Chord callback: close the batch unless retried files are still outstanding.
+    """
+    _bump_batch(batch_id)
+    print(f"✅ Resume batch {batch_id}: all chunks processed")
+
+
+def dispatch_resume_batch(batch_id: str, file_paths: list, chunk_size: int = None) -> str:
+    """
+    Fan a bulk upload out as a chord of chunked parse tasks.
+
+    Args:
+        batch_id: Batch whose counters the chunks update
+        file_paths: PDFs to parse
+        chunk_size: Files per task, defaults to RESUME_PARSE_CHUNK_SIZE
+
+    Returns:
+        Id of the chord result
+    """
+    chunk_size = chunk_size or settings.RESUME_PARSE_CHUNK_SIZE
+    header = group(
+        parse_resume_chunk_task.s(file_paths[start:start + chunk_size], batch_id)
+        for start in range(0, len(file_paths), chunk_size)
+    )
+    return chord(header)(finalize_resume_batch_task.s(batch_id)).id
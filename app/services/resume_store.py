@@ -0,0 +1,244 @@
+# app/services/resume_store.py
+"""
+Storage for extracted resume text and analysis results.
+
+Two backends share one API:
+
+* FilesystemResumeStore - JSON files sharded into a two-level directory
+  tree, so no single directory grows without bound. Files written before
+  sharding (flat app/uploads/json/{resume_id}.json) are still found.
+* MongoResumeStore - `resume_texts` and `resume_analyses` collections
+  keyed by resume_id.
+
+Every method has a sync form for Celery tasks and an `_async` form for
+request handlers, which never blocks the event loop. Resume text is written
+once per resume, so hot texts are kept in a bounded in-process LRU.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ResumeStore(ABC):
+    """Backend-independent API; subclasses implement the _read/_write primitives"""
+
+    def __init__(self, cache_size: int = 0):
+        self._text_cache = LRUCache(cache_size)
+
+    # Backend primitives (blocking)
+    @abstractmethod
+    def _read_text(self, resume_id: str) -> Optional[str]:
+        """Stored text of a resume, or None"""
+
+    @abstractmethod
+    def _write_text(self, resume_id: str, text: str):
+        """Store (or overwrite) the text of a resume"""
+
+    @abstractmethod
+    def _read_analysis(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        """Stored analysis of a resume, or None"""
+
+    @abstractmethod
+    def _write_analysis(self, resume_id: str, analysis: Dict[str, Any]):
+        """Store (or overwrite) the analysis of a resume"""
+
+    # Async primitives; backends with a native async driver override these
+    async def _read_text_async(self, resume_id: str) -> Optional[str]:
+        return await run_in_threadpool(self._read_text, resume_id)
+
+    async def _read_analysis_async(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        return await run_in_threadpool(self._read_analysis, resume_id)
+
+    # Public API
+    def get_text(self, resume_id: str) -> Optional[str]:
+        text = self._text_cache.get(resume_id)
+        if text is None:
+            text = self._read_text(resume_id)
+            if text is not None:
+                self._text_cache.put(resume_id, text)
+        return text
+
+    async def get_text_async(self, resume_id: str) -> Optional[str]:
+        text = self._text_cache.get(resume_id)
+        if text is None:
+            text = await self._read_text_async(resume_id)
+            if text is not None:
+                self._text_cache.put(resume_id, text)
+        return text
+
+    def put_text(self, resume_id: str, text: str):
+        self._write_text(resume_id, text)
+        self._text_cache.put(resume_id, text)
+
+    def get_analysis(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        return self._read_analysis(resume_id)
+
+    async def get_analysis_async(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        return await self._read_analysis_async(resume_id)
+
+    def put_analysis(self, resume_id: str, analysis: Dict[str, Any]):
+        self._write_analysis(resume_id, analysis)
+
+    def put_analyses(self, analyses: Dict[str, Dict[str, Any]]):
+        """Store many analyses at once; backends with bulk writes override this"""
+        for resume_id, analysis in analyses.items():
+            self._write_analysis(resume_id, analysis)
+
+
+class FilesystemResumeStore(ResumeStore):
+    """JSON files under root/ab/cd/, where abcd... is the sha1 of the resume id"""
+
+    def __init__(self, root: str, cache_size: int = 0):
+        super().__init__(cache_size)
+        self.root = root
+
+    def _shard_dir(self, resume_id: str) -> str:
+        digest = hashlib.sha1(resume_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest[:2], digest[2:4])
+
+    def _load(self, filename: str, resume_id: str) -> Optional[Dict[str, Any]]:
+        # Sharded location first, then the legacy flat directory
+        for directory in (self._shard_dir(resume_id), self.root):
+            try:
+                with open(os.path.join(directory, filename), "r") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                continue
+        return None
+
+    def _dump(self, filename: str, resume_id: str, data: Dict[str, Any], indent: Optional[int] = None):
+        directory = self._shard_dir(resume_id)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, filename)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp_path, path)  # readers never see a half-written file
+
+    def _read_text(self, resume_id: str) -> Optional[str]:
+        data = self._load(f"{resume_id}.json", resume_id)
+        return data.get("text", "") if data is not None else None
+
+    def _write_text(self, resume_id: str, text: str):
+        self._dump(f"{resume_id}.json", resume_id, {"text": text})
+
+    def _read_analysis(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        return self._load(f"{resume_id}_analysis.json", resume_id)
+
+    def _write_analysis(self, resume_id: str, analysis: Dict[str, Any]):
+        self._dump(f"{resume_id}_analysis.json", resume_id, analysis, indent=4)
+
+
+class MongoResumeStore(ResumeStore):
+    """`resume_texts` / `resume_analyses` collections keyed by resume id"""
+
+    def _read_text(self, resume_id: str) -> Optional[str]:
+        from app.db.sync_mongo import db_sync
+        doc = db_sync.resume_texts.find_one({"_id": resume_id}, {"text": 1})
+        return doc.get("text", "") if doc else None
+
+    async def _read_text_async(self, resume_id: str) -> Optional[str]:
+        from app.db.mongo import db
+        doc = await db.resume_texts.find_one({"_id": resume_id}, {"text": 1})
+        return doc.get("text", "") if doc else None
+
+    def _write_text(self, resume_id: str, text: str):
+        from app.db.sync_mongo import db_sync
+        db_sync.resume_texts.update_one(
+            {"_id": resume_id},
+            {"$set": {"text": text, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    def _read_analysis(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        from app.db.sync_mongo import db_sync
+        doc = db_sync.resume_analyses.find_one({"_id": resume_id}, {"analysis": 1})
+        return doc.get("analysis") if doc else None
+
+    async def _read_analysis_async(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        from app.db.mongo import db
+        doc = await db.resume_analyses.find_one({"_id": resume_id}, {"analysis": 1})
+        return doc.get("analysis") if doc else None
+
+    def _write_analysis(self, resume_id: str, analysis: Dict[str, Any]):
+        from app.db.sync_mongo import db_sync
+        db_sync.resume_analyses.update_one(
+            {"_id": resume_id},
+            {"$set": {"analysis": analysis, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    def put_analyses(self, analyses: Dict[str, Dict[str, Any]]):
+        from pymongo import UpdateOne
+        from app.db.sync_mongo import db_sync
+        if not analyses:
+            return
+        now = datetime.utcnow()
+        db_sync.resume_analyses.bulk_write([
+            UpdateOne({"_id": resume_id}, {"$set": {"analysis": analysis, "updated_at": now}}, upsert=True)
+            for resume_id, analysis in analyses.items()
+        ], ordered=False)
+
+
+_store: Optional[ResumeStore] = None
+_store_lock = threading.Lock()
+
+
+def get_resume_store() -> ResumeStore:
+    """Get the process-wide resume store selected by RESUME_STORE_BACKEND"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = settings.RESUME_STORE_BACKEND.lower()
+                if backend == "mongo":
+                    _store = MongoResumeStore(cache_size=settings.RESUME_TEXT_CACHE_SIZE)
+                elif backend == "filesystem":
+                    _store = FilesystemResumeStore(
+                        settings.RESUME_STORE_PATH, cache_size=settings.RESUME_TEXT_CACHE_SIZE
+                    )
+                else:
+                    raise ValueError(f"Unsupported resume store backend: {backend}")
+    return _store
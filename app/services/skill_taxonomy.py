@@ -0,0 +1,298 @@
+# app/services/skill_taxonomy.py
+"""
+Skill taxonomy and a single-pass matcher for it.
+
+Every canonical skill has a category and a list of aliases ("k8s" ->
+kubernetes). All aliases are compiled once into an Aho-Corasick automaton,
+so finding every skill in a resume is one linear pass over the text no
+matter how large the taxonomy grows. Matches must sit on word boundaries
+and, where aliases overlap, the leftmost-longest one wins.
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Category -> canonical skill -> aliases (matched case-insensitively)
+SKILL_TAXONOMY: Dict[str, Dict[str, List[str]]] = {
+    "languages": {
+        "python": ["python", "python3"],
+        "javascript": ["javascript", "js", "ecmascript", "es6"],
+        "typescript": ["typescript"],
+        "java": ["java"],
+        "c++": ["c++", "cpp"],
+        "c#": ["c#", "csharp"],
+        "c": ["ansi c"],
+        "go": ["golang"],
+        "rust": ["rust"],
+        "kotlin": ["kotlin"],
+        "swift": ["swift"],
+        "objective-c": ["objective-c", "objective c"],
+        "scala": ["scala"],
+        "ruby": ["ruby"],
+        "php": ["php"],
+        "perl": ["perl"],
+        "r": ["r programming", "rstudio"],
+        "matlab": ["matlab"],
+        "julia": ["julia lang", "julialang"],
+        "dart": ["dart"],
+        "elixir": ["elixir"],
+        "haskell": ["haskell"],
+        "bash": ["bash", "shell scripting", "shell script"],
+        "powershell": ["powershell"],
+        "sql": ["sql", "t-sql", "pl/sql", "mysql", "postgresql", "postgres", "sqlite"],
+        "html": ["html", "html5"],
+        "css": ["css", "css3"],
+        "sass": ["sass", "scss"],
+        "solidity": ["solidity"],
+    },
+    "frameworks": {
+        "react": ["react", "reactjs", "react.js"],
+        "react native": ["react native"],
+        "angular": ["angular", "angularjs"],
+        "vue": ["vue", "vuejs", "vue.js"],
+        "svelte": ["svelte"],
+        "next.js": ["next.js", "nextjs"],
+        "node.js": ["node.js", "nodejs"],
+        "express": ["express.js", "expressjs"],
+        "nestjs": ["nestjs", "nest.js"],
+        "django": ["django"],
+        "flask": ["flask"],
+        "fastapi": ["fastapi"],
+        "spring": ["spring boot", "springboot", "spring framework", "spring mvc"],
+        "hibernate": ["hibernate"],
+        ".net": [".net", "dotnet", "asp.net", ".net core"],
+        "rails": ["ruby on rails", "rails"],
+        "laravel": ["laravel"],
+        "symfony": ["symfony"],
+        "flutter": ["flutter"],
+        "jquery": ["jquery"],
+        "redux": ["redux"],
+        "tailwind": ["tailwind", "tailwindcss"],
+        "bootstrap": ["bootstrap"],
+        "graphql": ["graphql"],
+        "grpc": ["grpc"],
+        "rest": ["restful", "rest api", "rest apis", "rest services"],
+        "celery": ["celery"],
+        "kafka": ["kafka", "apache kafka"],
+        "rabbitmq": ["rabbitmq"],
+        "spark": ["spark", "apache spark", "pyspark"],
+        "hadoop": ["hadoop"],
+        "airflow": ["airflow", "apache airflow"],
+        "dbt": ["dbt"],
+    },
+    "data": {
+        "oracle": ["oracle db", "oracle database"],
+        "sql server": ["sql server", "mssql"],
+        "mongodb": ["mongodb", "mongo"],
+        "redis": ["redis"],
+        "elasticsearch": ["elasticsearch", "elastic search", "opensearch"],
+        "cassandra": ["cassandra"],
+        "dynamodb": ["dynamodb"],
+        "snowflake": ["snowflake"],
+        "bigquery": ["bigquery"],
+        "redshift": ["redshift"],
+        "pandas": ["pandas"],
+        "numpy": ["numpy"],
+        "scipy": ["scipy"],
+        "tableau": ["tableau"],
+        "power bi": ["power bi", "powerbi"],
+        "excel": ["ms excel", "microsoft excel", "excel vba"],
+        "etl": ["etl"],
+        "data warehousing": ["data warehousing", "data warehouse"],
+    },
+    "ml": {
+        "machine learning": ["machine learning", "ml"],
+        "deep learning": ["deep learning"],
+        "nlp": ["nlp", "natural language processing"],
+        "computer vision": ["computer vision", "opencv"],
+        "llm": ["llm", "llms", "large language models"],
+        "scikit-learn": ["scikit-learn", "sklearn"],
+        "tensorflow": ["tensorflow"],
+        "keras": ["keras"],
+        "pytorch": ["pytorch"],
+        "hugging face": ["hugging face", "huggingface", "transformers library"],
+        "langchain": ["langchain"],
+        "xgboost": ["xgboost"],
+        "statistics": ["statistics", "statistical analysis"],
+        "data science": ["data science"],
+        "mlops": ["mlops", "mlflow", "kubeflow"],
+    },
+    "cloud": {
+        "aws": ["aws", "amazon web services", "ec2", "aws lambda", "amazon s3"],
+        "gcp": ["gcp", "google cloud", "google cloud platform"],
+        "azure": ["azure", "microsoft azure"],
+        "docker": ["docker", "docker compose", "docker-compose"],
+        "kubernetes": ["kubernetes", "k8s", "eks", "gke", "aks"],
+        "helm": ["helm"],
+        "terraform": ["terraform"],
+        "ansible": ["ansible"],
+        "jenkins": ["jenkins"],
+        "github actions": ["github actions"],
+        "gitlab ci": ["gitlab ci", "gitlab-ci"],
+        "ci/cd": ["ci/cd", "cicd", "continuous integration", "continuous delivery"],
+        "linux": ["linux", "ubuntu", "centos", "debian"],
+        "nginx": ["nginx"],
+        "prometheus": ["prometheus"],
+        "grafana": ["grafana"],
+        "serverless": ["serverless"],
+        "microservices": ["microservices", "microservice architecture"],
+    },
+    "tools": {
+        "git": ["git"],
+        "github": ["github"],
+        "gitlab": ["gitlab"],
+        "jira": ["jira"],
+        "figma": ["figma"],
+        "postman": ["postman"],
+        "selenium": ["selenium"],
+        "pytest": ["pytest"],
+        "jest": ["jest"],
+        "cypress": ["cypress"],
+        "webpack": ["webpack"],
+        "agile": ["agile", "scrum", "kanban"],
+        "tdd": ["tdd", "test-driven development", "test driven development"],
+        "oauth": ["oauth", "oauth2", "openid connect"],
+        "security": ["cybersecurity", "penetration testing", "owasp"],
+    },
+}
+
+SOFT_SKILLS: Dict[str, List[str]] = {
+    "leadership": ["leadership", "led a team", "team lead", "mentoring", "mentored"],
+    "communication": ["communication", "presentation skills", "public speaking"],
+    "teamwork": ["teamwork", "collaboration", "collaborative", "cross-functional"],
+    "problem-solving": ["problem-solving", "problem solving", "troubleshooting"],
+    "analytical": ["analytical", "critical thinking"],
+    "time management": ["time management", "prioritization"],
+    "adaptability": ["adaptability", "adaptable", "fast learner", "quick learner"],
+    "ownership": ["ownership", "self-starter", "self-motivated"],
+}
+
+# Canonical technical skill -> aliases, and canonical skill -> category
+TECHNICAL_SKILLS: Dict[str, List[str]] = {
+    skill: aliases for skills in SKILL_TAXONOMY.values() for skill, aliases in skills.items()
+}
+SKILL_CATEGORIES: Dict[str, str] = {
+    skill: category for category, skills in SKILL_TAXONOMY.items() for skill in skills
+}
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char in "_+#"
+
+
+class AhoCorasick:
+    """
+    Multi-pattern automaton with failure links folded into each state's transitions.
+
+    A state's table holds its own edges plus those inherited through its
+    failure chain, except the root's, which are looked up last. Each text
+    character therefore costs one or two dictionary lookups, and the
+    tables stay small because most failure chains reach the root quickly.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for number, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(number)
+
+        root = goto[0]
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [root] + [{} for _ in range(len(goto) - 1)]
+        # Breadth-first: a state's failure target is always finished before the state itself
+        queue = deque(root.values())
+        while queue:
+            state = queue.popleft()
+            if fail[state]:
+                delta[state] = {**delta[fail[state]], **goto[state]}
+            else:
+                delta[state] = goto[state]
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, child in goto[state].items():
+                if state:
+                    target = delta[fail[state]].get(char)
+                    fail[child] = target if target is not None else root.get(char, 0)
+                queue.append(child)
+
+        self._root = root
+        self._delta = delta
+        self._outputs = outputs
+        self._lengths = [len(pattern) for pattern in patterns]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """(start, end, pattern number) of every occurrence, overlapping ones included"""
+        root, delta, outputs, lengths = self._root, self._delta, self._outputs, self._lengths
+        state = 0
+        for position, char in enumerate(text):
+            following = delta[state].get(char)
+            state = following if following is not None else root.get(char, 0)
+            if outputs[state]:
+                end = position + 1
+                for number in outputs[state]:
+                    yield end - lengths[number], end, number
+
+
+class SkillMatcher:
+    """Find canonical skills from an alias vocabulary in one pass over the text"""
+
+    def __init__(self, vocabulary: Dict[str, List[str]]):
+        self.alias_to_skill = {alias.lower(): skill for skill, aliases in vocabulary.items() for alias in aliases}
+        self._aliases = list(self.alias_to_skill)
+        self._automaton = AhoCorasick(self._aliases)
+
+    def find_spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Non-overlapping (start, end, canonical skill) matches in document order.
+
+        An alias only counts when it is not glued to a neighbouring word
+        (so "java" does not match inside "javascript" and "js" not inside
+        "node.js"); overlapping matches resolve to the leftmost-longest.
+        """
+        lowered = text.lower()
+        size = len(lowered)
+        candidates = []
+        for start, end, number in self._automaton.iter_matches(lowered):
+            if start > 0 and (_is_word_char(lowered[start - 1]) or lowered[start - 1] == "."):
+                continue
+            if end < size and _is_word_char(lowered[end]):
+                continue
+            candidates.append((start, end, number))
+
+        spans = []
+        covered_until = 0
+        for start, end, number in sorted(candidates, key=lambda match: (match[0], -match[1])):
+            if start >= covered_until:
+                spans.append((start, end, self.alias_to_skill[self._aliases[number]]))
+                covered_until = end
+        return spans
+
+    def find(self, text: str) -> List[str]:
+        """Distinct canonical skills, in order of first appearance"""
+        return list(dict.fromkeys(skill for _, _, skill in self.find_spans(text)))
+
+    def canonical(self, value: str) -> Optional[str]:
+        return self.alias_to_skill.get(value.strip().lower())
+
+
+TECHNICAL_MATCHER = SkillMatcher(TECHNICAL_SKILLS)
+SOFT_MATCHER = SkillMatcher(SOFT_SKILLS)
+
+
+def normalize_skill(value: str) -> str:
+    """Map a free-form skill name to its canonical form (unknown skills are lower-cased)"""
+    return TECHNICAL_MATCHER.canonical(value) or SOFT_MATCHER.canonical(value) or value.strip().lower()
+
+
+def skill_category(skill: str) -> Optional[str]:
+    """Taxonomy category of a canonical skill ("soft" for soft skills)"""
+    if skill in SOFT_SKILLS:
+        return "soft"
+    return SKILL_CATEGORIES.get(skill)
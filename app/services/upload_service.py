@@ -0,0 +1,209 @@
+# app/services/upload_service.py
+import hashlib
+import os
+import time
+import uuid
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import magic
+from fastapi import HTTPException, UploadFile, status
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.mongo import db
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB per read/write
+
+
+def remove_file_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _write_chunk(out, chunk: bytes, hasher=None):
+    if hasher is not None:
+        hasher.update(chunk)
+    out.write(chunk)
+
+
+async def stream_upload_to_disk(
+    file: UploadFile,
+    dest_path: str,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    hasher=None,
+) -> Dict[str, Any]:
+    """
+    Copy an uploaded file to disk chunk by chunk.
+
+    Only one chunk is held in memory at a time and every disk operation runs
+    in the threadpool, so large uploads neither grow RSS nor block the event
+    loop. The size limit is enforced while streaming; the partial file is
+    removed when the limit is hit or the client disconnects.
+
+    Args:
+        file: Incoming upload
+        dest_path: Where to write the file
+        max_bytes: Size limit, defaults to MAX_RESUME_UPLOAD_MB
+        chunk_size: Bytes read per iteration
+        hasher: Optional hashlib object updated with every chunk
+
+    Returns:
+        Dictionary with bytes written, elapsed seconds and throughput
+    """
+    if max_bytes is None:
+        max_bytes = settings.MAX_RESUME_UPLOAD_MB * 1024 * 1024
+
+    written = 0
+    started = time.perf_counter()
+    out = await run_in_threadpool(open, dest_path, "wb")
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit."
+                )
+            await run_in_threadpool(_write_chunk, out, chunk, hasher)
+    except BaseException:
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(remove_file_quietly, dest_path)
+        raise
+    await run_in_threadpool(out.close)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "bytes": written,
+        "elapsed_seconds": round(elapsed, 4),
+        "bytes_per_sec": int(written / elapsed) if elapsed > 0 else written
+    }
+
+
+async def claim_content_hash(content_hash: str, resume_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Register resume_id as the canonical copy of a file's content.
+
+    The hash is the document _id, so concurrent uploads of the same file race
+    on the unique key and exactly one of them wins.
+
+    Returns:
+        None if resume_id is now canonical, otherwise the existing index entry
+    """
+    try:
+        await db.resume_hashes.insert_one({
+            "_id": content_hash,
+            "resume_id": resume_id,
+            "created_at": datetime.utcnow()
+        })
+        return None
+    except DuplicateKeyError:
+        return await db.resume_hashes.find_one({"_id": content_hash})
+
+
+async def claim_content_hashes(claims: Dict[str, str]) -> Dict[str, str]:
+    """
+    Bulk version of claim_content_hash.
+
+    Args:
+        claims: content hash -> resume_id that wants to own it
+
+    Returns:
+        content hash -> resume_id that owns it (the claimant if it won)
+    """
+    owners = {}
+    async for entry in db.resume_hashes.find({"_id": {"$in": list(claims)}}):
+        owners[entry["_id"]] = entry["resume_id"]
+
+    now = datetime.utcnow()
+    new_entries = [
+        {"_id": content_hash, "resume_id": resume_id, "created_at": now}
+        for content_hash, resume_id in claims.items()
+        if content_hash not in owners
+    ]
+    if new_entries:
+        try:
+            await db.resume_hashes.insert_many(new_entries, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            # Only duplicate keys mean a lost race; anything else left hashes unclaimed
+            if any(error.get("code") != 11000 for error in errors):
+                raise
+            # Lost a race with a concurrent upload of the same file
+            lost = [new_entries[error["index"]]["_id"] for error in errors]
+            async for entry in db.resume_hashes.find({"_id": {"$in": lost}}):
+                owners[entry["_id"]] = entry["resume_id"]
+
+    for content_hash, resume_id in claims.items():
+        owners.setdefault(content_hash, resume_id)
+    return owners
+
+
+def extract_zip_resumes(zip_path: str, dest_dir: str, max_bytes: Optional[int] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Unpack the PDF members of a zip archive, hashing each while it is copied.
+
+    Blocking; call it through run_in_threadpool. Members are streamed, so the
+    archive is never decompressed into memory, and the size limit is checked
+    against the bytes actually written rather than the (forgeable) header.
+
+    Returns:
+        (accepted, rejected) where accepted items carry resume_id, filename,
+        original_filename, content_hash and file_path
+    """
+    if max_bytes is None:
+        max_bytes = settings.MAX_RESUME_UPLOAD_MB * 1024 * 1024
+
+    mime = magic.Magic(mime=True)
+    accepted, rejected = [], []
+    with zipfile.ZipFile(zip_path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            original_filename = os.path.basename(info.filename)
+            if info.file_size > max_bytes:
+                rejected.append({"filename": original_filename, "reason": "File too large."})
+                continue
+
+            with archive.open(info) as member:
+                head = member.read(1024)
+                if mime.from_buffer(head) != "application/pdf":
+                    rejected.append({"filename": original_filename, "reason": "Only PDF files are allowed."})
+                    continue
+
+                resume_id = f"resume_{uuid.uuid4()}"
+                filename = f"{resume_id}.pdf"
+                file_path = os.path.join(dest_dir, filename)
+                hasher = hashlib.sha256(head)
+                written = len(head)
+                with open(file_path, "wb") as out:
+                    out.write(head)
+                    while written <= max_bytes:
+                        chunk = member.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        written += len(chunk)
+                        hasher.update(chunk)
+                        out.write(chunk)
+
+            if written > max_bytes:
+                remove_file_quietly(file_path)
+                rejected.append({"filename": original_filename, "reason": "File too large."})
+                continue
+
+            accepted.append({
+                "resume_id": resume_id,
+                "filename": filename,
+                "original_filename": original_filename,
+                "content_hash": hasher.hexdigest(),
+                "file_path": file_path
+            })
+    return accepted, rejected
@@ -0,0 +1,267 @@
+# app/services/vector_index.py
+"""
+Approximate nearest-neighbour search over resume embeddings.
+
+Vectors live in one contiguous float32 matrix. Next to it, every vector has
+a 128-bit SimHash sketch: the signs of its projections on 128 fixed random
+hyperplanes, so the Hamming distance between two sketches estimates the
+angle between the vectors. A query computes the Hamming distance to every
+sketch (16 bytes per resume instead of 1 KB, with vectorized popcounts),
+keeps the closest RERANK_CANDIDATES and ranks only those by exact cosine
+similarity. Small indexes skip the sketches: scoring every row is already
+sub-millisecond.
+
+The index is rebuilt from the embeddings stored on resume documents and
+kept current by polling parsed_at, like the BM25 index; it is not saved.
+Resumes embedded by an older EMBEDDING_VERSION are re-embedded from their
+stored text once, at startup (backfill_resume_embeddings).
+"""
+
+import asyncio
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from pymongo import UpdateMany, UpdateOne
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.embeddings import EMBEDDING_DIM, EMBEDDING_VERSION, embedding_fields, from_binary
+from app.services.resume_search import PolledResumeIndex, parsed_resumes_since
+
+SKETCH_BITS = 128
+RERANK_CANDIDATES = 1000
+BRUTE_FORCE_LIMIT = 5000
+
+# Fixed seed: sketches must stay comparable for the life of the index
+_planes = np.random.RandomState(7).standard_normal((SKETCH_BITS, EMBEDDING_DIM)).astype(np.float32)
+
+
+def sketch(vectors: np.ndarray) -> np.ndarray:
+    """(SKETCH_BITS // 64, n) uint64 SimHash sketches of n vectors"""
+    bits = np.packbits(vectors @ _planes.T > 0, axis=1)
+    return np.ascontiguousarray(bits.view(np.uint64).T)
+
+
+class VectorIndex:
+    """Cosine-similarity ANN index of unit vectors keyed by id"""
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+        self._matrix = np.zeros((1024, dim), dtype=np.float32)
+        self._sketches = np.zeros((SKETCH_BITS // 64, 1024), dtype=np.uint64)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, item_id: str):
+        return item_id in self._rows
+
+    def add(self, item_id: str, vector: np.ndarray):
+        """Add or replace the vector of an id"""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self.remove(item_id)
+            row = len(self._ids)
+            if row == len(self._matrix):
+                self._matrix = np.concatenate([self._matrix, np.zeros_like(self._matrix)])
+                self._sketches = np.concatenate([self._sketches, np.zeros_like(self._sketches)], axis=1)
+                self._alive = np.concatenate([self._alive, np.zeros_like(self._alive)])
+            self._matrix[row] = vector
+            self._sketches[:, row] = sketch(vector[None, :])[:, 0]
+            self._alive[row] = True
+            self._ids.append(item_id)
+            self._rows[item_id] = row
+
+    def remove(self, item_id: str):
+        # The row keeps its slot until compact(); searches skip dead rows
+        with self._lock:
+            row = self._rows.pop(item_id, None)
+            if row is not None:
+                self._ids[row] = None
+                self._alive[row] = False
+
+    def vector(self, item_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._rows.get(item_id)
+            return None if row is None else self._matrix[row].copy()
+
+    def _candidates(self, vector: np.ndarray, usable: np.ndarray, count: int) -> np.ndarray:
+        """Rows whose sketches are among the `count` closest to the query's, by Hamming distance"""
+        query = sketch(vector[None, :])[:, 0]
+        size = len(usable)
+        distances = np.bitwise_count(self._sketches[0, :size] ^ query[0])
+        for word in range(1, len(query)):
+            distances += np.bitwise_count(self._sketches[word, :size] ^ query[word])
+        distances[~usable] = SKETCH_BITS + 1
+        # Smallest distance cutoff keeping at least `count` rows: a histogram instead of a sort
+        cutoff = int(np.searchsorted(np.cumsum(np.bincount(distances, minlength=SKETCH_BITS + 2)), count))
+        return np.flatnonzero(distances <= min(cutoff, SKETCH_BITS))
+
+    def search(self, vector: np.ndarray, k: int = 10, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """
+        The k stored vectors most similar to a query vector.
+
+        Args:
+            vector: Unit query vector
+            k: Number of results
+            exclude: Ids to leave out (e.g. the query's own)
+
+        Returns:
+            [(id, cosine similarity)], most similar first
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            usable = self._alive[:len(self._ids)].copy()
+            for item_id in exclude:
+                row = self._rows.get(item_id)
+                if row is not None:
+                    usable[row] = False
+            if len(usable) <= BRUTE_FORCE_LIMIT:
+                rows = np.flatnonzero(usable)
+            else:
+                rows = self._candidates(vector, usable, max(RERANK_CANDIDATES, k * 20))
+            if not len(rows):
+                return []
+            scores = self._matrix[rows] @ vector
+            top = min(k, len(rows))
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            return [(self._ids[rows[i]], round(float(scores[i]), 4)) for i in best]
+
+    def garbage(self) -> int:
+        """Rows removed or replaced since the last compact()"""
+        return len(self._ids) - len(self._rows)
+
+    def compact(self):
+        """Rebuild the matrix and sketches without removed rows"""
+        with self._lock:
+            live = [(item_id, self._matrix[row].copy()) for item_id, row in self._rows.items()]
+            self.__init__(self.dim)
+            for item_id, vector in live:
+                self.add(item_id, vector)
+
+
+class ResumeVectorService(PolledResumeIndex):
+    """Owns the process-wide resume vector index and its incremental refresh"""
+
+    def __init__(self, refresh_seconds: float):
+        super().__init__(refresh_seconds)
+        self.index = VectorIndex()
+        self.watermark = None
+        self._parsed_at: Dict[str, object] = {}
+
+    async def _index_new(self) -> int:
+        indexed = 0
+        resumes = parsed_resumes_since(self.watermark, {"embedding": 1}, {"embedding_version": EMBEDDING_VERSION})
+        async for doc in resumes:
+            # The scan re-reads a lag window, so keep the newest parsed_at seen
+            if self.watermark is None or doc["parsed_at"] > self.watermark:
+                self.watermark = doc["parsed_at"]
+            if self._parsed_at.get(doc["resume_id"]) == doc["parsed_at"]:
+                continue
+            vector = from_binary(doc.get("embedding"))
+            if vector is None:
+                continue
+            self.index.add(doc["resume_id"], vector)
+            self._parsed_at[doc["resume_id"]] = doc["parsed_at"]
+            indexed += 1
+
+        if self.index.garbage() > max(len(self.index), 1024):
+            self.index.compact()
+        if indexed:
+            print(f"✅ Vector index: {indexed} resume(s) indexed, {len(self.index)} total")
+        return indexed
+
+    def add(self, resume_id: str, vector: Optional[np.ndarray], parsed_at):
+        """Index a vector computed outside the parsed_at feed (re-embedding leaves parsed_at unchanged)"""
+        if vector is None:
+            return
+        self.index.add(resume_id, vector)
+        self._parsed_at[resume_id] = parsed_at
+
+    async def similar(self, vector: np.ndarray, k: int = 10, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        await self.refresh()
+        return self.index.search(vector, k, exclude)
+
+
+_service: Optional[ResumeVectorService] = None
+_service_lock = threading.Lock()
+
+
+def get_resume_vectors() -> ResumeVectorService:
+    """Get the process-wide resume vector service"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ResumeVectorService(settings.RESUME_SEARCH_REFRESH_SECONDS)
+    return _service
+
+
+async def _reembed_resumes(resumes: list) -> int:
+    """
+    Re-embed resumes from their stored text in one threadpool call and write them with one bulk_write.
+
+    Returns:
+        Number of resumes re-embedded
+    """
+    from app.db.mongo import db
+    from app.services.resume_store import get_resume_store
+    store = get_resume_store()
+    texts = await asyncio.gather(*(store.get_text_async(doc["resume_id"]) for doc in resumes))
+    found = [(doc, text) for doc, text in zip(resumes, texts) if text is not None]
+    if not found:
+        return 0
+    fields = await run_in_threadpool(lambda: [embedding_fields(text) for _, text in found])
+    operations = []
+    for (doc, _), embedding in zip(found, fields):
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": embedding}))
+        # Exact duplicates carry the canonical copy's embedding
+        operations.append(UpdateMany({"duplicate_of": doc["resume_id"]}, {"$set": embedding}))
+    await db.resumes.bulk_write(operations, ordered=False)
+
+    service = get_resume_vectors()
+    for (doc, _), embedding in zip(found, fields):
+        service.add(doc["resume_id"], from_binary(embedding["embedding"]), doc["parsed_at"])
+    return len(found)
+
+
+async def backfill_resume_embeddings(batch_size: int = 500) -> int:
+    """
+    Re-embed fully parsed resumes whose embedding predates EMBEDDING_VERSION.
+
+    Runs once per database and embedding version; completion is recorded in
+    `migrations`. Resumes whose text is missing from the resume store are
+    skipped and stay out of similar-candidate search.
+
+    Returns:
+        Number of resumes re-embedded
+    """
+    from app.db.mongo import db
+    marker = f"resume_embeddings_v{EMBEDDING_VERSION}"
+    if await db.migrations.find_one({"_id": marker}):
+        return 0
+    updated = 0
+    batch = []
+    stale = {"parse_phase": "full", "duplicate_of": {"$exists": False}, "embedding_version": {"$ne": EMBEDDING_VERSION}}
+    async for doc in db.resumes.find(stale, {"resume_id": 1, "parsed_at": 1}):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            updated += await _reembed_resumes(batch)
+            batch = []
+    if batch:
+        updated += await _reembed_resumes(batch)
+    await db.migrations.update_one(
+        {"_id": marker},
+        {"$set": {"completed_at": datetime.utcnow(), "updated": updated}},
+        upsert=True
+    )
+    if updated:
+        print(f"✅ Re-embedded {updated} resume(s) for embedding version {EMBEDDING_VERSION}")
+    return updated
@@ -0,0 +1,67 @@
+# Keyset (cursor) pagination helpers
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+MAX_PAGE_SIZE = 100
+
+
+def _dump_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, datetime):
+        return {"t": "dt", "v": value.isoformat()}
+    if isinstance(value, ObjectId):
+        return {"t": "oid", "v": str(value)}
+    return {"t": "raw", "v": value}
+
+
+def _load_value(item: Dict[str, Any]) -> Any:
+    if item["t"] == "dt":
+        return datetime.fromisoformat(item["v"])
+    if item["t"] == "oid":
+        return ObjectId(item["v"])
+    return item["v"]
+
+
+def encode_cursor(sort_value: Any, doc_id: Any, **extra) -> str:
+    """Opaque cursor pointing just past the document with this sort value and _id"""
+    payload = {"s": _dump_value(sort_value), "id": _dump_value(doc_id), **extra}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any, Dict[str, Any]]:
+    """
+    Returns:
+        (sort_value, _id, extra fields) of the last document on the previous page
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        sort_value = _load_value(payload.pop("s"))
+        doc_id = _load_value(payload.pop("id"))
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return sort_value, doc_id, payload
+
+
+def keyset_filter(sort_field: str, sort_value: Any, doc_id: Any, descending: bool = True) -> Dict[str, Any]:
+    """Filter selecting documents strictly after (sort_value, _id) in (sort_field, _id) order"""
+    op = "$lt" if descending else "$gt"
+    return {"$or": [
+        {sort_field: {op: sort_value}},
+        {sort_field: sort_value, "_id": {op: doc_id}}
+    ]}
+
+
+def with_keyset(query: Dict[str, Any], cursor: Optional[str], sort_field: str, descending: bool = True) -> Dict[str, Any]:
+    """AND the keyset condition for `cursor` onto an existing query"""
+    if not cursor:
+        return query
+    sort_value, doc_id, _ = decode_cursor(cursor)
+    condition = keyset_filter(sort_field, sort_value, doc_id, descending)
+    return {"$and": [query, condition]} if query else condition
@@ -8,6 +8,12 @@ celery_app = Celery(
     backend=settings.REDIS_URL
 )
 
+# Honour per-message priorities on the Redis broker (0 = highest, 9 = lowest)
+celery_app.conf.broker_transport_options = {
+    "priority_steps": list(range(10)),
+    "queue_order_strategy": "priority",
+}
+
 import app.services.resume_service
 import app.services.llm_service
 import app.services.zoom_service
\ No newline at end of file
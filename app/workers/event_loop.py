@@ -0,0 +1,51 @@
+# app/workers/event_loop.py
+"""
+One long-lived asyncio event loop per worker process.
+
+Celery tasks are synchronous. Running their coroutines with asyncio.run()
+would create and close a loop per task, and async provider clients (HTTP
+connection pools, gRPC channels) are bound to the loop they were created
+on, so they could never be reused between tasks. Instead each process runs
+one loop in a daemon thread and tasks submit coroutines to it. After a fork
+the child starts its own loop: threads do not survive fork().
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """The process's background event loop, started on first use"""
+    global _loop, _pid
+    with _lock:
+        if _loop is None or _pid != os.getpid() or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _pid = os.getpid()
+            threading.Thread(target=_loop.run_forever, name="worker-event-loop", daemon=True).start()
+        return _loop
+
+
+def run_in_worker_loop(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the worker loop and wait for its result.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait before cancelling it
+
+    Returns:
+        The coroutine's result
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_worker_loop())
+    try:
+        return future.result(timeout)
+    except BaseException:
+        # Timeout, or a Celery time limit interrupting the wait: stop the coroutine too
+        future.cancel()
+        raise
@@ -0,0 +1,57 @@
+# benchmarks/bench_autocomplete.py
+"""
+Typeahead latency of the autocomplete prefix index on a synthetic job catalog.
+
+Titles are built from a small vocabulary plus a number, so short prefixes
+match thousands of entries, the worst case for top-k selection. The result
+cache is cleared before each query so every lookup is measured cold.
+
+Usage:
+    python -m benchmarks.bench_autocomplete [--titles 20000 100000] [--repeat 20]
+"""
+
+import argparse
+import time
+
+from app.services.autocomplete import PrefixIndex
+
+WORDS = ["senior", "junior", "lead", "backend", "frontend", "data", "platform", "engineer", "developer", "analyst"]
+PREFIXES = ["s", "se", "sen", "d", "da", "eng", "pl", "1", "19", "senior d", "z"]
+
+
+def build_index(titles: int) -> PrefixIndex:
+    index = PrefixIndex()
+    for number in range(titles):
+        index.add("title", f"{WORDS[number % 10]} {WORDS[(number // 10) % 10]} {WORDS[(number // 100) % 10]} {number}", number % 7)
+    index.warm()
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, nargs="+", default=[20000, 100000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'titles':>8}  {'build (s)':>9}  {'p50 (ms)':>8}  {'p99 (ms)':>8}  {'max (ms)':>8}")
+    for titles in args.titles:
+        started = time.perf_counter()
+        index = build_index(titles)
+        build = time.perf_counter() - started
+
+        timings = []
+        for prefix in PREFIXES * args.repeat:
+            index._cache.clear()
+            started = time.perf_counter()
+            index.suggest(prefix)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+
+        print(
+            f"{titles:>8}  {build:>9.2f}  {timings[len(timings) // 2] * 1000:>8.3f}  "
+            f"{timings[int(len(timings) * 0.99)] * 1000:>8.3f}  {timings[-1] * 1000:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_pdf_extraction.py
+"""
+Compare the page-parallel extraction engine with the original serial loop.
+
+Usage:
+    python -m benchmarks.bench_pdf_extraction [--pages 2 10 40 120] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import PyPDF2
+
+from app.services.pdf_extraction import extract_text
+from benchmarks.synthetic_pdfs import write_pdf
+
+
+def serial_extract(file_path: str) -> str:
+    """The loop parse_resume_task used before the extraction engine"""
+    extracted_text = ""
+    with open(file_path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for page in reader.pages:
+            extracted_text += page.extract_text() or ""
+    return extracted_text
+
+
+def _best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 10, 40, 120])
+    parser.add_argument("--lines", type=int, default=60, help="text lines per page")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = [
+            write_pdf(os.path.join(tmp, f"synthetic_{pages}.pdf"), pages, args.lines, seed=pages)
+            for pages in args.pages
+        ]
+
+        # Warm the process pool so its start-up cost is not billed to the first document
+        extract_text(corpus[-1], max_workers=args.workers)
+
+        print(f"{'pages':>6} {'serial (s)':>11} {'engine (s)':>11} {'speedup':>8}  parallel")
+        speedups = []
+        for path, pages in zip(corpus, args.pages):
+            expected = serial_extract(path)
+            result = extract_text(path, max_workers=args.workers)
+            assert result["text"] == expected, f"output mismatch for {pages} pages"
+
+            serial = _best_of(lambda: serial_extract(path), args.repeat)
+            engine = _best_of(lambda: extract_text(path, max_workers=args.workers), args.repeat)
+            speedups.append(serial / engine)
+            print(f"{pages:>6} {serial:>11.4f} {engine:>11.4f} {serial / engine:>7.2f}x  {result['parallel']}")
+
+        print(f"median speedup: {statistics.median(speedups):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_ranking.py
+"""
+Time the vectorized applicant ranking on synthetic applicant pools.
+
+Applicants are first restricted to the job's vocabulary, as the
+$filter projection in JobService.get_ranked_applicants does server-side.
+
+Usage:
+    python -m benchmarks.bench_ranking [--applicants 1000 10000 50000] [--repeat 3]
+"""
+
+import argparse
+import random
+import time
+
+from app.services.ranking_service import MAX_APPLICANT_TERMS, job_vocabulary, rank_applicants
+from app.services.skill_taxonomy import TECHNICAL_SKILLS
+
+JOB = {
+    "title": "Senior Backend Engineer",
+    "description": "Build distributed services with Python, FastAPI and MongoDB. Operate Kubernetes on AWS.",
+    "skills": ["Python", "FastAPI", "MongoDB", "Docker", "k8s", "AWS"],
+    "tags": ["backend", "python", "cloud"],
+}
+
+
+def synthetic_applicants(count: int, seed: int = 0):
+    """Applicants with MAX_APPLICANT_TERMS terms each, restricted to JOB's vocabulary"""
+    rng = random.Random(seed)
+    columns = set(job_vocabulary(JOB)[0])
+    skills = list(TECHNICAL_SKILLS)
+    words = [f"word{i}" for i in range(5000)] + ["python", "backend", "services", "distributed", "cloud", "kubernetes", "aws"]
+    applicants = []
+    for i in range(count):
+        terms = rng.sample(words, MAX_APPLICANT_TERMS)
+        applicants.append({
+            "_id": i,
+            "skills": rng.sample(skills, rng.randint(3, 12)),
+            "terms": [{"t": term, "n": rng.randint(1, 8)} for term in terms if term in columns],
+        })
+    return applicants
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--applicants", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'applicants':>10}  {'rank (ms)':>10}")
+    for count in args.applicants:
+        applicants = synthetic_applicants(count)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            rank_applicants(JOB, applicants, limit=50)
+            timings.append(time.perf_counter() - started)
+        print(f"{count:>10}  {min(timings) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_skill_matching.py
+"""
+Compare skill matching strategies as the taxonomy grows.
+
+* naive: `alias in text` once per alias (the old mock analyzer); no word boundaries
+* regex: one alternation of every alias (the old resume_features matcher)
+* automaton: SkillMatcher, one Aho-Corasick pass
+
+Usage:
+    python -m benchmarks.bench_skill_matching [--aliases 0 1000 5000] [--repeat 5]
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+from typing import Dict, List
+
+from app.services.skill_taxonomy import TECHNICAL_SKILLS, SkillMatcher
+
+
+def naive_scan(text: str, aliases: Dict[str, str]) -> List[str]:
+    text_lower = text.lower()
+    return list(dict.fromkeys(skill for alias, skill in aliases.items() if alias in text_lower))
+
+
+def alternation_regex(aliases: Dict[str, str]) -> re.Pattern:
+    alternation = "|".join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True))
+    return re.compile(rf"(?<![\w+#.])(?:{alternation})(?![\w+#])", re.IGNORECASE)
+
+
+def regex_scan(text: str, regex: re.Pattern, aliases: Dict[str, str]) -> List[str]:
+    return list(dict.fromkeys(aliases[match.group(0).lower()] for match in regex.finditer(text)))
+
+
+def vocabulary_with_extra_aliases(extra: int, seed: int = 0) -> Dict[str, List[str]]:
+    """The real taxonomy plus `extra` synthetic skills, one alias each"""
+    rng = random.Random(seed)
+    vocabulary = dict(TECHNICAL_SKILLS)
+    for i in range(extra):
+        alias = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+        vocabulary[f"skill{i}"] = [alias]
+    return vocabulary
+
+
+def synthetic_resume(vocabulary: Dict[str, List[str]], words: int = 900, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    aliases = [alias for names in vocabulary.values() for alias in names]
+    filler = ["built", "services", "team", "delivered", "scalable", "platform", "with", "using", "and", "the"]
+    tokens = [rng.choice(aliases) if rng.random() < 0.05 else rng.choice(filler) for _ in range(words)]
+    return " ".join(tokens)
+
+
+def _best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--aliases", type=int, nargs="+", default=[0, 1000, 5000], help="synthetic aliases added to the taxonomy")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'aliases':>8}  {'naive (ms)':>10}  {'regex (ms)':>10}  {'automaton (ms)':>14}")
+    for extra in args.aliases:
+        vocabulary = vocabulary_with_extra_aliases(extra)
+        matcher = SkillMatcher(vocabulary)
+        regex = alternation_regex(matcher.alias_to_skill)
+        text = synthetic_resume(vocabulary)
+
+        assert regex_scan(text, regex, matcher.alias_to_skill) == matcher.find(text)
+        naive = _best_of(lambda: naive_scan(text, matcher.alias_to_skill), args.repeat)
+        regex_time = _best_of(lambda: regex_scan(text, regex, matcher.alias_to_skill), args.repeat)
+        automaton = _best_of(lambda: matcher.find(text), args.repeat)
+        print(f"{len(matcher.alias_to_skill):>8}  {naive * 1000:>10.2f}  {regex_time * 1000:>10.2f}  {automaton * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_vector_index.py
+"""
+Query latency and recall of the resume vector index against exact search.
+
+Vectors are synthetic: unit vectors scattered around a few hundred topic
+centres, roughly how embeddings of resumes from the same field cluster.
+
+Usage:
+    python -m benchmarks.bench_vector_index [--sizes 10000 100000] [--queries 200]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.embeddings import EMBEDDING_DIM
+from app.services.vector_index import VectorIndex
+
+
+def topic_centres(clusters: int = 300, seed: int = 0) -> np.ndarray:
+    centres = np.random.default_rng(seed).standard_normal((clusters, EMBEDDING_DIM)).astype(np.float32)
+    return centres / np.linalg.norm(centres, axis=1, keepdims=True)
+
+
+def clustered_vectors(centres: np.ndarray, count: int, noise: float = 0.06, seed: int = 1) -> np.ndarray:
+    """Unit vectors around random centres (cosine to their centre is about 0.7 at the default noise)"""
+    rng = np.random.default_rng(seed)
+    vectors = centres[rng.integers(0, len(centres), count)]
+    vectors = vectors + rng.standard_normal((count, EMBEDDING_DIM)).astype(np.float32) * noise
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'vectors':>8}  {'build (s)':>9}  {'exact (ms)':>10}  {'ann (ms)':>8}  {'recall@' + str(args.k):>9}")
+    centres = topic_centres()
+    queries = clustered_vectors(centres, args.queries, seed=2)
+    for size in args.sizes:
+        vectors = clustered_vectors(centres, size)
+        index = VectorIndex()
+        started = time.perf_counter()
+        for number, vector in enumerate(vectors):
+            index.add(str(number), vector)
+        build = time.perf_counter() - started
+
+        exact_time = ann_time = 0.0
+        hits = 0
+        for query in queries:
+            started = time.perf_counter()
+            scores = vectors @ query
+            exact = set(np.argpartition(-scores, args.k)[:args.k].astype(str))
+            exact_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            found = index.search(query, args.k)
+            ann_time += time.perf_counter() - started
+            hits += len(exact & {item_id for item_id, _ in found})
+
+        print(
+            f"{size:>8}  {build:>9.2f}  {exact_time / args.queries * 1000:>10.2f}  "
+            f"{ann_time / args.queries * 1000:>8.2f}  {hits / (args.queries * args.k):>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
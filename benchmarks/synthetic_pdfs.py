@@ -0,0 +1,82 @@
+# benchmarks/synthetic_pdfs.py
+"""
+Generate text-only PDFs without any extra dependency.
+
+Each page carries a configurable number of lines of pseudo-resume text set
+in Helvetica, which is enough for PyPDF2 to exercise its real text
+extraction path.
+"""
+
+import random
+from typing import List
+
+WORDS = [
+    "python", "fastapi", "mongodb", "docker", "kubernetes", "led", "team",
+    "designed", "built", "pipeline", "services", "senior", "engineer",
+    "analytics", "machine", "learning", "react", "aws", "delivered", "scaled",
+    "project", "customers", "latency", "reduced", "migrated", "platform",
+]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def page_lines(page_number: int, lines_per_page: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed * 100003 + page_number)
+    lines = [f"Page {page_number + 1} - Experience"]
+    for _ in range(lines_per_page - 1):
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(12)))
+    return lines
+
+
+def build_pdf(page_count: int, lines_per_page: int = 50, seed: int = 0) -> bytes:
+    """Return the bytes of a PDF with `page_count` pages of text"""
+    objects = []  # object bodies, object number = index + 1
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # placeholder, filled once the page tree exists
+    pages = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    kids = []
+    for number in range(page_count):
+        ops = ["BT", "/F1 10 Tf", "12 TL", "40 800 Td"]
+        for line in page_lines(number, lines_per_page, seed):
+            ops.append(f"({_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page = add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages, font, content)
+        )
+        kids.append(page)
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages
+    objects[pages - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, xref
+    )
+    return bytes(out)
+
+
+def write_pdf(path: str, page_count: int, lines_per_page: int = 50, seed: int = 0) -> str:
+    with open(path, "wb") as f:
+        f.write(build_pdf(page_count, lines_per_page, seed))
+    return path
@@ -0,0 +1,121 @@
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.analysis_cache import AnalysisCache, analysis_cache_key
+from app.services import llm_service
+
+
+class DictRedis:
+    """Just enough of the redis client for the cache"""
+
+    def __init__(self):
+        self.values, self.ttls = {}, {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key], self.ttls[key] = value.encode(), ex
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        client = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            def set(self, *args, **kwargs):
+                self.calls.append((args, kwargs))
+
+            def execute(self):
+                return [client.set(*args, **kwargs) for args, kwargs in self.calls]
+
+        return Pipeline()
+
+
+class DownRedis:
+    def get(self, key):
+        raise RedisConnectionError("down")
+
+    def set(self, key, value, ex=None):
+        raise RedisConnectionError("down")
+
+
+def test_key_covers_every_input():
+    base = ("resume text", "python job", "openai", "gpt-3.5-turbo", "v1", {"skills": ["python"]})
+    key = analysis_cache_key(*base)
+    assert key == analysis_cache_key(*base)
+    assert key.startswith("analysis:openai:")
+    for position, changed in enumerate(["other text", "go job", "gemini", "gpt-4o", "v2", {"skills": ["go"]}]):
+        variant = list(base)
+        variant[position] = changed
+        assert analysis_cache_key(*variant) != key
+    assert analysis_cache_key("ab", "c", "mock", "mock", "v1") != analysis_cache_key("a", "bc", "mock", "mock", "v1")
+
+
+def test_put_get_with_ttl_and_failed_analyses_skipped():
+    client = DictRedis()
+    cache = AnalysisCache(client=client, ttl_seconds=60)
+    assert cache.get("k") is None
+    assert cache.put("k", {"overall_score": 80, "provider": "mock"})
+    assert cache.get("k") == {"overall_score": 80, "provider": "mock"}
+    assert client.ttls["k"] == 60
+    assert not cache.put("failed", {"overall_score": 0, "error": "429"})
+    assert not cache.put("unparsed", {"overall_score": 70, "note": "JSON parsing failed"})
+    assert cache.get("failed") is None
+
+
+def test_bulk_get_and_put():
+    client = DictRedis()
+    cache = AnalysisCache(client=client, ttl_seconds=60)
+    stored = cache.put_many({"a": {"overall_score": 80}, "b": {"overall_score": 0, "error": "timeout"}, "c": {"overall_score": 65}})
+    assert stored == 2
+    assert cache.get_many(["a", "b", "c"]) == [{"overall_score": 80}, None, {"overall_score": 65}]
+    assert client.ttls["c"] == 60
+    assert cache.get_many([]) == []
+
+
+def test_unavailable_redis_is_a_miss():
+    cache = AnalysisCache(client=DownRedis())
+    assert cache.get("k") is None
+    assert not cache.put("k", {"overall_score": 80})
+
+
+def test_prompt_version_is_part_of_the_key(monkeypatch):
+    monkeypatch.delenv("GENAI_API_KEY", raising=False)
+    version = llm_service.prompt_template_version()
+    assert version == llm_service.prompt_template_version() and len(version) == 16
+    # Gemini without a key runs the mock analyzer, so it shares the mock entries
+    assert llm_service.analysis_cache_key_for("text", "", "gemini") == llm_service.analysis_cache_key_for("text", "", "mock")
+
+    key = llm_service.analysis_cache_key_for("text", "", "openai")
+    monkeypatch.setattr(llm_service, "SYSTEM_PROMPT", "You are a terse recruiter.")
+    llm_service.prompt_template_version.cache_clear()
+    try:
+        assert llm_service.analysis_cache_key_for("text", "", "openai") != key
+    finally:
+        monkeypatch.undo()
+        llm_service.prompt_template_version.cache_clear()
+
+
+def test_cached_analysis_still_notifies_candidate(monkeypatch):
+    from types import SimpleNamespace
+    from bson import ObjectId
+
+    user_id = ObjectId()
+    users = {user_id: {"_id": user_id, "email": "ada@example.com", "name": "Ada"}}
+    resumes = {"r1": {"resume_id": "r1", "user_id": str(user_id)}}
+    fake_db = SimpleNamespace(
+        users=SimpleNamespace(find_one=lambda query: users.get(query["_id"])),
+        resumes=SimpleNamespace(find_one=lambda query, projection=None: resumes.get(query["resume_id"])),
+    )
+    sent = []
+    monkeypatch.setattr(llm_service, "db", fake_db)
+    monkeypatch.setattr(llm_service.celery_app, "send_task", lambda name, args: sent.append(args) or SimpleNamespace(id="t1"))
+
+    llm_service.notify_analysis_task("r1", {"overall_score": 85, "summary": "Strong"})
+    assert len(sent) == 1
+    recipients, subject, template, data = sent[0]
+    assert recipients == ["ada@example.com"] and data["score_class"] == "high"
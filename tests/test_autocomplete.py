@@ -0,0 +1,57 @@
+from bson import ObjectId
+
+from app.services.autocomplete import PrefixIndex
+from app.services.job_catalog import JobCatalog
+
+
+def test_prefix_matches_any_word_heaviest_first():
+    index = PrefixIndex()
+    index.add("title", "Senior Backend Engineer", 1)
+    index.add("title", "Backend Developer", 5)
+    index.add("skill", "Backbone.js", 2)
+
+    assert [s["text"] for s in index.suggest("back")] == ["Backend Developer", "Backbone.js", "Senior Backend Engineer"]
+    assert [s["text"] for s in index.suggest("backend eng")] == ["Senior Backend Engineer"]
+    assert [s["text"] for s in index.suggest("BACK", kind="skill")] == ["Backbone.js"]
+    assert index.suggest("   ") == []
+
+    index.remove("title", "Backend Developer", 5)
+    assert [s["text"] for s in index.suggest("back")] == ["Backbone.js", "Senior Backend Engineer"]
+
+
+def test_catalog_suggestions_follow_jobs_and_popularity():
+    first, second = ObjectId(), ObjectId()
+    catalog = JobCatalog()
+    catalog.replace_all(
+        [
+            {"_id": first, "title": "Python Developer", "company": "TechCorp", "skills": ["Python", "FastAPI"]},
+            {"_id": second, "title": "Data Engineer", "company": "DataWorks", "skills": ["python", "Pandas"]},
+        ],
+        {str(second): 10},
+    )
+    suggestions = catalog.suggest("p")
+    # Same skill from two jobs: one suggestion, weights summed
+    assert suggestions[0] == {"text": "Python", "kind": "skill", "weight": 12}
+    assert suggestions[1] == {"text": "Pandas", "kind": "skill", "weight": 11}
+    assert {"text": "Python Developer", "kind": "title", "weight": 1} in suggestions
+
+    catalog.upsert({"_id": second, "title": "Data Scientist", "company": "DataWorks", "skills": ["Pandas"]})
+    assert [s["text"] for s in catalog.suggest("data")] == ["DataWorks", "Data Scientist"]
+    assert catalog.suggest("data")[0]["weight"] == 11  # popularity kept across updates
+    catalog.remove(str(second))
+    assert catalog.suggest("data") == []
+
+
+def test_suggest_on_large_catalog():
+    index = PrefixIndex()
+    words = ["senior", "junior", "lead", "backend", "frontend", "data", "platform", "engineer", "developer", "analyst"]
+    for number in range(20000):
+        index.add("title", f"{words[number % 10]} {words[(number // 10) % 10]} {words[(number // 100) % 10]} {number}", number % 7)
+    index.warm()
+
+    for prefix in ["s", "se", "sen", "d", "da", "eng", "pl", "1", "19", "senior d"]:
+        suggestions = index.suggest(prefix)
+        assert len(suggestions) == 10
+        weights = [s["weight"] for s in suggestions]
+        assert weights == sorted(weights, reverse=True)
+    assert index.suggest("z") == []
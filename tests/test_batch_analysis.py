@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from app.services import llm_service
+from app.services.llm_service import LLMService, analyze_concurrently
+from app.workers.event_loop import get_worker_loop, run_in_worker_loop
+
+
+class SlowService:
+    """Records how many analyses run at once"""
+
+    def __init__(self):
+        self.running = self.peak = 0
+
+    async def analyze_resume_async(self, text, job_description="", features=None):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.02)
+        self.running -= 1
+        return {"overall_score": len(text), "job": job_description}
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    service = SlowService()
+    items = [(f"r{i}", "x" * i, None) for i in range(20)]
+    seen = []
+
+    async def on_result(resume_id, analysis):
+        seen.append(resume_id)
+
+    results = await analyze_concurrently(service, items, "python", concurrency=5, on_result=on_result)
+
+    assert service.peak == 5  # overlapped, but never more than the limit
+    assert results == {f"r{i}": {"overall_score": i, "job": "python"} for i in range(20)}
+    assert sorted(seen) == sorted(results)
+
+
+@pytest.mark.asyncio
+async def test_mock_provider_batch():
+    items = [("r1", "Python and Docker, teamwork", None), ("r2", "Go", {"skills": ["go"], "soft_skills": []})]
+    results = await analyze_concurrently(LLMService("mock"), items, "", concurrency=4)
+    assert set(results) == {"r1", "r2"}
+    assert "python" in [skill.lower() for skill in results["r1"]["skills"]["technical_skills"]]
+    assert results["r2"]["skills"]["technical_skills"] == ["go"]
+
+
+@pytest.mark.asyncio
+async def test_async_call_times_out_into_error_analysis(monkeypatch):
+    service = LLMService("openai")
+    cancelled = []
+
+    class Completions:
+        async def create(self, **kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+    client = type("Client", (), {"chat": type("Chat", (), {"completions": Completions()})})
+    monkeypatch.setattr(llm_service.get_client_pool(), "get_async", lambda provider: client)
+    analysis = await service.analyze_resume_async("text", timeout=0.05)
+    assert analysis["overall_score"] == 0 and "timed out" in analysis["error"]
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_async_response_parsing(monkeypatch):
+    service = LLMService("openai")
+
+    class Completions:
+        async def create(self, **kwargs):
+            message = type("Message", (), {"content": 'Sure: {"overall_score": 91}'})
+            return type("Response", (), {"choices": [type("Choice", (), {"message": message})]})
+
+    client = type("Client", (), {"chat": type("Chat", (), {"completions": Completions()})})
+    monkeypatch.setattr(llm_service.get_client_pool(), "get_async", lambda provider: client)
+    analysis = await service.analyze_resume_async("text")
+    assert analysis["overall_score"] == 91 and analysis["provider"] == "openai"
+
+
+def test_worker_loop_persists_and_cancels():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    assert run_in_worker_loop(current_loop()) is run_in_worker_loop(current_loop()) is get_worker_loop()
+
+    cancelled = asyncio.Event()
+
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def was_cancelled():
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return True
+
+    with pytest.raises(TimeoutError):
+        run_in_worker_loop(hang(), timeout=0.05)
+    assert run_in_worker_loop(was_cancelled())
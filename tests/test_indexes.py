@@ -0,0 +1,34 @@
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.db.indexes import INDEXES, QUERY_SHAPES, ensure_indexes_sync, find_collscans
+
+
+@pytest.fixture(scope="module")
+def sync_db():
+    client = MongoClient(settings.MONGO_URI, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip("MongoDB is not reachable")
+    yield client[settings.MONGO_DB]
+    client.close()
+
+
+def test_every_query_shape_targets_a_registered_collection():
+    for shape in QUERY_SHAPES:
+        assert shape["collection"] in INDEXES or shape["filter"].keys() <= {"_id"}, shape
+
+
+def test_ensure_indexes_is_idempotent(sync_db):
+    first = ensure_indexes_sync(sync_db)
+    second = ensure_indexes_sync(sync_db)
+    assert first == second
+
+
+def test_no_query_shape_does_a_collscan(sync_db):
+    ensure_indexes_sync(sync_db)
+    offenders = find_collscans(sync_db)
+    assert not offenders, "\n".join(f"{s['collection']} {s['filter']} ({s['source']})" for s in offenders)
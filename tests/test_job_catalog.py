@@ -0,0 +1,63 @@
+from bson import ObjectId
+
+from app.services.job_catalog import JobCatalog, facet_values
+
+JOBS = [
+    {"_id": ObjectId(), "location": "Remote", "company": "TechCorp", "tags": ["Backend", "python"], "skills": ["Python", "FastAPI"]},
+    {"_id": ObjectId(), "location": "remote ", "company": "DataWorks", "tags": ["data", "Python"], "skills": ["python", "Pandas"]},
+    {"_id": ObjectId(), "location": "New York", "company": "DataWorks", "tags": ["data"], "skills": ["sklearn"]},
+]
+
+
+def _counts(facets, facet):
+    return {entry["value"]: entry["count"] for entry in facets[facet]}
+
+
+def test_facet_counts_use_normalized_values():
+    catalog = JobCatalog()
+    catalog.replace_all(JOBS)
+    facets = catalog.facet_counts()
+    assert _counts(facets, "location") == {"remote": 2, "new york": 1}
+    assert facets["location"][0]["label"] in ("Remote", "remote")
+    assert _counts(facets, "tags") == {"python": 2, "data": 2, "backend": 1}
+    assert _counts(facets, "skills") == {"python": 2, "fastapi": 1, "pandas": 1, "scikit-learn": 1}
+
+
+def test_blank_tags_do_not_shift_labels():
+    values = facet_values({"tags": ["", "Backend", "  ", " Python "]})
+    assert values["tags"] == {"backend": "Backend", "python": "Python"}
+
+
+def test_facets_follow_filters_and_updates():
+    catalog = JobCatalog()
+    catalog.replace_all(JOBS)
+    matching = catalog.matching({"location": None, "company": "DataWorks", "tags": "data", "skills": None})
+    assert _counts(catalog.facet_counts(matching), "location") == {"remote": 1, "new york": 1}
+
+    catalog.upsert({**JOBS[2], "company": "TechCorp"})
+    assert _counts(catalog.facet_counts(), "company") == {"TechCorp": 2, "DataWorks": 1}
+    catalog.remove(str(JOBS[0]["_id"]))
+    assert _counts(catalog.facet_counts(), "company") == {"TechCorp": 1, "DataWorks": 1}
+    assert len(catalog) == 2
+
+
+def test_recommend_scores_skill_coverage_from_postings():
+    catalog = JobCatalog()
+    catalog.replace_all(JOBS)
+    first, second, third = (str(job["_id"]) for job in JOBS)
+
+    recommended = catalog.recommend(["python", "fastapi"])
+    assert [job["job_id"] for job in recommended] == [first, second]
+    assert recommended[0]["score"] == 100.0
+    assert recommended[0]["matched_skills"] == ["python", "fastapi"]
+    assert 0 < recommended[1]["score"] < 100
+
+    assert [job["job_id"] for job in catalog.recommend(["scikit-learn"])] == [third]
+    # Tags naming a known skill count at half weight; other tags ("data") are ignored
+    catalog.upsert({**JOBS[2], "tags": ["data", "Docker"]})
+    assert catalog.recommend(["docker"])[0]["score"] == round(0.5 / 1.5 * 100, 2)
+    assert [job["job_id"] for job in catalog.recommend(["python"], exclude=[first])] == [second]
+    assert catalog.recommend(["cobol"]) == []
+
+    catalog.remove(first)
+    assert [job["job_id"] for job in catalog.recommend(["fastapi"])] == []
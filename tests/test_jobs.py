@@ -31,3 +31,28 @@ async def test_create_job_as_admin(async_client):
     assert res.status_code == 200 or res.status_code == 201
     job = res.json()
     assert job["title"] == "AI Engineer"
+
+def test_normalize_location():
+    from app.services.job_service import normalize_location
+    assert normalize_location("  New York, NY ") == "new york ny"
+    assert normalize_location("REMOTE") == normalize_location("remote")
+    assert normalize_location("") is None
+
+@pytest.mark.asyncio
+async def test_list_jobs_rejects_unknown_sort(async_client):
+    res = await async_client.get("/api/v1/jobs/", params={"sort": "salary"})
+    assert res.status_code == 400
+    res = await async_client.get("/api/v1/jobs/", params={"sort": "relevance"})
+    assert res.status_code == 400
+
+@pytest.mark.asyncio
+async def test_list_jobs_rejects_cursor_from_another_sort(async_client):
+    from datetime import datetime
+    from bson import ObjectId
+    from app.utils.pagination import encode_cursor
+
+    cursor = encode_cursor(datetime(2024, 1, 1), ObjectId(), o="oldest")
+    res = await async_client.get("/api/v1/jobs/", params={"cursor": cursor, "sort": "newest"})
+    assert res.status_code == 400
+    res = await async_client.get("/api/v1/jobs/", params={"limit": 1000})
+    assert res.status_code == 422
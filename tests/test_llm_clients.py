@@ -0,0 +1,78 @@
+import asyncio
+
+import openai
+import pytest
+
+from app.services import llm_clients
+from app.services.llm_clients import ProviderClientPool
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = ProviderClientPool()
+    built = []
+
+    def build(provider):
+        client = object()
+        built.append((provider, client))
+        return client
+
+    monkeypatch.setattr(pool, "_build", build)
+    pool.built = built
+    return pool
+
+
+def test_client_is_reused(pool):
+    first = pool.get("openai")
+    assert pool.get("openai") is first
+    assert pool.get("gemini") is not first
+    assert [provider for provider, _ in pool.built] == ["openai", "gemini"]
+
+
+def test_client_rebuilt_after_fork(pool, monkeypatch):
+    first = pool.get("openai")
+    monkeypatch.setattr(llm_clients.os, "getpid", lambda: -1)
+    assert pool.get("openai") is not first
+
+
+def test_connection_error_discards_client(pool):
+    first = pool.get("openai")
+    pool.report_failure("openai", ValueError("bad json"))
+    assert pool.get("openai") is first
+
+    pool.report_failure("openai", openai.APIConnectionError(request=None))
+    assert pool.get("openai") is not first
+
+
+def test_mock_provider_needs_no_client(monkeypatch):
+    from app.services.llm_service import LLMService
+
+    def fail(provider):
+        raise AssertionError("mock provider built a client")
+
+    monkeypatch.setattr(llm_clients.get_client_pool(), "_build", fail)
+    assert LLMService("mock").provider == "mock"
+
+
+def test_async_clients_are_per_event_loop(pool, monkeypatch):
+    monkeypatch.setattr(pool, "_build_async", lambda provider: object())
+
+    async def get():
+        first = pool.get_async("openai")
+        again = pool.get_async("openai")
+        pool.discard("openai")
+        return first, again, pool.get_async("openai")
+
+    first, again, rebuilt = asyncio.run(get())
+    assert first is again and rebuilt is not first
+    other, _, _ = asyncio.run(get())
+    assert other is not first
+
+
+def test_openai_clients_keep_sdk_retries(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(llm_clients.settings, "LLM_MAX_RETRIES", 3)
+    pool = ProviderClientPool()
+
+    assert pool._build("openai").max_retries == 3
+    assert pool._build_async("openai").max_retries == 3
@@ -0,0 +1,59 @@
+from app.services.near_duplicates import (
+    BANDS,
+    NEAR_DUPLICATE_CANDIDATES,
+    band_keys,
+    candidate_pipeline,
+    estimated_similarity,
+    minhash_signature,
+    rank_candidates,
+)
+
+BASE = (
+    "Senior backend engineer with eight years building payment platforms in Python and Go. "
+    "Led migration of monolith to microservices on Kubernetes, cut p99 latency by forty percent. "
+    "Designed event sourcing with Kafka, owned on-call rotation, mentored four engineers. "
+    "Built a ledger reconciliation service processing twelve million transactions per day with exactly-once delivery. "
+    "Introduced contract testing between teams, reduced integration incidents and shortened release cycles to daily deploys. "
+    "Partnered with product and compliance on PCI scope reduction, tokenisation of card data and audit readiness. "
+    "Previously full stack developer at a logistics startup shipping route optimisation features in React and Django. "
+    "Education: BSc Computer Science, University of Somewhere. Skills: Python, Go, PostgreSQL, Redis, AWS, Terraform."
+)
+
+
+def test_signature_is_deterministic_and_banded():
+    signature = minhash_signature(BASE)
+    assert signature == minhash_signature(BASE)
+    assert len(band_keys(signature)) == BANDS
+    assert minhash_signature("   ") is None
+
+
+def test_small_edits_share_bands_and_unrelated_text_does_not():
+    original = minhash_signature(BASE)
+    edited = minhash_signature(BASE.replace("forty percent", "forty-five percent").replace("four engineers", "five engineers"))
+    unrelated = minhash_signature(
+        "Registered nurse with ten years in intensive care units, ventilator management, "
+        "patient triage, medication administration and family communication across night shifts."
+    )
+
+    assert estimated_similarity(original, edited) > 0.7
+    assert estimated_similarity(original, unrelated) < 0.2
+    assert set(band_keys(original)) & set(band_keys(edited))
+    assert not set(band_keys(original)) & set(band_keys(unrelated))
+
+    matches = rank_candidates(original, [
+        {"resume_id": "edited", "minhash": edited},
+        {"resume_id": "unrelated", "minhash": unrelated},
+        {"resume_id": "unparsed"},
+    ], threshold=0.7)
+    assert [match["resume_id"] for match in matches] == ["edited"]
+
+
+def test_candidate_pipeline_is_bounded_and_prefers_shared_bands():
+    bands = band_keys(minhash_signature(BASE))
+    pipeline = candidate_pipeline(bands, "resume_a")
+
+    assert pipeline[0]["$match"] == {"lsh_bands": {"$in": bands}, "resume_id": {"$ne": "resume_a"}, "duplicate_of": {"$exists": False}}
+    assert pipeline[1]["$project"]["shared_bands"] == {"$size": {"$setIntersection": ["$lsh_bands", bands]}}
+    # Most shared bands first, earliest upload on ties, then cut
+    assert list(pipeline[2]["$sort"].items()) == [("shared_bands", -1), ("created_at", 1)]
+    assert pipeline[3] == {"$limit": NEAR_DUPLICATE_CANDIDATES}
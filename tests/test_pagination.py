@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.utils.pagination import decode_cursor, encode_cursor, with_keyset
+
+
+def test_cursor_round_trip_preserves_types():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123000)
+    doc_id = ObjectId()
+    cursor = encode_cursor(created_at, doc_id, page=3)
+    assert decode_cursor(cursor) == (created_at, doc_id, {"page": 3})
+
+
+def test_with_keyset_combines_with_existing_filters():
+    created_at = datetime(2024, 5, 1)
+    doc_id = ObjectId()
+    query = with_keyset({"user_id": "u1"}, encode_cursor(created_at, doc_id), "created_at")
+    assert query == {"$and": [
+        {"user_id": "u1"},
+        {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": doc_id}}
+        ]}
+    ]}
+    assert with_keyset({"user_id": "u1"}, None, "created_at") == {"user_id": "u1"}
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
@@ -0,0 +1,37 @@
+from app.services.pdf_extraction import extract_text, split_page_ranges
+from benchmarks.synthetic_pdfs import write_pdf
+from benchmarks.bench_pdf_extraction import serial_extract
+
+
+def test_split_page_ranges_covers_every_page():
+    ranges = split_page_ranges(11, workers=4)
+    assert ranges[0][0] == 0 and ranges[-1][1] == 11
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert split_page_ranges(0, workers=4) == []
+
+
+def test_extract_text_matches_serial_loop(tmp_path):
+    path = write_pdf(str(tmp_path / "cv.pdf"), page_count=6, lines_per_page=10)
+    expected = serial_extract(path)
+
+    serial = extract_text(path, max_workers=1)
+    assert serial["text"] == expected
+    assert serial["page_count"] == 6
+    assert serial["parallel"] is False
+
+    parallel = extract_text(path, max_workers=2, parallel_min_pages=2)
+    assert parallel["text"] == expected
+    assert parallel["parallel"] is True
+
+
+def test_extract_preview_reads_only_first_pages(tmp_path):
+    from app.services.pdf_extraction import extract_preview
+
+    path = write_pdf(str(tmp_path / "cv.pdf"), page_count=5, lines_per_page=10)
+    preview = extract_preview(path, max_pages=2)
+    assert preview["page_count"] == 5
+    assert preview["complete"] is False
+    assert "Page 1 - Experience" in preview["text"]
+    assert "Page 3 - Experience" not in preview["text"]
+
+    assert extract_preview(path, max_pages=5)["complete"] is True
@@ -0,0 +1,60 @@
+import pytest
+
+from app.services.ranking_service import applicant_vector, job_vocabulary, rank_applicants
+
+JOB = {
+    "title": "Backend Developer",
+    "description": "Work with FastAPI and MongoDB.",
+    "skills": ["FastAPI", "MongoDB", "Python"],
+    "tags": ["backend", "python"],
+}
+
+
+def test_applicant_vector_stores_skills_and_term_counts():
+    vector = applicant_vector("Python developer. Python, FastAPI and Node.js.")
+    assert vector["skills"] == ["python", "fastapi", "node.js"]
+    assert {"t": "python", "n": 2} in vector["terms"]
+    assert {"t": "node.js", "n": 1} in vector["terms"]
+
+
+def test_job_vocabulary_weights_skills_over_description():
+    columns, weights, job_skills = job_vocabulary(JOB)
+    assert job_skills == ["fastapi", "mongodb", "python"]
+    weight = dict(zip(columns, weights))
+    assert weight["skill:python"] == weight["python"] == 3.0
+    assert weight["backend"] == 2.0
+    assert weight["work"] == 1.0
+
+
+def test_rank_applicants_orders_by_fit():
+    applicants = [
+        {"_id": "weak", **applicant_vector("Java developer with Spring experience")},
+        {"_id": "strong", **applicant_vector("Backend Python engineer: FastAPI services on MongoDB")},
+        {"_id": "partial", **applicant_vector("Python data analyst")},
+    ]
+    ranked = rank_applicants(JOB, applicants)
+    assert [app["_id"] for app in ranked] == ["strong", "partial", "weak"]
+    assert ranked[0]["matched_skills"] == ["fastapi", "mongodb", "python"]
+    assert ranked[0]["skill_match"] == 100.0
+    assert ranked[-1]["matched_skills"] == []
+    assert ranked[-1]["score"] < ranked[1]["score"] < ranked[0]["score"]
+
+    top = rank_applicants(JOB, applicants, limit=1)
+    assert [app["_id"] for app in top] == ["strong"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_vectors_are_written_in_one_bulk_write(monkeypatch):
+    from types import SimpleNamespace
+    from app.services import job_service
+
+    writes = []
+
+    async def bulk_write(requests, ordered=True):
+        writes.append(requests)
+
+    monkeypatch.setattr(job_service, "db", SimpleNamespace(applications=SimpleNamespace(bulk_write=bulk_write)))
+    legacy = [{"_id": i, "resume_text": f"Python developer {i}"} for i in range(3)]
+    vectors = await job_service._store_applicant_vectors(legacy)
+    assert set(vectors) == {0, 1, 2} and "python" in vectors[0]["skills"]
+    assert len(writes) == 1 and len(writes[0]) == 3
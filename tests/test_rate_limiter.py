@@ -0,0 +1,100 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.config import settings
+from app.services import rate_limiter
+from app.services.rate_limiter import ProviderRateLimiter, RateLimitTimeout, estimate_tokens
+
+
+class ScriptRedis:
+    """Stands in for Redis: every script call returns the next canned reply"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def register_script(self, source):
+        def run(keys, args):
+            self.calls.append((keys, args))
+            reply = self.replies.pop(0)
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+        return run
+
+
+class AsyncScriptRedis(ScriptRedis):
+    def register_script(self, source):
+        run = super().register_script(source)
+
+        async def run_async(keys, args):
+            return run(keys, args)
+        return run_async
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_REQUESTS_PER_MINUTE", 60)
+    monkeypatch.setattr(settings, "OPENAI_TOKENS_PER_MINUTE", 10000)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", slept.append)
+    return slept
+
+
+def test_unlimited_provider_never_touches_redis(monkeypatch):
+    monkeypatch.setattr(settings, "GEMINI_REQUESTS_PER_MINUTE", 0)
+    monkeypatch.setattr(settings, "GEMINI_TOKENS_PER_MINUTE", 0)
+    limiter = ProviderRateLimiter(client=ScriptRedis())
+    assert limiter.acquire("gemini", "gemini-1.5-flash-latest", 2000) == 0.0
+    assert limiter.acquire("mock", "mock", 2000) == 0.0
+    assert limiter.client.calls == []
+
+
+def test_reservation_waits_its_turn(limits, sleeps):
+    client = ScriptRedis([1, 0], [1, 1500])
+    limiter = ProviderRateLimiter(client=client, max_wait_seconds=30)
+    assert limiter.acquire("openai", "gpt-3.5-turbo", 1200) == 0.0
+    waited = limiter.acquire("openai", "gpt-3.5-turbo", 1200)
+    assert 1.5 <= waited < 1.6 and sleeps == [waited]
+    keys, args = client.calls[0]
+    assert keys == ["ratelimit:openai:gpt-3.5-turbo"] and args == [60, 10000, 1200, 30000]
+
+
+def test_queue_too_long_raises_without_sleeping(limits, sleeps):
+    limiter = ProviderRateLimiter(client=ScriptRedis([0, 45000]), max_wait_seconds=30)
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire("openai", "gpt-3.5-turbo", 1200)
+    assert sleeps == []
+
+
+def test_redis_down_calls_unthrottled(limits, sleeps):
+    limiter = ProviderRateLimiter(client=ScriptRedis(RedisConnectionError("down")))
+    assert limiter.acquire("openai", "gpt-3.5-turbo", 1200) == 0.0
+
+
+def test_settle_returns_unused_estimate(limits):
+    client = ScriptRedis(b"500", b"-200", b"9000")
+    limiter = ProviderRateLimiter(client=client)
+    limiter.settle("openai", "gpt-3.5-turbo", 1500, 1000)
+    limiter.settle("openai", "gpt-3.5-turbo", 1500, 1700)
+    limiter.settle("openai", "gpt-3.5-turbo", 1500, None)  # no usage reported: nothing to correct
+    limiter.settle("openai", "gpt-3.5-turbo", 20000, 1000)  # the reservation was capped at a full bucket
+    assert [args for _, args in client.calls] == [[500], [-200], [9000]]
+
+
+@pytest.mark.asyncio
+async def test_async_acquire_yields_while_waiting(limits, monkeypatch):
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+
+    limiter = ProviderRateLimiter(async_client=AsyncScriptRedis([1, 250]))
+    waited = await limiter.acquire_async("openai", "gpt-3.5-turbo", estimate_tokens("x" * 400))
+    assert slept == [waited] and waited >= 0.25
+    assert limiter.async_client.calls[0][1][2] == 100 + settings.LLM_EXPECTED_OUTPUT_TOKENS
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from app.services.resume_features import extract_features, years_of_experience
+from app.services.skill_taxonomy import normalize_skill
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 (555) 123-4567
+Experience
+Backend Engineer, Acme    Jan 2018 - Present
+Built FastAPI services on AWS with Docker and k8s.
+Developer, Foo    06/2015 - 03/2018
+JavaScript, Java and PostgreSQL. Strong communication.
+Education
+B.Sc. Computer Science    2011 - 2015
+"""
+
+
+def test_extract_features_reads_skills_sections_and_contact():
+    features = extract_features(RESUME, now=datetime(2020, 1, 1))
+    assert features["sections"] == ["experience", "education"]
+    assert {"fastapi", "aws", "docker", "kubernetes", "javascript", "java", "sql"} <= set(features["skills"])
+    assert features["soft_skills"] == ["communication"]
+    assert features["highest_degree"] == "bachelor"
+    assert features["contact"] == {"email": "jane.doe@example.com", "phone": "+1 (555) 123-4567"}
+
+
+def test_experience_ignores_education_dates_and_merges_overlaps():
+    features = extract_features(RESUME, now=datetime(2020, 1, 1))
+    # 06/2015 through 01/2020, the 2011-2015 degree is not employment
+    assert features["experience_ranges"] == ["2018-01/2020-01", "2015-06/2018-03"]
+    assert features["years_experience"] == 4.7
+    assert years_of_experience([]) == 0
+
+
+def test_normalize_skill_maps_aliases():
+    assert normalize_skill("K8s") == "kubernetes"
+    assert normalize_skill("Postgres") == "sql"
+    assert normalize_skill("Haskell") == "haskell"
@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.resume_search import BM25Index, tokenize
+
+
+def test_tokenize_keeps_tech_terms_and_drops_stopwords():
+    assert tokenize("I know C++, C# and Node.js.") == ["know", "c++", "c#", "node.js"]
+
+
+def test_bm25_ranks_replaces_and_persists(tmp_path):
+    index = BM25Index()
+    index.add_document("r1", "Python developer with Django and PostgreSQL experience", datetime(2024, 1, 1))
+    index.add_document("r2", "Java engineer, Spring Boot, Kubernetes", datetime(2024, 1, 2))
+    index.add_document("r3", "Python Python data scientist, pandas, kubernetes", datetime(2024, 1, 3))
+
+    hits = index.search("python kubernetes", k=3)
+    assert hits[0][0] == "r3"
+    assert {resume_id for resume_id, _ in hits} == {"r1", "r2", "r3"}
+
+    # Re-parsed resume replaces its old postings
+    index.add_document("r2", "Go engineer", datetime(2024, 1, 4))
+    assert "r2" not in {resume_id for resume_id, _ in index.search("kubernetes")}
+    assert index.watermark == datetime(2024, 1, 4)
+
+    path = str(tmp_path / "bm25.pkl")
+    index.save(path)
+    loaded = BM25Index.load(path)
+    assert len(loaded) == 3
+    assert loaded.search("python kubernetes") == index.search("python kubernetes")
+    assert loaded.is_current("r2", datetime(2024, 1, 4))
+
+
+def test_compact_preserves_results():
+    index = BM25Index()
+    for i in range(5):
+        index.add_document(f"r{i}", f"skill{i} python")
+    for i in range(5):
+        index.add_document(f"r{i}", f"skill{i} python golang")
+    before = index.search("golang skill3")
+    index.compact()
+    assert len(index.doc_ids) == 5
+    assert index.search("golang skill3") == before
+
+
+class FakeResumes:
+    """find() over a list, supporting the filters parsed_resumes_since uses"""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        def matches(doc):
+            if doc.get("parse_phase") != query["parse_phase"] or "duplicate_of" in doc:
+                return False
+            since = query["parsed_at"].get("$gte")
+            return since is None or doc["parsed_at"] >= since
+
+        return FakeCursor([doc for doc in self.docs if matches(doc)])
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction):
+        self.docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def __aiter__(self):
+        async def iterate():
+            for doc in self.docs:
+                yield doc
+        return iterate()
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_late_commits_below_the_watermark(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    from app.db import mongo
+    from app.services import resume_store
+    from app.services.resume_search import ResumeSearchService
+
+    texts = {"r1": "python developer", "r2": "go developer", "r3": "rust developer"}
+    docs = [
+        {"resume_id": "r1", "parse_phase": "full", "parsed_at": datetime(2024, 1, 1, 12, 0, 0)},
+        {"resume_id": "r2", "parse_phase": "full", "parsed_at": datetime(2024, 1, 1, 12, 0, 10)},
+    ]
+
+    async def get_text_async(resume_id):
+        return texts[resume_id]
+
+    monkeypatch.setattr(mongo, "db", SimpleNamespace(resumes=FakeResumes(docs)))
+    monkeypatch.setattr(resume_store, "get_resume_store", lambda: SimpleNamespace(get_text_async=get_text_async))
+
+    service = ResumeSearchService(str(tmp_path / "index.pkl"), refresh_seconds=0)
+    assert await service.refresh(force=True) == 2
+    assert service.index.watermark == datetime(2024, 1, 1, 12, 0, 10)
+
+    # A slower worker commits a resume stamped before the watermark
+    docs.append({"resume_id": "r3", "parse_phase": "full", "parsed_at": datetime(2024, 1, 1, 12, 0, 5)})
+    assert await service.refresh(force=True) == 1
+    assert service.index.search("rust")[0][0] == "r3"
+    assert await service.refresh(force=True) == 0  # the lag window re-reads, is_current skips
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from app.services.resume_store import FilesystemResumeStore, LRUCache, ResumeStore
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_filesystem_store_shards_and_reads_legacy_files(tmp_path):
+    store = FilesystemResumeStore(str(tmp_path), cache_size=4)
+
+    store.put_text("resume_new", "fresh text")
+    assert not (tmp_path / "resume_new.json").exists()
+    assert await store.get_text_async("resume_new") == "fresh text"
+
+    (tmp_path / "resume_old.json").write_text(json.dumps({"text": "legacy text"}))
+    assert store.get_text("resume_old") == "legacy text"
+    assert store.get_text("resume_missing") is None
+
+    store.put_analysis("resume_new", {"overall_score": 80})
+    assert await store.get_analysis_async("resume_new") == {"overall_score": 80}
+
+
+def test_backend_missing_a_primitive_fails_at_construction():
+    class TextOnlyStore(ResumeStore):
+        def _read_text(self, resume_id):
+            return None
+
+        def _write_text(self, resume_id, text):
+            pass
+
+    with pytest.raises(TypeError):
+        TextOnlyStore()
@@ -23,3 +23,63 @@ async def test_upload_valid_pdf(async_client):
     assert res.status_code == 200
     json_data = res.json()
     assert "file_name" in json_data
+
+@pytest.mark.asyncio
+async def test_stream_upload_enforces_size_limit(tmp_path):
+    from fastapi import HTTPException, UploadFile
+    from app.services.upload_service import stream_upload_to_disk
+
+    dest = tmp_path / "resume.pdf"
+    upload = UploadFile(file=io.BytesIO(b"x" * 4096), filename="resume.pdf")
+    stats = await stream_upload_to_disk(upload, str(dest), max_bytes=8192, chunk_size=1024)
+    assert stats["bytes"] == 4096
+    assert dest.stat().st_size == 4096
+
+    upload = UploadFile(file=io.BytesIO(b"x" * 4096), filename="resume.pdf")
+    with pytest.raises(HTTPException) as exc:
+        await stream_upload_to_disk(upload, str(dest), max_bytes=2048, chunk_size=1024)
+    assert exc.value.status_code == 413
+    assert not dest.exists()
+
+
+def test_extract_zip_resumes_keeps_only_pdfs(tmp_path):
+    import zipfile
+    from app.services.upload_service import extract_zip_resumes
+    from benchmarks.synthetic_pdfs import build_pdf
+
+    pdf_bytes = build_pdf(page_count=1, lines_per_page=5)
+    zip_path = tmp_path / "batch.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("cvs/alice.pdf", pdf_bytes)
+        archive.writestr("cvs/bob.pdf", pdf_bytes)
+        archive.writestr("notes.txt", b"not a resume")
+
+    accepted, rejected = extract_zip_resumes(str(zip_path), str(tmp_path))
+    assert [item["original_filename"] for item in accepted] == ["alice.pdf", "bob.pdf"]
+    assert accepted[0]["content_hash"] == accepted[1]["content_hash"]
+    assert (tmp_path / accepted[0]["filename"]).read_bytes() == pdf_bytes
+    assert rejected == [{"filename": "notes.txt", "reason": "Only PDF files are allowed."}]
+
+def test_parse_retry_backoff_is_capped_and_transient_errors_retry():
+    from types import SimpleNamespace
+    from pymongo.errors import AutoReconnect
+    from app.core.config import settings
+    from app.services import resume_service
+
+    for retries in range(12):
+        delay = resume_service._retry_countdown(retries)
+        assert 0 <= delay <= min(settings.RESUME_PARSE_RETRY_BACKOFF * 2 ** retries, settings.RESUME_PARSE_RETRY_BACKOFF_MAX)
+
+    class Retry(Exception):
+        pass
+
+    def retry(exc, countdown):
+        return Retry(exc)
+
+    task = SimpleNamespace(request=SimpleNamespace(retries=0), max_retries=3, retry=retry)
+
+    def flaky_step(file_path, user_id):
+        raise AutoReconnect("primary stepped down")
+
+    with pytest.raises(Retry):
+        resume_service._run_parse_step(task, "preview", flaky_step, "app/uploads/resumes/resume_x.pdf")
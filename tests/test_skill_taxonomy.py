@@ -0,0 +1,21 @@
+from app.services.skill_taxonomy import AhoCorasick, SkillMatcher, TECHNICAL_MATCHER, skill_category
+
+
+def test_automaton_reports_overlapping_occurrences():
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+    matches = sorted((start, end, automaton.patterns[number]) for start, end, number in automaton.iter_matches("ushers"))
+    assert matches == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_matcher_respects_word_boundaries_and_prefers_longest_alias():
+    text = "JavaScript, Node.js and React Native on AWS; some Java. Led K8s migration."
+    assert TECHNICAL_MATCHER.find(text) == ["javascript", "node.js", "react native", "aws", "java", "kubernetes"]
+    assert TECHNICAL_MATCHER.find("javascripting, postgresql2, spring 2019") == []
+
+
+def test_custom_vocabulary_and_categories():
+    matcher = SkillMatcher({"machine learning": ["machine learning", "ml"]})
+    assert matcher.find("ML engineer doing machine learning") == ["machine learning"]
+    assert matcher.find_spans("ml") == [(0, 2, "machine learning")]
+    assert skill_category("kubernetes") == "cloud"
+    assert skill_category("leadership") == "soft"
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.services import upload_service
+
+
+class FakeHashes:
+    """resume_hashes stand-in: _id is unique, like the real collection"""
+
+    def __init__(self, entries=None, insert_errors=None):
+        self.entries = dict(entries or {})
+        self.insert_errors = insert_errors or {}
+
+    async def insert_one(self, document):
+        if document["_id"] in self.entries:
+            raise DuplicateKeyError("duplicate key", 11000)
+        self.entries[document["_id"]] = document
+
+    async def insert_many(self, documents, ordered=True):
+        errors = []
+        for index, document in enumerate(documents):
+            code = self.insert_errors.get(document["_id"])
+            if code == 11000:
+                # A concurrent upload got there between our find and insert
+                self.entries[document["_id"]] = {"_id": document["_id"], "resume_id": "resume_racer"}
+            if code:
+                errors.append({"index": index, "code": code, "errmsg": "write failed"})
+            else:
+                self.entries[document["_id"]] = document
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    async def find_one(self, query):
+        return self.entries.get(query["_id"])
+
+    def find(self, query):
+        async def iterate():
+            for content_hash in query["_id"]["$in"]:
+                if content_hash in self.entries:
+                    yield self.entries[content_hash]
+        return iterate()
+
+
+@pytest.fixture
+def hashes(monkeypatch):
+    def install(**kwargs):
+        collection = FakeHashes(**kwargs)
+        monkeypatch.setattr(upload_service, "db", SimpleNamespace(resume_hashes=collection))
+        return collection
+    return install
+
+
+@pytest.mark.asyncio
+async def test_claim_content_hash_first_upload_wins(hashes):
+    collection = hashes()
+
+    assert await upload_service.claim_content_hash("h1", "resume_a") is None
+    existing = await upload_service.claim_content_hash("h1", "resume_b")
+
+    assert existing["resume_id"] == "resume_a"
+    assert collection.entries["h1"]["resume_id"] == "resume_a"
+
+
+@pytest.mark.asyncio
+async def test_claim_content_hashes_keeps_existing_owners(hashes):
+    collection = hashes(entries={"h1": {"_id": "h1", "resume_id": "resume_old"}})
+
+    owners = await upload_service.claim_content_hashes({"h1": "resume_a", "h2": "resume_b"})
+
+    assert owners == {"h1": "resume_old", "h2": "resume_b"}
+    assert collection.entries["h2"]["resume_id"] == "resume_b"
+
+
+@pytest.mark.asyncio
+async def test_claim_content_hashes_resolves_a_lost_insert_race(hashes):
+    hashes(insert_errors={"h2": 11000})
+
+    owners = await upload_service.claim_content_hashes({"h1": "resume_a", "h2": "resume_b"})
+
+    # h2 was claimed by a concurrent upload after our lookup: its owner wins
+    assert owners == {"h1": "resume_a", "h2": "resume_racer"}
+
+
+@pytest.mark.asyncio
+async def test_claim_content_hashes_reraises_non_duplicate_write_errors(hashes):
+    hashes(insert_errors={"h1": 11000, "h2": 121})  # 121: document failed validation
+
+    with pytest.raises(BulkWriteError):
+        await upload_service.claim_content_hashes({"h1": "resume_a", "h2": "resume_b"})
@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from app.services import vector_index
+from app.services.embeddings import EMBEDDING_DIM, embed_text, from_binary, to_binary
+from app.services.vector_index import VectorIndex
+
+
+def test_embeddings_are_compact_deterministic_and_semantic():
+    rest = embed_text("Built REST services for a payments platform")
+    fastapi = embed_text("FastAPI backend engineer")
+    nurse = embed_text("Registered nurse with ICU experience and patient care")
+
+    assert rest.dtype == np.float32 and rest.shape == (EMBEDDING_DIM,)
+    assert np.isclose(np.linalg.norm(rest), 1.0, atol=1e-5)
+    assert np.array_equal(rest, embed_text("Built REST services for a payments platform"))
+    # No shared words: closeness comes from both naming a web framework
+    assert float(rest @ fastapi) > float(rest @ nurse) + 0.1
+    assert np.array_equal(from_binary(to_binary(rest)), rest)
+    assert len(to_binary(rest)) == EMBEDDING_DIM * 4
+    assert embed_text("  ") is None
+
+
+def _random_unit_vectors(count, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((count, EMBEDDING_DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_search_exact_on_small_index_and_honours_updates():
+    vectors = _random_unit_vectors(50)
+    index = VectorIndex()
+    for number, vector in enumerate(vectors):
+        index.add(str(number), vector)
+
+    hits = index.search(vectors[7], k=3)
+    assert hits[0] == ("7", 1.0)
+    assert index.search(vectors[7], k=2, exclude=["7"]) == hits[1:]
+
+    index.remove("7")
+    assert "7" not in {item_id for item_id, _ in index.search(vectors[7], k=50)}
+    index.add("8", vectors[7])
+    assert index.search(vectors[7], k=1)[0][0] == "8"
+    assert index.garbage() == 2
+    index.compact()
+    assert index.garbage() == 0 and len(index) == 49
+    assert index.search(vectors[7], k=1)[0][0] == "8"
+
+
+def test_sketch_search_finds_near_neighbours_on_large_index(monkeypatch):
+    monkeypatch.setattr(vector_index, "BRUTE_FORCE_LIMIT", 100)
+    monkeypatch.setattr(vector_index, "RERANK_CANDIDATES", 50)
+    centres = _random_unit_vectors(20, seed=1)
+    rng = np.random.default_rng(2)
+    vectors = centres[rng.integers(0, 20, 2000)] + rng.standard_normal((2000, EMBEDDING_DIM)).astype(np.float32) * 0.03
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = VectorIndex()
+    for number, vector in enumerate(vectors):
+        index.add(str(number), vector)
+
+    hits = 0
+    for query in vectors[:20]:
+        exact = {str(row) for row in np.argsort(-(vectors @ query))[:10]}
+        hits += len(exact & {item_id for item_id, _ in index.search(query, k=10)})
+    assert hits / 200 >= 0.9
+
+
+@pytest.mark.asyncio
+async def test_service_indexes_from_the_shared_feed(monkeypatch):
+    from datetime import datetime
+
+    calls = []
+    docs = [
+        {"resume_id": "r1", "parsed_at": datetime(2024, 1, 1), "embedding": to_binary(embed_text("python developer"))},
+        {"resume_id": "r2", "parsed_at": datetime(2024, 1, 2), "embedding": None},
+    ]
+
+    async def feed(watermark, projection=None, extra_filter=None):
+        calls.append((watermark, extra_filter))
+        for doc in docs:
+            yield doc
+
+    monkeypatch.setattr(vector_index, "parsed_resumes_since", feed)
+    service = vector_index.ResumeVectorService(refresh_seconds=60)
+    assert await service.refresh(force=True) == 1
+    assert "r1" in service.index and service.watermark == datetime(2024, 1, 2)
+    assert await service.refresh() == 0  # throttled
+    assert await service.refresh(force=True) == 0  # already current
+    assert calls[1] == (datetime(2024, 1, 2), {"embedding_version": vector_index.EMBEDDING_VERSION})
+
+
+class FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.writes = []
+
+    def find(self, query, projection=None):
+        async def iterate():
+            for doc in self.docs:
+                yield doc
+        return iterate()
+
+    async def find_one(self, query):
+        return next((doc for doc in self.docs if doc["_id"] == query["_id"]), None)
+
+    async def bulk_write(self, operations, ordered=True):
+        self.writes.append(operations)
+
+    async def update_one(self, query, update, upsert=False):
+        self.docs.append({"_id": query["_id"], **update["$set"]})
+
+
+@pytest.mark.asyncio
+async def test_backfill_reembeds_stale_resumes_in_bulk_once(monkeypatch):
+    from datetime import datetime
+    from types import SimpleNamespace
+    from app.db import mongo
+    from app.services import resume_store
+
+    parsed_at = datetime(2024, 1, 1)
+    resumes = FakeCollection([
+        {"_id": i, "resume_id": f"r{i}", "parsed_at": parsed_at} for i in range(5)
+    ])
+    migrations = FakeCollection()
+    texts = {f"r{i}": f"python developer number {i}" for i in range(4)}  # r4 has no stored text
+
+    async def get_text_async(resume_id):
+        return texts.get(resume_id)
+
+    monkeypatch.setattr(mongo, "db", SimpleNamespace(resumes=resumes, migrations=migrations))
+    monkeypatch.setattr(resume_store, "get_resume_store", lambda: SimpleNamespace(get_text_async=get_text_async))
+    service = vector_index.ResumeVectorService(refresh_seconds=60)
+    monkeypatch.setattr(vector_index, "get_resume_vectors", lambda: service)
+
+    assert await vector_index.backfill_resume_embeddings(batch_size=3) == 4
+    # One bulk_write per batch: the resume and its exact duplicates
+    assert [len(operations) for operations in resumes.writes] == [6, 2]
+    assert resumes.writes[0][0]._doc["$set"]["embedding_version"] == vector_index.EMBEDDING_VERSION
+    # Re-embedded resumes are searchable without waiting for a new parsed_at
+    assert len(service.index) == 4
+    assert service.index.search(embed_text(texts["r2"]), 1)[0][0] == "r2"
+
+    # Completion is recorded, so the next startup does not scan again
+    assert await vector_index.backfill_resume_embeddings() == 0
+    assert len(resumes.writes) == 2